@@ -0,0 +1,128 @@
+"""Compare archive codecs: archive size against compression time.
+
+Usage:
+    python benchmarks/archive_codecs.py [SNAPSHOT_DIR_OR_ZIP] [--workers N]
+
+With no argument a synthetic deep-capture-sized snapshot is generated.
+Each codec/level is used to build the archive with the same parallel
+writer the tool uses, and the resulting size, ratio and wall time are
+printed, fastest first.
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from big_red_button.archive import (  # noqa: E402
+    CODECS,
+    ArchiveCodec,
+    ArchiveWriter,
+    get_codec,
+)
+
+CANDIDATES: List[Tuple[str, Optional[int]]] = [
+    ("stored", None),
+    ("deflate", 1),
+    ("deflate", 6),
+    ("deflate", 9),
+    ("bzip2", 9),
+    ("lzma", None),
+    ("zstd", 3),
+    ("zstd", 10),
+]
+
+
+def synthetic_members() -> Dict[str, bytes]:
+    """Build snapshot-like JSON members (~a deep capture)."""
+    rng = random.Random(0)
+    samples = [
+        {
+            "timestamp": f"2025-01-01T12:00:{i % 60:02d}",
+            "cpu_percent_per_cpu": [
+                round(rng.uniform(0, 100), 1) for _ in range(32)
+            ],
+            "memory_percent": round(rng.uniform(40, 90), 1),
+            "disk_io": {
+                f"nvme{d}n1": {"read_bytes_per_sec": rng.randint(0, 10**9)}
+                for d in range(4)
+            },
+        }
+        for i in range(600)
+    ]
+    procs = [
+        {"pid": pid, "name": f"proc{pid % 97}", "rss": rng.randint(0, 10**10)}
+        for pid in range(3000)
+    ]
+    profiler = "\n".join(
+        f"    Key {i}: value {rng.randint(0, 10**6)}" for i in range(60000)
+    )
+    return {
+        "cpu_memory.json": json.dumps(
+            {"cpu_samples": samples}, indent=2
+        ).encode(),
+        "processes.json": json.dumps({"processes": procs}, indent=2).encode(),
+        "system_info.json": json.dumps({"system_profiler": profiler}).encode(),
+    }
+
+
+def load_members(source: Path) -> Dict[str, bytes]:
+    """Read members from an existing snapshot directory or ZIP."""
+    if source.is_dir():
+        return {
+            str(p.relative_to(source)): p.read_bytes()
+            for p in source.rglob("*")
+            if p.is_file()
+        }
+    with zipfile.ZipFile(source) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+def run(
+    members: Dict[str, bytes], codec: ArchiveCodec, workers: Optional[int]
+) -> Tuple[int, float]:
+    """Build one archive; return (size in bytes, seconds)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.zip"
+        t0 = time.perf_counter()
+        writer = ArchiveWriter(path, codec, max_workers=workers)
+        for name, data in members.items():
+            writer.add_text(name, data.decode("utf-8", errors="replace"))
+        writer.close()
+        return path.stat().st_size, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", nargs="?", type=Path)
+    parser.add_argument("--workers", type=int, help="Compression threads")
+    args = parser.parse_args()
+
+    members = load_members(args.source) if args.source else synthetic_members()
+    raw = sum(len(v) for v in members.values())
+    print(f"{len(members)} members, {raw / 1e6:.1f} MB uncompressed\n")
+
+    rows = []
+    for name, level in CANDIDATES:
+        if name not in CODECS:
+            continue
+        codec = get_codec(name, level)
+        size, seconds = run(members, codec, args.workers)
+        rows.append((seconds, str(codec), size))
+
+    print(f"{'codec':<12} {'size MB':>9} {'ratio':>7} {'seconds':>9}")
+    for seconds, label, size in sorted(rows):
+        print(
+            f"{label:<12} {size / 1e6:>9.2f} {raw / size:>7.2f} {seconds:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
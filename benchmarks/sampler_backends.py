@@ -0,0 +1,79 @@
+"""Compare the sampler's counter backends: psutil against procfs.
+
+Usage:
+    python benchmarks/sampler_backends.py [--reads N] [--hz HZ ...]
+                                          [--seconds S]
+
+For each backend the script first reads every channel back to back to
+get the CPU cost of one reading, then samples at each requested rate for
+a few seconds with the real TickSampler loop and reports the CPU used as
+a percentage of one core. Run it on the machine you want to sample; the
+procfs backend is Linux only.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from big_red_button.sampler import CHANNELS, TickSampler  # noqa: E402
+
+
+def per_read(backend: str, reads: int) -> float:
+    """CPU microseconds per reading of every channel."""
+    sampler = TickSampler(channels=CHANNELS, backend=backend)
+    sampler.read()  # open files and warm caches
+    t0 = time.process_time()
+    for _ in range(reads):
+        sampler.read()
+    cpu = time.process_time() - t0
+    sampler.close()
+    return 1e6 * cpu / reads
+
+
+def paced(backend: str, hz: float, seconds: float) -> Tuple[float, int]:
+    """Sample at ``hz`` for ``seconds``; return (% of one core, ticks)."""
+    sampler = TickSampler(
+        interval=1.0 / hz, channels=CHANNELS, backend=backend
+    )
+    count = int(hz * seconds)
+    wall0, cpu0 = time.monotonic(), time.process_time()
+    sampler.run(count)
+    wall = time.monotonic() - wall0
+    return 100.0 * (time.process_time() - cpu0) / wall, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument(
+        "--hz", type=float, nargs="+", default=[10.0, 50.0, 100.0]
+    )
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    backends = ["psutil"]
+    if sys.platform.startswith("linux"):
+        backends.append("procfs")
+
+    rows: List[Tuple[str, float]] = []
+    print(f"{'backend':<8} {'us/read':>9}")
+    for backend in backends:
+        us = per_read(backend, args.reads)
+        rows.append((backend, us))
+        print(f"{backend:<8} {us:>9.1f}")
+    if len(rows) == 2:
+        print(f"\nprocfs is {rows[0][1] / rows[1][1]:.1f}x cheaper per read")
+
+    print(f"\n{'backend':<8} {'Hz':>6} {'ticks':>6} {'% of one core':>14}")
+    for backend in backends:
+        for hz in args.hz:
+            percent, count = paced(backend, hz, args.seconds)
+            print(f"{backend:<8} {hz:>6.0f} {count:>6} {percent:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
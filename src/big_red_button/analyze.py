@@ -0,0 +1,938 @@
+"""Automatic triage of a snapshot.
+
+Evaluates the manual triage steps listed in the snapshot README against
+the collected data and produces a ranked list of findings. Per-sample
+math (CPU, per-core, memory and swap series) uses NumPy when it is
+installed, so long recordings stay fast, and falls back to plain Python
+otherwise.
+"""
+
+import json
+import zipfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+# Thresholds
+CPU_SATURATED_PERCENT = 90.0
+CORE_PEGGED_PERCENT = 95.0
+MEMORY_WARNING_PERCENT = 90.0
+MEMORY_CRITICAL_PERCENT = 95.0
+SWAP_WARNING_PERCENT = 80.0
+# Sustained swap traffic that indicates active paging (bytes/s)
+SWAP_RATE_WARNING = 1 * 1024 * 1024
+SWAP_RATE_CRITICAL = 20 * 1024 * 1024
+PROCESS_CPU_PERCENT = 90.0
+PROCESS_MEMORY_FRACTION = 0.5
+VRAM_WARNING_FRACTION = 0.90
+VRAM_CRITICAL_FRACTION = 0.97
+GPU_HOT_CELSIUS = 90.0
+VOLUME_WARNING_PERCENT = 90.0
+VOLUME_CRITICAL_PERCENT = 97.0
+# How late the burst sampler woke up (ms) for the machine to have stalled
+STUTTER_WARNING_MS = 20.0
+STUTTER_CRITICAL_MS = 100.0
+# Fraction of the burst window with more runnable tasks than CPUs
+RUN_QUEUE_WARNING_FRACTION = 0.1
+# Fraction of samples above a threshold for a problem to count as sustained
+SUSTAINED_FRACTION = 0.5
+INTERMITTENT_FRACTION = 0.2
+
+# Read-only or virtual filesystems that always look full (skipped by the
+# volume check and the fleet index)
+IGNORED_FSTYPES = {
+    "squashfs",
+    "iso9660",
+    "udf",
+    "devfs",
+    "autofs",
+    "cd9660",
+    "tmpfs",
+    "devtmpfs",
+    "overlay",
+}
+
+SEVERITIES = ("critical", "warning", "info")
+
+
+@dataclass
+class Finding:
+    """One problem detected in a snapshot.
+
+    Attributes:
+        check: Name of the check that produced the finding.
+        severity: "critical", "warning" or "info".
+        score: How bad the problem is, from 0 to 1; ranks findings of the
+               same severity.
+        title: One-line summary.
+        detail: Explanation with the supporting numbers.
+        source: Snapshot file the evidence comes from.
+        evidence: Key values behind the finding.
+    """
+
+    check: str
+    severity: str
+    score: float
+    title: str
+    detail: str
+    source: str
+    evidence: Dict[str, Any] = field(default_factory=dict)
+
+
+def load_snapshot(path: Path) -> Dict[str, Any]:
+    """Load the JSON files of a snapshot ZIP or directory.
+
+    Args:
+        path: Snapshot ZIP archive or directory.
+
+    Returns:
+        Dict mapping file name (e.g. "cpu_memory.json") to parsed data.
+        Files that are not valid JSON are skipped.
+
+    Raises:
+        FileNotFoundError: If path does not exist.
+    """
+    files: Dict[str, Any] = {}
+    if path.is_dir():
+        for item in sorted(path.rglob("*.json")):
+            try:
+                files[item.name] = json.loads(item.read_text("utf-8"))
+            except (OSError, ValueError):
+                continue
+        return files
+    if not path.exists():
+        raise FileNotFoundError(path)
+    with zipfile.ZipFile(path) as zf:
+        for name in zf.namelist():
+            if not name.endswith(".json"):
+                continue
+            try:
+                files[Path(name).name] = json.loads(zf.read(name))
+            except ValueError:
+                continue
+    return files
+
+
+# -- Vectorized series helpers ------------------------------------------
+
+
+def _values(samples: Sequence[Dict[str, Any]], key: str) -> List[float]:
+    """Collect a numeric field from samples, skipping missing values."""
+    return [
+        float(s[key]) for s in samples if isinstance(s.get(key), (int, float))
+    ]
+
+
+def _weights(samples: Sequence[Dict[str, Any]], key: str) -> List[float]:
+    """Interval lengths of the samples _values() keeps for key.
+
+    Adaptive sampling shortens the interval during spikes, so means and
+    fractions are weighted by time rather than by sample.
+    """
+    return [
+        float(s.get("interval_seconds") or 1.0)
+        for s in samples
+        if isinstance(s.get(key), (int, float))
+    ]
+
+
+def series_stats(
+    values: Sequence[float],
+    threshold: float,
+    weights: Optional[Sequence[float]] = None,
+) -> Dict[str, Any]:
+    """Summarize a series against a threshold.
+
+    Args:
+        values: Sample values.
+        threshold: Level at or above which a sample counts as high.
+        weights: Optional per-sample weights (interval lengths) for the
+                 mean and fraction; samples count equally without them.
+
+    Returns:
+        Dict with count, mean, max, and the number and (time-weighted)
+        fraction of samples at or above the threshold (None values when
+        empty).
+    """
+    n = len(values)
+    if not n:
+        return {
+            "count": 0,
+            "mean": None,
+            "max": None,
+            "above": 0,
+            "fraction": None,
+        }
+    w = list(weights) if weights is not None else [1.0] * n
+    if np is not None:
+        arr = np.asarray(values, dtype=float)
+        warr = np.asarray(w, dtype=float)
+        high = arr >= threshold
+        total = float(warr.sum())
+        mean, peak = float((arr * warr).sum()) / total, float(arr.max())
+        above = int(np.count_nonzero(high))
+        fraction = float(warr[high].sum()) / total
+    else:
+        total = sum(w)
+        mean = sum(v * x for v, x in zip(values, w)) / total
+        peak = max(values)
+        above = sum(1 for v in values if v >= threshold)
+        fraction = sum(x for v, x in zip(values, w) if v >= threshold) / total
+    return {
+        "count": n,
+        "mean": round(mean, 1),
+        "max": round(peak, 1),
+        "above": above,
+        "fraction": fraction,
+    }
+
+
+def per_core_fractions(
+    rows: Sequence[Sequence[float]],
+    threshold: float,
+    weights: Optional[Sequence[float]] = None,
+) -> List[float]:
+    """Fraction of samples in which each core was at or above threshold.
+
+    Args:
+        rows: Per-sample lists of per-core utilization.
+        threshold: Utilization in percent.
+        weights: Optional per-row weights (interval lengths).
+
+    Returns:
+        One (time-weighted) fraction per core (cores missing from some
+        samples are truncated to the smallest core count).
+    """
+    w = list(weights) if weights is not None else [1.0] * len(rows)
+    pairs = [(r, x) for r, x in zip(rows, w) if r]
+    if not pairs:
+        return []
+    cores = min(len(r) for r, _ in pairs)
+    total = sum(x for _, x in pairs)
+    if np is not None:
+        matrix = np.asarray([r[:cores] for r, _ in pairs], dtype=float)
+        warr = np.asarray([x for _, x in pairs], dtype=float)
+        high = (matrix >= threshold) * warr[:, None]
+        return [float(f) / total for f in high.sum(axis=0)]
+    return [
+        sum(x for r, x in pairs if r[i] >= threshold) / total
+        for i in range(cores)
+    ]
+
+
+def _severity_for_fraction(fraction: float) -> Optional[str]:
+    if fraction >= SUSTAINED_FRACTION:
+        return "critical"
+    if fraction >= INTERMITTENT_FRACTION:
+        return "warning"
+    return None
+
+
+# -- Checks -------------------------------------------------------------
+
+
+def _cpu_series(files: Dict[str, Any]) -> List[Dict[str, Any]]:
+    samples = (files.get("cpu_memory.json") or {}).get("cpu_samples")
+    return samples if isinstance(samples, list) else []
+
+
+def check_cpu(files: Dict[str, Any]) -> List[Finding]:
+    """Flag CPU saturation and single cores pegged while others idle."""
+    samples = _cpu_series(files)
+    findings: List[Finding] = []
+    overall = series_stats(
+        _values(samples, "cpu_percent_overall"),
+        CPU_SATURATED_PERCENT,
+        _weights(samples, "cpu_percent_overall"),
+    )
+    if overall["count"]:
+        severity = _severity_for_fraction(overall["fraction"])
+        if severity:
+            findings.append(
+                Finding(
+                    check="cpu",
+                    severity=severity,
+                    score=overall["fraction"],
+                    title="CPU saturated",
+                    detail=(
+                        f"Overall CPU was >= {CPU_SATURATED_PERCENT:.0f}% "
+                        f"in {overall['above']} of {overall['count']} "
+                        f"samples (mean {overall['mean']}%, peak "
+                        f"{overall['max']}%)."
+                    ),
+                    source="cpu_memory.json",
+                    evidence=overall,
+                )
+            )
+
+    rows = [s.get("cpu_percent_per_cpu") or [] for s in samples]
+    fractions = per_core_fractions(
+        rows,
+        CORE_PEGGED_PERCENT,
+        [float(s.get("interval_seconds") or 1.0) for s in samples],
+    )
+    pegged = {i: f for i, f in enumerate(fractions) if f >= SUSTAINED_FRACTION}
+    # A pegged core only matters on its own when the machine as a whole
+    # is not saturated: it points at a single-threaded bottleneck.
+    if pegged and not findings and len(fractions) > 1:
+        findings.append(
+            Finding(
+                check="cpu",
+                severity="warning",
+                score=max(pegged.values()),
+                title="Single core pegged",
+                detail=(
+                    f"{len(pegged)} of {len(fractions)} cores were >= "
+                    f"{CORE_PEGGED_PERCENT:.0f}% in most samples while "
+                    f"overall CPU averaged {overall['mean']}%; likely a "
+                    "single-threaded bottleneck."
+                ),
+                source="cpu_memory.json",
+                evidence={
+                    "pegged_cores": sorted(pegged),
+                    "overall_mean": overall["mean"],
+                },
+            )
+        )
+    return findings
+
+
+def check_memory(files: Dict[str, Any]) -> List[Finding]:
+    """Flag RAM pressure, full swap and active paging."""
+    data = files.get("cpu_memory.json") or {}
+    samples = _cpu_series(files)
+    findings: List[Finding] = []
+
+    memory = _values(samples, "memory_percent")
+    weights: Optional[List[float]] = _weights(samples, "memory_percent")
+    if not memory and "percent" in (data.get("virtual_memory") or {}):
+        memory = [float(data["virtual_memory"]["percent"])]
+        weights = None
+    mem = series_stats(memory, MEMORY_WARNING_PERCENT, weights)
+    if mem["count"] and mem["above"]:
+        severity = (
+            "critical" if mem["max"] >= MEMORY_CRITICAL_PERCENT else "warning"
+        )
+        findings.append(
+            Finding(
+                check="memory",
+                severity=severity,
+                score=min(mem["max"] / 100.0, 1.0),
+                title="RAM nearly exhausted",
+                detail=(
+                    f"Memory use reached {mem['max']}% (mean "
+                    f"{mem['mean']}%), >= {MEMORY_WARNING_PERCENT:.0f}% "
+                    f"in {mem['above']} of {mem['count']} samples."
+                ),
+                source="cpu_memory.json",
+                evidence=mem,
+            )
+        )
+
+    swap_io = series_stats(
+        [
+            a + b
+            for a, b in zip(
+                _values(samples, "swap_in_bytes_per_sec"),
+                _values(samples, "swap_out_bytes_per_sec"),
+            )
+        ],
+        SWAP_RATE_WARNING,
+        _weights(samples, "swap_in_bytes_per_sec"),
+    )
+    if swap_io["count"] and swap_io["mean"] >= SWAP_RATE_WARNING:
+        severity = (
+            "critical" if swap_io["mean"] >= SWAP_RATE_CRITICAL else "warning"
+        )
+        findings.append(
+            Finding(
+                check="memory",
+                severity=severity,
+                score=min(swap_io["mean"] / SWAP_RATE_CRITICAL, 1.0),
+                title="System is paging to swap",
+                detail=(
+                    "Swap traffic averaged "
+                    f"{swap_io['mean'] / 1024 / 1024:.1f} MB/s (peak "
+                    f"{swap_io['max'] / 1024 / 1024:.1f} MB/s)."
+                ),
+                source="cpu_memory.json",
+                evidence=swap_io,
+            )
+        )
+
+    swap_percent = (data.get("swap_memory") or {}).get("percent")
+    if (
+        isinstance(swap_percent, (int, float))
+        and swap_percent >= SWAP_WARNING_PERCENT
+    ):
+        findings.append(
+            Finding(
+                check="memory",
+                severity="warning",
+                score=swap_percent / 100.0,
+                title="Swap nearly full",
+                detail=f"Swap is {swap_percent}% used.",
+                source="cpu_memory.json",
+                evidence={"swap_percent": swap_percent},
+            )
+        )
+    return findings
+
+
+def check_processes(files: Dict[str, Any]) -> List[Finding]:
+    """Flag processes using a full core or a large share of RAM."""
+    data = files.get("processes.json") or {}
+    total = (
+        (files.get("cpu_memory.json") or {}).get("virtual_memory") or {}
+    ).get("total")
+    findings: List[Finding] = []
+
+    hot = [
+        p
+        for p in data.get("top_processes_by_cpu") or []
+        if (p.get("cpu_percent") or 0) >= PROCESS_CPU_PERCENT
+    ]
+    if hot:
+        names = ", ".join(
+            f"{p.get('name')} ({p.get('cpu_percent')}%)" for p in hot[:5]
+        )
+        findings.append(
+            Finding(
+                check="processes",
+                severity="warning",
+                score=min(max(p["cpu_percent"] for p in hot) / 400.0, 1.0),
+                title="Processes using a full CPU core or more",
+                detail=f"High CPU: {names}.",
+                source="processes.json",
+                evidence={
+                    "processes": [
+                        {k: p.get(k) for k in ("pid", "name", "cpu_percent")}
+                        for p in hot
+                    ]
+                },
+            )
+        )
+
+    if total:
+        big = [
+            p
+            for p in data.get("top_processes_by_memory") or []
+            if (p.get("rss") or 0) >= PROCESS_MEMORY_FRACTION * total
+        ]
+        if big:
+            names = ", ".join(
+                f"{p.get('name')} ({100 * p['rss'] / total:.0f}% of RAM)"
+                for p in big
+            )
+            findings.append(
+                Finding(
+                    check="processes",
+                    severity="warning",
+                    score=max(p["rss"] for p in big) / total,
+                    title="Process holding most of RAM",
+                    detail=f"Large resident memory: {names}.",
+                    source="processes.json",
+                    evidence={
+                        "processes": [
+                            {k: p.get(k) for k in ("pid", "name", "rss")}
+                            for p in big
+                        ]
+                    },
+                )
+            )
+    return findings
+
+
+def _gpu_devices(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Normalize GPU devices to name, VRAM fraction and temperature."""
+    devices = []
+    summary = data.get("summary") or {}
+    for dev in data.get("nvidia_devices") or []:
+        # Peak VRAM over the sampling window when it was sampled
+        peak = (summary.get(str(dev.get("index"))) or {}).get("memory_used")
+        total = dev.get("memory_total")
+        used = peak["max"] if peak else dev.get("memory_used")
+        devices.append(
+            {
+                "name": dev.get("name"),
+                "vram_fraction": used / total if total and used else None,
+                "temperature": dev.get("temperature"),
+            }
+        )
+    if not devices:
+        for dev in data.get("gputil_devices") or []:
+            devices.append(
+                {
+                    "name": dev.get("name"),
+                    "vram_fraction": dev.get("memory_util"),
+                    "temperature": dev.get("temperature"),
+                }
+            )
+    return devices
+
+
+def check_gpu(files: Dict[str, Any]) -> List[Finding]:
+    """Flag exhausted VRAM."""
+    findings: List[Finding] = []
+    for dev in _gpu_devices(files.get("gpu_info.json") or {}):
+        fraction = dev["vram_fraction"]
+        if fraction is None or fraction < VRAM_WARNING_FRACTION:
+            continue
+        findings.append(
+            Finding(
+                check="gpu",
+                severity=(
+                    "critical"
+                    if fraction >= VRAM_CRITICAL_FRACTION
+                    else "warning"
+                ),
+                score=fraction,
+                title="GPU memory (VRAM) nearly exhausted",
+                detail=f"{dev['name']}: {100 * fraction:.0f}% of VRAM used.",
+                source="gpu_info.json",
+                evidence=dev,
+            )
+        )
+    return findings
+
+
+def check_thermal(files: Dict[str, Any]) -> List[Finding]:
+    """Flag sensors at or above their high/critical limits and hot GPUs."""
+    findings: List[Finding] = []
+    sensors = (files.get("temperatures.json") or {}).get("sensors") or {}
+    for chip, entries in sensors.items():
+        for entry in entries:
+            current = entry.get("current")
+            if current is None:
+                continue
+            label = entry.get("label") or chip
+            for limit, severity in (
+                ("critical", "critical"),
+                ("high", "warning"),
+            ):
+                value = entry.get(limit)
+                if value and current >= value:
+                    findings.append(
+                        Finding(
+                            check="thermal",
+                            severity=severity,
+                            score=min(current / value, 1.0),
+                            title=f"Temperature at {limit} limit",
+                            detail=(
+                                f"{chip}/{label}: {current}°C "
+                                f"({limit} {value}°C)."
+                            ),
+                            source="temperatures.json",
+                            evidence={"sensor": f"{chip}/{label}", **entry},
+                        )
+                    )
+                    break
+
+    for dev in _gpu_devices(files.get("gpu_info.json") or {}):
+        temp = dev["temperature"]
+        if isinstance(temp, (int, float)) and temp >= GPU_HOT_CELSIUS:
+            findings.append(
+                Finding(
+                    check="thermal",
+                    severity="warning",
+                    score=min(temp / 100.0, 1.0),
+                    title="GPU running hot",
+                    detail=f"{dev['name']}: {temp}°C; may be throttling.",
+                    source="gpu_info.json",
+                    evidence=dev,
+                )
+            )
+    return findings
+
+
+def check_disks(files: Dict[str, Any]) -> List[Finding]:
+    """Flag full volumes and saturated disks."""
+    data = files.get("disks.json") or {}
+    findings: List[Finding] = []
+    for part in data.get("partitions") or []:
+        usage = part.get("usage") or {}
+        percent = usage.get("percent")
+        if (
+            percent is None
+            or not usage.get("total")
+            or part.get("fstype") in IGNORED_FSTYPES
+            or percent < VOLUME_WARNING_PERCENT
+        ):
+            continue
+        findings.append(
+            Finding(
+                check="disks",
+                severity=(
+                    "critical"
+                    if percent >= VOLUME_CRITICAL_PERCENT
+                    else "warning"
+                ),
+                score=percent / 100.0,
+                title="Volume nearly full",
+                detail=(
+                    f"{part.get('mountpoint')} ({part.get('device')}) is "
+                    f"{percent}% full, {usage.get('free', 0) / 1e9:.1f} GB "
+                    "free."
+                ),
+                source="disks.json",
+                evidence={
+                    "mountpoint": part.get("mountpoint"),
+                    "device": part.get("device"),
+                    **usage,
+                },
+            )
+        )
+
+    summary = (data.get("io_rates") or {}).get("summary") or {}
+    for disk, info in summary.items():
+        if not info.get("saturated"):
+            continue
+        peak = info.get("peak_interval") or {}
+        findings.append(
+            Finding(
+                check="disks",
+                severity="warning",
+                score=min((peak.get("utilization_percent") or 0) / 100.0, 1.0),
+                title="Disk I/O saturated",
+                detail=(
+                    f"{disk} peaked at {peak.get('utilization_percent')}% "
+                    f"busy ({peak.get('read_mb_per_sec')} MB/s read, "
+                    f"{peak.get('write_mb_per_sec')} MB/s write, "
+                    f"{peak.get('avg_service_time_ms')} ms service time)."
+                ),
+                source="disks.json",
+                evidence={"disk": disk, **peak},
+            )
+        )
+    return findings
+
+
+def check_network(files: Dict[str, Any]) -> List[Finding]:
+    """Flag failed or degraded storage checks and saturated NICs."""
+    data = files.get("network.json") or {}
+    findings: List[Finding] = []
+    for host in data.get("storage_host_checks") or []:
+        status = host.get("status")
+        if status not in ("FAILED", "DEGRADED") and not host.get(
+            "deadline_exceeded"
+        ):
+            continue
+        icmp = host.get("icmp") or {}
+        detail = (
+            f"{host.get('host')}: {status or 'incomplete'}"
+            + (
+                f", {icmp['loss_percent']}% ping loss"
+                if icmp.get("loss_percent")
+                else ""
+            )
+            + (f" ({host['error']})" if host.get("error") else "")
+            + (
+                ", no replies to any probe"
+                if status == "FAILED" and not host.get("error")
+                else ""
+            )
+            + (
+                "; probes hit the deadline"
+                if host.get("deadline_exceeded")
+                else ""
+            )
+            + "."
+        )
+        findings.append(
+            Finding(
+                check="network",
+                severity="critical" if status == "FAILED" else "warning",
+                score=1.0 if status == "FAILED" else 0.5,
+                title=(
+                    "Storage host unreachable"
+                    if status == "FAILED"
+                    else "Storage host degraded"
+                ),
+                detail=detail,
+                source="network.json",
+                evidence={
+                    k: host.get(k)
+                    for k in ("host", "address", "status", "error")
+                },
+            )
+        )
+
+    summary = (data.get("io_rates") or {}).get("summary") or {}
+    for nic, info in summary.items():
+        if info.get("saturated"):
+            findings.append(
+                Finding(
+                    check="network",
+                    severity="warning",
+                    score=min(info["peak_percent_of_link"] / 100.0, 1.0),
+                    title="Network link saturated",
+                    detail=(
+                        f"{nic} peaked at {info['peak_percent_of_link']}% "
+                        "of link speed."
+                    ),
+                    source="network.json",
+                    evidence={"interface": nic, **info},
+                )
+            )
+        elif info.get("errors_or_drops"):
+            findings.append(
+                Finding(
+                    check="network",
+                    severity="warning",
+                    score=0.3,
+                    title="Network errors or drops",
+                    detail=(
+                        f"{nic}: {info.get('errin', 0)} in / "
+                        f"{info.get('errout', 0)} out errors, "
+                        f"{info.get('dropin', 0)} in / "
+                        f"{info.get('dropout', 0)} out drops."
+                    ),
+                    source="network.json",
+                    evidence={"interface": nic, **info},
+                )
+            )
+    return findings
+
+
+def check_history(files: Dict[str, Any]) -> List[Finding]:
+    """Flag CPU and memory problems in the flight recorder history."""
+    data = files.get("flight_recorder.json") or {}
+    samples = data.get("samples") or []
+    findings: List[Finding] = []
+    if data.get("stale"):
+        age = data.get("newest_sample_age_seconds")
+        findings.append(
+            Finding(
+                check="history",
+                severity="info",
+                score=0.0,
+                title="Flight recorder not running",
+                detail=(
+                    "No history was recorded in the last "
+                    f"{data.get('window_minutes')} minutes"
+                    + (
+                        f"; the newest sample is {age:.0f}s old."
+                        if age is not None
+                        else "."
+                    )
+                ),
+                source="flight_recorder.json",
+                evidence={"newest_sample_age_seconds": age},
+            )
+        )
+    for key, threshold, title in (
+        ("cpu_percent", CPU_SATURATED_PERCENT, "CPU saturated before capture"),
+        (
+            "memory_percent",
+            MEMORY_WARNING_PERCENT,
+            "RAM nearly exhausted before capture",
+        ),
+    ):
+        stats = series_stats(_values(samples, key), threshold)
+        if not stats["count"]:
+            continue
+        # History predates the capture, so it is never critical
+        if _severity_for_fraction(stats["fraction"]):
+            findings.append(
+                Finding(
+                    check="history",
+                    severity="warning",
+                    score=stats["fraction"],
+                    title=title,
+                    detail=(
+                        f"{key} was >= {threshold:.0f}% in "
+                        f"{stats['above']} of {stats['count']} recorded "
+                        f"samples (peak {stats['max']}%)."
+                    ),
+                    source="flight_recorder.json",
+                    evidence=stats,
+                )
+            )
+    return findings
+
+
+def check_stutter(files: Dict[str, Any]) -> List[Finding]:
+    """Flag micro-stutters and run-queue overload in the burst capture."""
+    data = files.get("burst.json") or {}
+    summary = data.get("summary") or {}
+    window_ms = 1000.0 * (data.get("duration_seconds") or 0.0)
+    stalls = summary.get("stalls") or []
+    findings: List[Finding] = []
+
+    late = [e for e in stalls if e.get("kind") == "late_tick"]
+    worst = max((e.get("late_ms") or 0.0 for e in late), default=0.0)
+    if worst >= STUTTER_WARNING_MS:
+        findings.append(
+            Finding(
+                check="stutter",
+                severity=(
+                    "critical" if worst >= STUTTER_CRITICAL_MS else "warning"
+                ),
+                score=min(worst / (2 * STUTTER_CRITICAL_MS), 1.0),
+                title="System stalled for tens of milliseconds",
+                detail=(
+                    f"The {data.get('interval_seconds', 0) * 1000:.0f} ms "
+                    f"burst sampler woke up late {len(late)} times, by up "
+                    f"to {worst:.0f} ms; long enough for audio dropouts "
+                    "and dropped frames."
+                ),
+                source="burst.json",
+                evidence={
+                    "late_ticks": len(late),
+                    "worst_late_ms": worst,
+                    "max_tick_gap_ms": summary.get("max_tick_gap_ms"),
+                },
+            )
+        )
+
+    queued_ms = sum(
+        e.get("duration_ms") or 0.0
+        for e in stalls
+        if e.get("kind") == "run_queue"
+    )
+    if window_ms > 0 and queued_ms / window_ms >= RUN_QUEUE_WARNING_FRACTION:
+        findings.append(
+            Finding(
+                check="stutter",
+                severity="warning",
+                score=min(queued_ms / window_ms, 1.0),
+                title="More runnable tasks than CPUs",
+                detail=(
+                    f"The run queue exceeded the {data.get('cpu_count')} "
+                    f"logical CPUs for {queued_ms:.0f} ms of the "
+                    f"{window_ms:.0f} ms burst (peak "
+                    f"{summary.get('max_run_queue')}); threads were "
+                    "waiting for a CPU."
+                ),
+                source="burst.json",
+                evidence={
+                    "queued_ms": round(queued_ms, 1),
+                    "max_run_queue": summary.get("max_run_queue"),
+                },
+            )
+        )
+    return findings
+
+
+# Checks in README triage order, with the snapshot file each one reads
+CHECKS: Dict[str, Tuple[str, Callable[[Dict[str, Any]], List[Finding]]]] = {
+    "cpu": ("cpu_memory.json", check_cpu),
+    "stutter": ("burst.json", check_stutter),
+    "memory": ("cpu_memory.json", check_memory),
+    "processes": ("processes.json", check_processes),
+    "gpu": ("gpu_info.json", check_gpu),
+    "thermal": ("temperatures.json", check_thermal),
+    "disks": ("disks.json", check_disks),
+    "network": ("network.json", check_network),
+    "history": ("flight_recorder.json", check_history),
+}
+
+
+def rank_findings(findings: List[Finding]) -> List[Finding]:
+    """Order findings by severity, then by score (worst first)."""
+    return sorted(
+        findings, key=lambda f: (SEVERITIES.index(f.severity), -f.score)
+    )
+
+
+def run_checks(
+    files: Dict[str, Any],
+) -> Tuple[List[Finding], Dict[str, str]]:
+    """Run every triage check against loaded snapshot files.
+
+    Args:
+        files: Snapshot files from load_snapshot().
+
+    Returns:
+        Tuple of (ranked findings, status per check).
+    """
+    findings: List[Finding] = []
+    checks: Dict[str, str] = {}
+    for name, (source, check) in CHECKS.items():
+        if source not in files:
+            checks[name] = "no data"
+            continue
+        try:
+            found = check(files)
+        except Exception as e:
+            checks[name] = f"error: {e}"
+            continue
+        checks[name] = "flagged" if found else "ok"
+        findings.extend(found)
+    return rank_findings(findings), checks
+
+
+def analyze_snapshot(path: Path) -> Dict[str, Any]:
+    """Run every triage check against a snapshot.
+
+    Args:
+        path: Snapshot ZIP archive or directory.
+
+    Returns:
+        Report dict with the user context, per-check status and the
+        ranked findings.
+    """
+    files = load_snapshot(path)
+    ranked, checks = run_checks(files)
+    return {
+        "snapshot": str(path),
+        "analyzed": datetime.now().isoformat(),
+        "user_context": files.get("user_context.json"),
+        "checks": checks,
+        "summary": {
+            severity: sum(1 for f in ranked if f.severity == severity)
+            for severity in SEVERITIES
+        },
+        "findings": [
+            {"rank": i, **asdict(f)} for i, f in enumerate(ranked, 1)
+        ],
+    }
+
+
+def format_text(report: Dict[str, Any]) -> str:
+    """Render an analysis report as plain text.
+
+    Args:
+        report: Report from analyze_snapshot().
+
+    Returns:
+        Human-readable report.
+    """
+    summary = report["summary"]
+    lines = [
+        f"Snapshot analysis: {report['snapshot']}",
+        f"{summary['critical']} critical, {summary['warning']} warning",
+        "",
+    ]
+    context = report.get("user_context") or {}
+    if context.get("app_name") or context.get("description"):
+        lines.append(f"User reported: {context.get('app_name') or '-'}")
+        if context.get("severity"):
+            lines.append(f"  Severity: {context['severity']}")
+        if context.get("description"):
+            lines.append(f"  {context['description']}")
+        lines.append("")
+
+    if not report["findings"]:
+        lines.append("No problems found.")
+    for finding in report["findings"]:
+        lines.append(
+            f"{finding['rank']:>2}. [{finding['severity'].upper()}] "
+            f"{finding['title']} ({finding['source']})"
+        )
+        lines.append(f"    {finding['detail']}")
+
+    lines.append("")
+    lines.append(
+        "Checks: "
+        + ", ".join(
+            f"{name} {status}" for name, status in report["checks"].items()
+        )
+    )
+    return "\n".join(lines) + "\n"
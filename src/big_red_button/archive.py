@@ -0,0 +1,324 @@
+"""ZIP archive writer with configurable codecs and parallel compression.
+
+Each member is compressed on a thread pool into its own single-member
+in-memory ZIP using the standard zipfile module (zlib, bz2 and lzma
+release the GIL while compressing). As soon as a member and all members
+submitted before it are compressed, its local record is copied verbatim
+to the archive file and the buffer is dropped; only the central
+directory entries, rewritten to point at the new offsets, are kept
+until the archive is closed. The archive is written sequentially and
+only once, and memory holds at most the members still in flight.
+"""
+
+import io
+import json
+import os
+import struct
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, Optional, Tuple
+
+CODECS: Dict[str, int] = {
+    "stored": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+# Zstandard members are supported by zipfile from Python 3.14
+if hasattr(zipfile, "ZIP_ZSTANDARD"):
+    CODECS["zstd"] = zipfile.ZIP_ZSTANDARD
+
+# Valid compresslevel ranges per codec (None: level is ignored)
+_LEVELS: Dict[str, Optional[Tuple[int, int]]] = {
+    "stored": None,
+    "deflate": (0, 9),
+    "bzip2": (1, 9),
+    "lzma": None,
+    "zstd": (-7, 22),
+}
+
+DEFAULT_CODEC = "deflate"
+
+_END_RECORD = struct.Struct("<4s4H2LH")
+_END_SIGNATURE = b"PK\x05\x06"
+# Offset of "relative offset of local header" in a central directory entry
+_CENTRAL_OFFSET_FIELD = 42
+_ZIP_LIMIT = 0xFFFFFFFF
+
+
+@dataclass(frozen=True)
+class ArchiveCodec:
+    """Compression method and level for archive members.
+
+    Attributes:
+        name: Codec name (key of CODECS).
+        level: Compression level, or None for the codec default.
+    """
+
+    name: str = DEFAULT_CODEC
+    level: Optional[int] = None
+
+    @property
+    def compression(self) -> int:
+        """zipfile compression constant for this codec."""
+        return CODECS[self.name]
+
+    def __str__(self) -> str:
+        return self.name if self.level is None else f"{self.name}:{self.level}"
+
+
+def get_codec(
+    name: str = DEFAULT_CODEC, level: Optional[int] = None
+) -> ArchiveCodec:
+    """Validate and return an archive codec.
+
+    Args:
+        name: Codec name: stored, deflate, bzip2, lzma or zstd (Python
+              3.14+).
+        level: Optional compression level for codecs that support one.
+
+    Returns:
+        The codec.
+
+    Raises:
+        ValueError: If the codec is unavailable or the level is out of
+                    range.
+    """
+    if name not in CODECS:
+        raise ValueError(
+            f"Unknown or unavailable archive codec {name!r}; "
+            f"available: {', '.join(CODECS)}"
+        )
+    bounds = _LEVELS[name]
+    if level is not None and bounds is not None:
+        low, high = bounds
+        if not low <= level <= high:
+            raise ValueError(
+                f"Compression level for {name} must be between "
+                f"{low} and {high}, got {level}"
+            )
+    return ArchiveCodec(name, level if bounds is not None else None)
+
+
+def codec_from_config(config: Dict[str, Any]) -> ArchiveCodec:
+    """Build the archive codec from ``archive_codec``/``archive_level``.
+
+    Args:
+        config: Configuration dict.
+
+    Returns:
+        The configured codec.
+    """
+    return get_codec(
+        config.get("archive_codec", DEFAULT_CODEC), config.get("archive_level")
+    )
+
+
+def _member_info(codec: ArchiveCodec, arcname: str) -> zipfile.ZipInfo:
+    """ZipInfo for a generated member, dated now rather than 1980."""
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+    info.compress_type = codec.compression
+    # The archive's compresslevel is not applied to a ZipInfo passed in
+    info._compresslevel = codec.level  # type: ignore[attr-defined]
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _compress_member(
+    codec: ArchiveCodec,
+    arcname: str,
+    data: Any = None,
+    text: Optional[str] = None,
+    path: Optional[Path] = None,
+) -> bytes:
+    """Compress one member into a single-member ZIP held in memory."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(
+        buf, "w", codec.compression, compresslevel=codec.level
+    ) as zf:
+        if path is not None:
+            zf.write(path, arcname)
+        elif text is not None:
+            zf.writestr(_member_info(codec, arcname), text.encode("utf-8"))
+        else:
+            with zf.open(
+                _member_info(codec, arcname), "w"
+            ) as raw, io.TextIOWrapper(raw, encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True, default=str)
+    return buf.getvalue()
+
+
+def _split_member(buf: bytes) -> Tuple[memoryview, bytearray]:
+    """Split a single-member ZIP into its local record and central entry."""
+    end = _END_RECORD.unpack_from(buf, len(buf) - _END_RECORD.size)
+    if end[0] != _END_SIGNATURE or end[4] != 1:
+        raise ValueError("Unexpected member archive layout")
+    cd_size, cd_offset = end[5], end[6]
+    view = memoryview(buf)
+    return view[:cd_offset], bytearray(view[cd_offset : cd_offset + cd_size])
+
+
+class ArchiveWriter:
+    """Write a ZIP archive whose members are compressed in parallel.
+
+    Members are submitted as they become available and compressed in the
+    background. Each one is written to the file, in submission order, as
+    soon as it and every member before it are ready, so a crash before
+    close() leaves the finished members on disk (without a central
+    directory). close() writes the central directory. Archives are
+    limited to 4 GiB and 65535 members (no ZIP64), which is far beyond
+    any snapshot.
+
+    Args:
+        path: Destination archive path.
+        codec: Compression codec for every member (default: deflate).
+        max_workers: Compression threads (default: CPU count, up to 8).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        codec: Optional[ArchiveCodec] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.path = path
+        self.codec = codec or ArchiveCodec()
+        workers = max_workers or min(os.cpu_count() or 1, 8)
+        self._file: IO[bytes] = open(path, "wb")  # noqa: SIM115
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="archive"
+        )
+        # Members not yet written, in submission order
+        self._pending: Deque[Future[bytes]] = deque()
+        self._lock = threading.Lock()
+        self._central = bytearray()
+        self._offset = 0
+        self._count = 0
+        self._error: Optional[BaseException] = None
+
+    def _submit(self, arcname: str, **source: Any) -> None:
+        """Queue a member for compression and write it when it is ready."""
+        if self._error is not None:
+            raise self._error
+        future = self._executor.submit(
+            _compress_member, self.codec, arcname, **source
+        )
+        with self._lock:
+            self._pending.append(future)
+        future.add_done_callback(self._write_ready)
+
+    def _write_ready(self, _: Optional[Future[bytes]] = None) -> None:
+        """Write every finished member at the head of the queue.
+
+        Runs on the compression thread that finished a member. A failed
+        member stops writing and makes later add_* calls raise its
+        error; close() reports it too.
+        """
+        with self._lock:
+            while self._error is None and self._pending:
+                head = self._pending[0]
+                if not head.done() or head.cancelled():
+                    return
+                error = head.exception()
+                if error is not None:
+                    # Refuse further members instead of queueing them
+                    self._error = error
+                    return
+                try:
+                    self._write_member(head.result())
+                except (OSError, ValueError) as e:
+                    self._error = e
+                    return
+                self._pending.popleft()
+
+    def _write_member(self, buf: bytes) -> None:
+        """Append one member's local record and keep its central entry."""
+        if self._count == 0xFFFF:
+            raise ValueError("Too many archive members")
+        local, entry = _split_member(buf)
+        if self._offset + len(local) >= _ZIP_LIMIT:
+            raise ValueError("Archive exceeds 4 GiB (ZIP64 unsupported)")
+        struct.pack_into("<L", entry, _CENTRAL_OFFSET_FIELD, self._offset)
+        self._file.write(local)
+        self._file.flush()
+        self._central += entry
+        self._offset += len(local)
+        self._count += 1
+
+    def add_json(self, arcname: str, data: Any) -> None:
+        """Queue data to be serialized as a JSON member.
+
+        Args:
+            arcname: Member name inside the archive.
+            data: Data to serialize to JSON (must not be mutated
+                  afterwards).
+        """
+        self._submit(arcname, data=data)
+
+    def add_text(self, arcname: str, text: str) -> None:
+        """Queue a text member.
+
+        Args:
+            arcname: Member name inside the archive.
+            text: Text content.
+        """
+        self._submit(arcname, text=text)
+
+    def add_file(self, arcname: str, path: Path) -> None:
+        """Queue a file on disk as a member.
+
+        Args:
+            arcname: Member name inside the archive.
+            path: File to add.
+        """
+        self._submit(arcname, path=path)
+
+    def close(self) -> Path:
+        """Wait for the remaining members and finish the archive.
+
+        Returns:
+            Path to the written archive.
+
+        Raises:
+            ValueError: If the archive would need ZIP64.
+        """
+        try:
+            self._executor.shutdown(wait=True)
+            self._write_ready()
+            if self._error is not None:
+                raise self._error
+            for future in self._pending:
+                # Only a failed member can be left unwritten
+                future.result()
+            if self._offset + len(self._central) >= _ZIP_LIMIT:
+                raise ValueError("Archive exceeds 4 GiB (ZIP64 unsupported)")
+            self._file.write(self._central)
+            self._file.write(
+                _END_RECORD.pack(
+                    _END_SIGNATURE,
+                    0,
+                    0,
+                    self._count,
+                    self._count,
+                    len(self._central),
+                    self._offset,
+                    0,
+                )
+            )
+        finally:
+            self._file.close()
+        return self.path
+
+    def abort(self) -> None:
+        """Discard queued members and stop writing the archive."""
+        with self._lock:
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(wait=True)
+        self._file.close()
@@ -0,0 +1,379 @@
+"""Per-host (or machine class) baselines and snapshot diffs.
+
+A baseline is a compact, keyed summary of a known-good snapshot:
+processes by name, volumes by mount point, NICs by interface and apps by
+name. ``diff`` summarizes a new snapshot the same way and joins the two
+on those keys, so comparing large process tables is a set of dict
+lookups rather than a text diff.
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .analyze import load_snapshot
+
+SUMMARY_VERSION = 1
+
+# Change thresholds
+PROCESS_CPU_DELTA = 10.0  # percentage points of one core
+PROCESS_RSS_DELTA = 256 * 1024 * 1024
+PROCESS_RSS_RATIO = 1.25
+MEMORY_PERCENT_DELTA = 10.0
+VOLUME_PERCENT_DELTA = 5.0
+
+_NIC_FIELDS = ("isup", "speed", "mtu", "duplex")
+
+
+def summarize(files: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce snapshot files to the keyed summary used for baselines.
+
+    Args:
+        files: Snapshot files from analyze.load_snapshot().
+
+    Returns:
+        Summary dict with meta, memory, processes, volumes, nics and apps.
+    """
+    system = files.get("system_info.json") or {}
+    cpu_memory = files.get("cpu_memory.json") or {}
+    memory = cpu_memory.get("virtual_memory") or {}
+    swap = cpu_memory.get("swap_memory") or {}
+
+    # Top-CPU and top-memory lists overlap; dedupe by pid, then key by
+    # name since pids differ between runs
+    by_pid: Dict[Any, Dict[str, Any]] = {}
+    procs = files.get("processes.json") or {}
+    for key in ("top_processes_by_cpu", "top_processes_by_memory"):
+        for proc in procs.get(key) or []:
+            by_pid.setdefault(proc.get("pid"), proc)
+    processes: Dict[str, Dict[str, Any]] = {}
+    for proc in by_pid.values():
+        entry = processes.setdefault(
+            proc.get("name") or "?", {"count": 0, "cpu_percent": 0.0, "rss": 0}
+        )
+        entry["count"] += 1
+        entry["cpu_percent"] = round(
+            entry["cpu_percent"] + (proc.get("cpu_percent") or 0.0), 1
+        )
+        entry["rss"] += proc.get("rss") or 0
+
+    volumes = {
+        part["mountpoint"]: {
+            "device": part.get("device"),
+            "fstype": part.get("fstype"),
+            "total": part["usage"]["total"],
+            "used": part["usage"]["used"],
+            "percent": part["usage"]["percent"],
+        }
+        for part in (files.get("disks.json") or {}).get("partitions") or []
+        if part.get("usage") and part["usage"].get("total")
+    }
+
+    nics = {
+        iface: {field: stats.get(field) for field in _NIC_FIELDS}
+        for iface, stats in (
+            (files.get("network.json") or {}).get("stats") or {}
+        ).items()
+    }
+
+    apps = {
+        name: (info or {}).get("version")
+        for name, info in (files.get("installed_apps.json") or {}).items()
+        if isinstance(info, dict)
+    }
+
+    return {
+        "version": SUMMARY_VERSION,
+        "meta": {
+            "host": system.get("hostname"),
+            "platform": system.get("platform"),
+            "created": system.get("timestamp_local"),
+        },
+        "memory": {
+            "total": memory.get("total"),
+            "percent": memory.get("percent"),
+            "swap_percent": swap.get("percent"),
+        },
+        "processes": processes,
+        "volumes": volumes,
+        "nics": nics,
+        "apps": apps,
+    }
+
+
+def _safe_key(key: str) -> str:
+    """Make a baseline key safe to use as a file name."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", key)
+
+
+def baseline_path(baseline_dir: Path, key: str) -> Path:
+    """Return the file a baseline key is stored in.
+
+    Args:
+        baseline_dir: Directory holding baselines.
+        key: Host name or machine class.
+
+    Returns:
+        Path of the baseline JSON file.
+    """
+    return baseline_dir / f"{_safe_key(key)}.json"
+
+
+def record_baseline(
+    snapshot: Path, baseline_dir: Path, key: Optional[str] = None
+) -> Tuple[str, Path]:
+    """Record a snapshot as the baseline for a host or machine class.
+
+    Args:
+        snapshot: Snapshot ZIP archive or directory.
+        baseline_dir: Directory holding baselines.
+        key: Baseline name (default: the snapshot's host name).
+
+    Returns:
+        Tuple of (baseline key, path written).
+
+    Raises:
+        ValueError: If no key is given and the snapshot has no host name.
+    """
+    summary = summarize(load_snapshot(snapshot))
+    key = key or summary["meta"]["host"]
+    if not key:
+        raise ValueError("Snapshot has no host name; pass a baseline name")
+    summary["meta"]["snapshot"] = str(snapshot)
+    summary["meta"]["recorded"] = datetime.now().isoformat()
+
+    path = baseline_path(baseline_dir, key)
+    baseline_dir.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return key, path
+
+
+def load_summary(source: Path) -> Dict[str, Any]:
+    """Load a baseline file, or summarize a snapshot archive/directory.
+
+    Args:
+        source: Baseline JSON file, snapshot ZIP or snapshot directory.
+
+    Returns:
+        Summary dict.
+    """
+    if source.suffix == ".json":
+        summary: Dict[str, Any] = json.loads(source.read_text("utf-8"))
+        return summary
+    return summarize(load_snapshot(source))
+
+
+def _join(
+    before: Dict[str, Any], after: Dict[str, Any]
+) -> Tuple[List[str], List[str], List[str]]:
+    """Keyed join: (new keys, removed keys, keys in both), each sorted."""
+    old, new = before.keys(), after.keys()
+    return sorted(new - old), sorted(old - new), sorted(old & new)
+
+
+def _diff_processes(
+    before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    added, removed, common = _join(before, after)
+    heavier = []
+    for name in common:
+        old, new = before[name], after[name]
+        cpu_delta = new["cpu_percent"] - old["cpu_percent"]
+        rss_delta = new["rss"] - old["rss"]
+        if cpu_delta >= PROCESS_CPU_DELTA or (
+            rss_delta >= PROCESS_RSS_DELTA
+            and new["rss"] >= PROCESS_RSS_RATIO * old["rss"]
+        ):
+            heavier.append(
+                {
+                    "name": name,
+                    "cpu_percent": [old["cpu_percent"], new["cpu_percent"]],
+                    "rss": [old["rss"], new["rss"]],
+                    "count": [old["count"], new["count"]],
+                }
+            )
+    heavier.sort(key=lambda p: p["rss"][1] - p["rss"][0], reverse=True)
+    return {
+        "new": sorted(
+            ({"name": n, **after[n]} for n in added),
+            key=lambda p: (p["cpu_percent"], p["rss"]),
+            reverse=True,
+        ),
+        "gone": removed,
+        "heavier": heavier,
+    }
+
+
+def _diff_memory(
+    before: Dict[str, Any], after: Dict[str, Any]
+) -> Dict[str, Any]:
+    changes = {}
+    if before.get("total") != after.get("total"):
+        changes["total"] = [before.get("total"), after.get("total")]
+    for key in ("percent", "swap_percent"):
+        old, new = before.get(key), after.get(key)
+        if (
+            old is not None
+            and new is not None
+            and abs(new - old) >= MEMORY_PERCENT_DELTA
+        ):
+            changes[key] = [old, new]
+    return changes
+
+
+def _diff_volumes(
+    before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    added, removed, common = _join(before, after)
+    changed = []
+    for mount in common:
+        old, new = before[mount], after[mount]
+        if (
+            abs(new["percent"] - old["percent"]) >= VOLUME_PERCENT_DELTA
+            or new["total"] != old["total"]
+        ):
+            changed.append(
+                {
+                    "mountpoint": mount,
+                    "percent": [old["percent"], new["percent"]],
+                    "used": [old["used"], new["used"]],
+                    "total": [old["total"], new["total"]],
+                }
+            )
+    return {"new": added, "gone": removed, "changed": changed}
+
+
+def _diff_nics(
+    before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    added, removed, common = _join(before, after)
+    changed = []
+    for iface in common:
+        for field in _NIC_FIELDS:
+            old, new = before[iface].get(field), after[iface].get(field)
+            if old != new:
+                changed.append(
+                    {
+                        "interface": iface,
+                        "field": field,
+                        "before": old,
+                        "after": new,
+                    }
+                )
+    return {"new": added, "gone": removed, "changed": changed}
+
+
+def _diff_apps(
+    before: Dict[str, Any], after: Dict[str, Any]
+) -> Dict[str, Any]:
+    added, removed, common = _join(before, after)
+    return {
+        "new": {name: after[name] for name in added},
+        "gone": {name: before[name] for name in removed},
+        "changed": {
+            name: [before[name], after[name]]
+            for name in common
+            if before[name] != after[name]
+        },
+    }
+
+
+def diff_summaries(
+    baseline: Dict[str, Any], current: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Compare a snapshot summary against a baseline summary.
+
+    Args:
+        baseline: Baseline summary.
+        current: Summary of the snapshot being checked.
+
+    Returns:
+        Dict of changes per section (processes, memory, volumes, nics,
+        apps); empty sections mean no significant change.
+    """
+    return {
+        "baseline": baseline.get("meta", {}),
+        "snapshot": current.get("meta", {}),
+        "processes": _diff_processes(
+            baseline.get("processes", {}), current.get("processes", {})
+        ),
+        "memory": _diff_memory(
+            baseline.get("memory", {}), current.get("memory", {})
+        ),
+        "volumes": _diff_volumes(
+            baseline.get("volumes", {}), current.get("volumes", {})
+        ),
+        "nics": _diff_nics(baseline.get("nics", {}), current.get("nics", {})),
+        "apps": _diff_apps(baseline.get("apps", {}), current.get("apps", {})),
+    }
+
+
+def _gb(value: Optional[float]) -> str:
+    return "?" if value is None else f"{value / 1024**3:.1f} GB"
+
+
+def format_diff(diff: Dict[str, Any]) -> str:
+    """Render a diff as plain text.
+
+    Args:
+        diff: Result of diff_summaries().
+
+    Returns:
+        Human-readable list of changes.
+    """
+    base, snap = diff["baseline"], diff["snapshot"]
+    lines = [
+        f"Snapshot {snap.get('host')} ({snap.get('created')}) vs baseline "
+        f"{base.get('host')} ({base.get('created')})",
+        "",
+    ]
+    procs = diff["processes"]
+    for p in procs["new"]:
+        lines.append(
+            f"+ process {p['name']}: {p['cpu_percent']}% CPU, "
+            f"{_gb(p['rss'])} RSS"
+        )
+    for p in procs["heavier"]:
+        lines.append(
+            f"^ process {p['name']}: CPU {p['cpu_percent'][0]}% -> "
+            f"{p['cpu_percent'][1]}%, RSS {_gb(p['rss'][0])} -> "
+            f"{_gb(p['rss'][1])}"
+        )
+    for name in procs["gone"]:
+        lines.append(f"- process {name}")
+
+    for key, (old, new) in diff["memory"].items():
+        if key == "total":
+            lines.append(f"~ RAM installed: {_gb(old)} -> {_gb(new)}")
+        else:
+            lines.append(f"~ {key.replace('_', ' ')}: {old}% -> {new}%")
+
+    vols = diff["volumes"]
+    for v in vols["changed"]:
+        lines.append(
+            f"~ volume {v['mountpoint']}: {v['percent'][0]}% -> "
+            f"{v['percent'][1]}% full"
+        )
+    lines.extend(f"+ volume {m}" for m in vols["new"])
+    lines.extend(f"- volume {m}" for m in vols["gone"])
+
+    nics = diff["nics"]
+    for c in nics["changed"]:
+        lines.append(
+            f"~ NIC {c['interface']} {c['field']}: {c['before']} -> "
+            f"{c['after']}"
+        )
+    lines.extend(f"+ NIC {n}" for n in nics["new"])
+    lines.extend(f"- NIC {n}" for n in nics["gone"])
+
+    apps = diff["apps"]
+    for name, (old, new) in apps["changed"].items():
+        lines.append(f"~ app {name}: {old} -> {new}")
+    lines.extend(f"+ app {n} {v}" for n, v in apps["new"].items())
+    lines.extend(f"- app {n} {v}" for n, v in apps["gone"].items())
+
+    if len(lines) == 2:
+        lines.append("No significant changes from the baseline.")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,191 @@
+"""Persistent cache of the external tools and backends that work here.
+
+Collectors shell out to tools such as nvidia-smi, powermetrics or ping
+and import optional backends such as py3nvml. On a host where a tool is
+missing (or needs sudo) every run used to pay for a failed spawn or a
+timeout. The cache records what was found to work, with a TTL, so those
+attempts are skipped until the entry expires or ``--reprobe`` is given.
+
+Results are only persisted once a snapshot run calls configure(); until
+then (e.g. when collectors are called directly) the cache lives in
+memory.
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_VERSION = 1
+DEFAULT_TTL_HOURS = 24.0
+
+# Python backends probed by import spec rather than on PATH
+BACKENDS = {
+    "py3nvml": "py3nvml.py3nvml",
+    "pynvml": "pynvml",
+    "win32gui": "win32gui",
+}
+
+
+def _probe(name: str) -> Dict[str, Any]:
+    """Check whether a tool is on PATH or a backend is importable."""
+    module = BACKENDS.get(name)
+    if module is not None:
+        try:
+            found = importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
+            found = False
+        return {"available": found, "detail": module if found else None}
+    path = shutil.which(name)
+    return {"available": path is not None, "detail": path}
+
+
+class CapabilityCache:
+    """Thread-safe map of capability name to availability.
+
+    Args:
+        path: JSON file the cache is loaded from and saved to, or None
+              to keep it in memory only.
+        ttl: Seconds an entry stays valid before it is probed again.
+        reprobe: Ignore the entries saved in ``path`` and probe again.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: float = DEFAULT_TTL_HOURS * 3600,
+        reprobe: bool = False,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path is not None and not reprobe:
+            self._entries = self._load(path)
+
+    @staticmethod
+    def _load(path: Path) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        entries: Dict[str, Dict[str, Any]] = data.get("entries") or {}
+        return entries
+
+    def _fresh(self, entry: Dict[str, Any]) -> bool:
+        return bool(time.time() - entry.get("checked", 0) < self.ttl)
+
+    def available(self, name: str) -> bool:
+        """Return whether a tool or backend works on this host.
+
+        Unknown or expired entries are probed (PATH lookup or import
+        spec) and cached.
+
+        Args:
+            name: Executable name (e.g. "nvidia-smi") or backend name
+                  (a key of BACKENDS).
+
+        Returns:
+            True if the capability is believed to work.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or not self._fresh(entry):
+                entry = dict(_probe(name), checked=time.time())
+                self._entries[name] = entry
+                self._dirty = True
+            return bool(entry["available"])
+
+    def record(
+        self, name: str, available: bool, detail: Optional[str] = None
+    ) -> None:
+        """Record the outcome of actually using a capability.
+
+        Collectors call this when a tool that is present still fails in
+        a way that will not fix itself, such as powermetrics without
+        sudo or NVML without a driver.
+
+        Args:
+            name: Capability name.
+            available: Whether it worked.
+            detail: Optional explanation (error message or path).
+        """
+        with self._lock:
+            self._entries[name] = {
+                "available": available,
+                "detail": detail,
+                "checked": time.time(),
+            }
+            self._dirty = True
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of all cached entries."""
+        with self._lock:
+            return {name: dict(e) for name, e in self._entries.items()}
+
+    def save(self) -> None:
+        """Write the cache to its file if anything changed.
+
+        The file is replaced atomically; errors are ignored since the
+        cache is only an optimization.
+        """
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            data = {"version": CACHE_VERSION, "entries": self._entries}
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError:
+                pass
+
+
+_cache = CapabilityCache()
+
+
+def configure(
+    config: Dict[str, Any], reprobe: bool = False
+) -> CapabilityCache:
+    """Load the persistent cache named by ``capability_cache``.
+
+    Args:
+        config: Configuration dict (``capability_cache`` path and
+                ``capability_ttl_hours``).
+        reprobe: Discard the cached entries and probe everything again.
+
+    Returns:
+        The cache now used by available() and record().
+    """
+    global _cache
+    ttl = float(config.get("capability_ttl_hours", DEFAULT_TTL_HOURS))
+    _cache = CapabilityCache(
+        Path(config["capability_cache"]).expanduser(),
+        ttl=ttl * 3600,
+        reprobe=reprobe,
+    )
+    return _cache
+
+
+def get_cache() -> CapabilityCache:
+    """Return the cache currently in use."""
+    return _cache
+
+
+def available(name: str) -> bool:
+    """Return whether a tool or backend works (see CapabilityCache)."""
+    return _cache.available(name)
+
+
+def record(name: str, ok: bool, detail: Optional[str] = None) -> None:
+    """Record the outcome of using a capability (see CapabilityCache)."""
+    _cache.record(name, ok, detail)
@@ -1,45 +1,56 @@
-"""Command-line interface for Big Red Button."""
+"""Command-line interface for Big Red Button.
+
+Each command imports what it needs when it runs, so the CLI can print
+its first line before psutil, the collectors or the analysis modules are
+loaded (see ``--profile-startup``).
+"""
 
 import argparse
+import json
 import sys
-import traceback
 from pathlib import Path
+from typing import Any, Dict
 
+from .collectors.registry import PROFILES
 from .config import init_config, load_config
-from .snapshot import (
-    create_snapshot,
-    open_email_draft,
-    reveal_in_file_manager,
-    zip_snapshot,
-)
 
 
-def main() -> None:
-    """Main entry point for the snapshot tool."""
-    parser = argparse.ArgumentParser(
-        description="Performance snapshot tool for creative workstations"
-    )
-    parser.add_argument(
-        "--init-config",
-        nargs="?",
-        const="config.toml",
-        help="Initialize a new configuration file. Optionally specify the path (default: config.toml)",
-    )
-    args = parser.parse_args()
-
-    if args.init_config:
-        init_config(Path(args.init_config))
-        sys.exit(0)
+def run_snapshot(args: argparse.Namespace) -> None:
+    """Capture a snapshot, bundle it and hand it to the user.
 
+    Args:
+        args: Parsed command-line arguments.
+    """
+    # Respond before the heavier snapshot modules are imported
+    print("Big Red Button: preparing performance snapshot...", flush=True)
     try:
+        from .archive import codec_from_config
+        from .snapshot import (
+            create_snapshot,
+            open_email_draft,
+            reveal_in_file_manager,
+            zip_snapshot,
+        )
+
         # Load config
         config = load_config()
+        if args.profile:
+            config["profile"] = args.profile
+        if args.directory:
+            config["snapshot_format"] = "directory"
+        if args.reprobe:
+            config["reprobe"] = True
+        if args.low_impact:
+            config["low_impact"] = True
 
-        # Create snapshot
-        snap_dir = create_snapshot(config)
+        # Create snapshot (streamed straight into a ZIP by default)
+        snapshot_path = create_snapshot(config)
 
-        # Create ZIP
-        zip_path = zip_snapshot(snap_dir)
+        # Directory mode: create the ZIP afterwards
+        if snapshot_path.is_dir():
+            zip_path = zip_snapshot(snapshot_path, codec_from_config(config))
+        else:
+            zip_path = snapshot_path
 
         print()
         print("=" * 70)
@@ -64,9 +75,551 @@ def main() -> None:
     except Exception as e:
         print(f"\nERROR during snapshot: {e}")
         print("Please report this error to IT/support.")
+        import traceback
+
         traceback.print_exc()
         sys.exit(1)
 
 
+def run_agent_command(args: argparse.Namespace) -> None:
+    """Run the background flight recorder until interrupted.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    from .recorder import run_agent
+
+    config = load_config()
+    path = Path(args.path or config["recorder_path"]).expanduser()
+    interval = args.interval or config["recorder_interval"]
+    capacity = args.capacity or config["recorder_capacity"]
+
+    print(
+        f"Flight recorder writing to {path} every {interval}s "
+        f"({capacity} samples). Press Ctrl+C to stop."
+    )
+    try:
+        run_agent(path, interval=interval, capacity=capacity)
+    except KeyboardInterrupt:
+        print("\nFlight recorder stopped.")
+
+
+def run_watch_command(args: argparse.Namespace) -> None:
+    """Watch thresholds and take snapshots automatically until interrupted.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    from .archive import codec_from_config
+    from .snapshot import create_snapshot, zip_snapshot
+    from .watch import trigger_context, watcher_from_config
+
+    config = load_config()
+    if args.profile:
+        config["profile"] = args.profile
+    if args.low_impact:
+        config["low_impact"] = True
+    if args.interval:
+        config["watch_interval"] = args.interval
+    if args.cooldown is not None:
+        config["watch_cooldown_seconds"] = args.cooldown
+
+    def on_trigger(trigger: Dict[str, Any]) -> None:
+        print(
+            f"{trigger['fired_at']}: rule '{trigger['rule']}' fired "
+            f"({trigger['metric']} = {trigger['value']})"
+        )
+        if args.dry_run:
+            return
+        try:
+            path = create_snapshot(config, trigger_context(trigger))
+            if path.is_dir():
+                path = zip_snapshot(path, codec_from_config(config))
+        except Exception as e:
+            # Keep watching; the next trigger may succeed
+            print(f"ERROR during automatic snapshot: {e}")
+            return
+        print(f"Snapshot created: {path}")
+
+    try:
+        watcher = watcher_from_config(config, on_trigger, rules=args.rule)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print(
+        f"Watching {len(watcher.rules)} rule(s) every {watcher.interval}s "
+        f"(cooldown {watcher.cooldown:.0f}s). Press Ctrl+C to stop."
+    )
+    for rule in watcher.rules:
+        print(
+            f"  {rule.metric} {rule.op} {rule.threshold:g} "
+            f"for {rule.seconds:g}s"
+        )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print(f"\nWatch stopped after {watcher.triggers} trigger(s).")
+
+
+def run_exporter_command(args: argparse.Namespace) -> None:
+    """Serve cached collector metrics over HTTP until interrupted.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    from . import capabilities
+    from .exporter import cache_from_config, make_server
+    from .priority import apply_low_impact
+
+    config = load_config()
+    if args.profile:
+        config["exporter_profile"] = args.profile
+    if args.low_impact:
+        config["low_impact"] = True
+    listen = args.listen or config["exporter_listen"]
+
+    caps = capabilities.configure(config, reprobe=args.reprobe)
+    if config.get("low_impact"):
+        apply_low_impact(config)
+    try:
+        cache = cache_from_config(config)
+        server = make_server(listen, cache)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: cannot start exporter: {e}")
+        sys.exit(1)
+
+    print(
+        f"Serving metrics from {len(cache.specs)} collectors at "
+        f"{listen}/metrics ({len(cache.background)} refreshed in the "
+        "background). Press Ctrl+C to stop."
+    )
+    cache.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nExporter stopped.")
+    finally:
+        server.server_close()
+        cache.stop()
+        caps.save()
+
+
+def run_analyze_command(args: argparse.Namespace) -> None:
+    """Analyze a snapshot and print the findings report.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    import zipfile
+
+    from .analyze import analyze_snapshot, format_text
+
+    try:
+        report = analyze_snapshot(Path(args.snapshot).expanduser())
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"ERROR: cannot read snapshot: {e}")
+        sys.exit(1)
+
+    output = (
+        json.dumps(report, indent=2, default=str)
+        if args.json
+        else format_text(report)
+    )
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        print(f"Report written to {args.output}")
+    else:
+        print(output)
+
+
+def run_index_command(args: argparse.Namespace) -> None:
+    """Incrementally index the snapshots under snapshot_root.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    from .fleet import index_snapshots
+
+    config = load_config()
+    root = Path(args.root or config["snapshot_root"]).expanduser()
+    db_path = Path(args.db or config["fleet_db"]).expanduser()
+    if not root.is_dir():
+        print(f"ERROR: snapshot root not found: {root}")
+        sys.exit(1)
+
+    print(f"Indexing {root} into {db_path}...")
+    stats = index_snapshots(
+        root, db_path, workers=args.workers, prune=not args.no_prune
+    )
+    print(
+        f"{stats['scanned']} snapshots: {stats['added']} added, "
+        f"{stats['updated']} updated, {stats['unchanged']} unchanged, "
+        f"{stats['removed']} removed, {stats['errors']} unreadable "
+        f"({stats['seconds']}s)"
+    )
+
+
+def run_query_command(args: argparse.Namespace) -> None:
+    """Query the fleet index and print the matching snapshots.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    from .fleet import DEFAULT_QUERY_COLUMNS, format_table, query_snapshots
+
+    config = load_config()
+    db_path = Path(args.db or config["fleet_db"]).expanduser()
+    if not db_path.exists():
+        print(f"ERROR: no fleet index at {db_path}; run 'index' first")
+        sys.exit(1)
+
+    try:
+        rows = query_snapshots(
+            db_path,
+            where=args.where,
+            host=args.host,
+            app=args.app,
+            since=args.since,
+            until=args.until,
+            finding=args.finding,
+            group_by=args.group_by,
+            aggregates=args.agg,
+            columns=(
+                args.columns.split(",")
+                if args.columns
+                else DEFAULT_QUERY_COLUMNS
+            ),
+            limit=args.limit or None,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(format_table(rows), end="")
+
+
+def run_baseline_command(args: argparse.Namespace) -> None:
+    """Record a snapshot as the baseline for a host or machine class.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    import zipfile
+
+    from .baseline import record_baseline
+
+    config = load_config()
+    try:
+        key, path = record_baseline(
+            Path(args.snapshot).expanduser(),
+            Path(config["baseline_dir"]).expanduser(),
+            key=args.name,
+        )
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Baseline '{key}' recorded in {path}")
+
+
+def run_diff_command(args: argparse.Namespace) -> None:
+    """Compare a snapshot against a baseline and print the changes.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    import zipfile
+
+    from .baseline import (
+        baseline_path,
+        diff_summaries,
+        format_diff,
+        load_summary,
+    )
+
+    config = load_config()
+    baseline_dir = Path(config["baseline_dir"]).expanduser()
+    try:
+        current = load_summary(Path(args.snapshot).expanduser())
+        # --baseline may name a baseline or point at a file/snapshot
+        key = args.baseline or current["meta"]["host"] or ""
+        source = Path(key).expanduser()
+        if not source.exists():
+            source = baseline_path(baseline_dir, key)
+        if not source.exists():
+            print(
+                f"ERROR: no baseline '{key}' in {baseline_dir}; record one "
+                "with 'baseline <snapshot>' or pass --baseline"
+            )
+            sys.exit(1)
+        diff = diff_summaries(load_summary(source), current)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(diff, indent=2, default=str))
+    else:
+        print(format_diff(diff), end="")
+
+
+def main() -> None:
+    """Main entry point for the snapshot tool."""
+    parser = argparse.ArgumentParser(
+        description="Performance snapshot tool for creative workstations"
+    )
+    parser.add_argument(
+        "--init-config",
+        nargs="?",
+        const="config.toml",
+        help="Initialize a new configuration file. Optionally specify the path (default: config.toml)",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Collection profile to run: "
+        f"{', '.join(PROFILES)} or a custom [profiles.<name>] "
+        "from config.toml (default: from config.toml)",
+    )
+    parser.add_argument(
+        "--directory",
+        action="store_true",
+        help="Write the snapshot as a plain directory (zipped afterwards) "
+        "instead of streaming it into the ZIP; useful for debugging",
+    )
+    parser.add_argument(
+        "--low-impact",
+        action="store_true",
+        help="Lower the tool's CPU and I/O priority and limit concurrent "
+        "subprocesses so it competes less with the workload",
+    )
+    parser.add_argument(
+        "--reprobe",
+        action="store_true",
+        help="Ignore the capability cache and check again which external "
+        "tools and backends work on this machine",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import time per module and time to first output for "
+        "the snapshot command (with --profile's collectors), then exit",
+    )
+    subparsers = parser.add_subparsers(
+        dest="command",
+        metavar="COMMAND",
+        help="Run without a command to capture a snapshot",
+    )
+
+    agent_parser = subparsers.add_parser(
+        "agent",
+        help="Run the background flight recorder",
+        description="Continuously sample core metrics into a ring buffer "
+        "file so snapshots include history from before the button press",
+    )
+    agent_parser.add_argument(
+        "--path", help="Recorder file (default: recorder_path from config)"
+    )
+    agent_parser.add_argument(
+        "--interval", type=float, help="Seconds between samples"
+    )
+    agent_parser.add_argument(
+        "--capacity", type=int, help="Number of samples kept in the ring"
+    )
+
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Take snapshots automatically when thresholds are crossed",
+        description="Sample core metrics, evaluate watch_rules from "
+        "config.toml and take a snapshot without prompting when a rule "
+        "holds long enough, e.g. 'core_max_percent > 95 for 10s'",
+    )
+    watch_parser.add_argument(
+        "--rule",
+        action="append",
+        metavar="EXPR",
+        help="Rule replacing watch_rules, like 'swap_percent > 40' "
+        "(repeatable; '<metric> <op> <value> [for <seconds>]')",
+    )
+    watch_parser.add_argument(
+        "--interval", type=float, help="Seconds between samples"
+    )
+    watch_parser.add_argument(
+        "--cooldown",
+        type=float,
+        help="Seconds after a snapshot before rules can fire again",
+    )
+    watch_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report rules that fire without taking snapshots",
+    )
+
+    exporter_parser = subparsers.add_parser(
+        "exporter",
+        help="Serve collector metrics to a local Prometheus scraper",
+        description="Serve the collectors' metrics at /metrics in the "
+        "Prometheus text format, caching each collector's result for its "
+        "exporter_ttl",
+    )
+    exporter_parser.add_argument(
+        "--listen",
+        help="host:port or unix:<path> (default: exporter_listen from config)",
+    )
+
+    analyze_parser = subparsers.add_parser(
+        "analyze",
+        help="Triage a snapshot and report ranked findings",
+        description="Evaluate the README triage steps against a snapshot "
+        "ZIP or directory and report problems, worst first",
+    )
+    analyze_parser.add_argument(
+        "snapshot", help="Snapshot ZIP archive or directory"
+    )
+    analyze_parser.add_argument(
+        "--json", action="store_true", help="Output the report as JSON"
+    )
+    analyze_parser.add_argument(
+        "--output", help="Write the report to a file instead of stdout"
+    )
+
+    index_parser = subparsers.add_parser(
+        "index",
+        help="Index snapshots into the fleet database",
+        description="Scan snapshot_root and extract key metrics from new "
+        "or changed snapshot archives into a SQLite database",
+    )
+    index_parser.add_argument(
+        "--root", help="Directory to scan (default: snapshot_root)"
+    )
+    index_parser.add_argument(
+        "--db", help="Database path (default: fleet_db from config)"
+    )
+    index_parser.add_argument(
+        "--workers", type=int, help="Extraction worker processes"
+    )
+    index_parser.add_argument(
+        "--no-prune",
+        action="store_true",
+        help="Keep rows for snapshots that no longer exist",
+    )
+
+    query_parser = subparsers.add_parser(
+        "query",
+        help="Filter and aggregate indexed snapshots",
+        description="Query the fleet database, e.g. "
+        "query --app Resolve --where 'swap_percent>50'",
+    )
+    query_parser.add_argument(
+        "--db", help="Database path (default: fleet_db from config)"
+    )
+    query_parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        metavar="EXPR",
+        help="Filter like 'swap_percent>50' or 'top_process~Resolve*' "
+        "(repeatable; operators = != > >= < <= ~)",
+    )
+    query_parser.add_argument("--host", help="Host name glob, e.g. 'edit-*'")
+    query_parser.add_argument(
+        "--app", help="Application the user reported (substring)"
+    )
+    query_parser.add_argument("--since", help="Earliest date (YYYY-MM-DD)")
+    query_parser.add_argument("--until", help="Latest date (YYYY-MM-DD)")
+    query_parser.add_argument(
+        "--finding", help="Only snapshots with a matching analyze finding"
+    )
+    query_parser.add_argument(
+        "--group-by", help="Aggregate by a column, 'day' or 'month'"
+    )
+    query_parser.add_argument(
+        "--agg",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help="Aggregate: 'count' or '<avg|min|max|sum>:<column>' "
+        "(repeatable, with --group-by)",
+    )
+    query_parser.add_argument(
+        "--columns", help="Comma-separated columns to show"
+    )
+    query_parser.add_argument(
+        "--limit",
+        type=int,
+        default=50,
+        help="Maximum rows (0 for all, default: 50)",
+    )
+    query_parser.add_argument(
+        "--json", action="store_true", help="Output rows as JSON"
+    )
+
+    baseline_parser = subparsers.add_parser(
+        "baseline",
+        help="Record a snapshot as a known-good baseline",
+        description="Store a compact summary of a snapshot as the "
+        "baseline for its host (or a named machine class)",
+    )
+    baseline_parser.add_argument(
+        "snapshot", help="Snapshot ZIP archive or directory"
+    )
+    baseline_parser.add_argument(
+        "--name",
+        help="Baseline name, e.g. a machine class such as 'edit-suite' "
+        "(default: the snapshot's host name)",
+    )
+
+    diff_parser = subparsers.add_parser(
+        "diff",
+        help="Compare a snapshot against a baseline",
+        description="Show new or heavier processes and changes in memory, "
+        "disk fill, NIC speed/MTU and app versions since the baseline",
+    )
+    diff_parser.add_argument(
+        "snapshot", help="Snapshot ZIP archive or directory"
+    )
+    diff_parser.add_argument(
+        "--baseline",
+        help="Baseline name, baseline file or another snapshot "
+        "(default: the baseline for the snapshot's host)",
+    )
+    diff_parser.add_argument(
+        "--json", action="store_true", help="Output the diff as JSON"
+    )
+
+    args = parser.parse_args()
+
+    if args.init_config:
+        init_config(Path(args.init_config))
+        sys.exit(0)
+
+    if args.profile_startup:
+        from .startup import format_startup, profile_startup
+
+        print(format_startup(profile_startup(args.profile)), end="")
+        sys.exit(0)
+
+    if args.command == "agent":
+        run_agent_command(args)
+    elif args.command == "analyze":
+        run_analyze_command(args)
+    elif args.command == "baseline":
+        run_baseline_command(args)
+    elif args.command == "diff":
+        run_diff_command(args)
+    elif args.command == "exporter":
+        run_exporter_command(args)
+    elif args.command == "index":
+        run_index_command(args)
+    elif args.command == "query":
+        run_query_command(args)
+    elif args.command == "watch":
+        run_watch_command(args)
+    else:
+        run_snapshot(args)
+
+
 if __name__ == "__main__":
     main()
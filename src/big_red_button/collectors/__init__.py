@@ -1,23 +1,30 @@
-"""Data collectors for system metrics and information."""
+"""Data collectors for system metrics and information.
 
-from .cpu_memory import collect_cpu_memory
-from .disks import collect_disks
-from .foreground_app import collect_foreground_app
-from .gpu import collect_gpu_info
-from .installed_apps import detect_installed_apps
-from .network import collect_network
-from .processes import collect_processes
-from .system import collect_system_info
-from .temperatures import collect_temperatures
+Collector modules are imported on first attribute access, so importing
+this package (or the registry) stays cheap.
+"""
 
-__all__ = [
-    "collect_system_info",
-    "collect_cpu_memory",
-    "collect_disks",
-    "collect_network",
-    "collect_gpu_info",
-    "collect_temperatures",
-    "collect_processes",
-    "collect_foreground_app",
-    "detect_installed_apps",
-]
+import importlib
+from typing import Any
+
+# Exported collector -> submodule defining it
+_EXPORTS = {
+    "collect_system_info": "system",
+    "collect_cpu_memory": "cpu_memory",
+    "collect_disks": "disks",
+    "collect_network": "network",
+    "collect_gpu_info": "gpu",
+    "collect_temperatures": "temperatures",
+    "collect_processes": "processes",
+    "collect_foreground_app": "foreground_app",
+    "detect_installed_apps": "installed_apps",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,212 @@
+"""Burst sampler for micro-stutters.
+
+Audio dropouts and playback hitches last tens of milliseconds and vanish
+in one-second averages. This collector samples per-core CPU, the run
+queue and memory every 10-20 ms for a short window, writing into arrays
+preallocated for the whole window so the loop itself allocates almost
+nothing, then scans the buffer for stalls.
+
+Per-core CPU time is accounted by the kernel in 10 ms clock ticks, so
+at a 10 ms interval each core reads 0% or 100% per sample; stalls are
+therefore judged over runs of samples, not single values.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..sampler import TickSampler, _busy_and_total, ticks
+
+# A core at or above this is treated as saturated
+STALL_CORE_PERCENT = 95.0
+# Runs shorter than this are ignored (3 ticks at 10 ms)
+MIN_STALL_SECONDS = 0.03
+# A sample this many intervals late means the sampler itself was not
+# scheduled: the machine stalled for everything, not just one core
+LATE_FACTOR = 2.0
+# Stall events listed in the summary (the buffer has everything)
+MAX_STALL_EVENTS = 50
+
+
+def _runs(flags: List[bool]) -> List[Tuple[int, int]]:
+    """Return (start, end) index pairs of consecutive True values."""
+    runs = []
+    start = None
+    for i, flag in enumerate(flags + [False]):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            runs.append((start, i))
+            start = None
+    return runs
+
+
+def detect_stalls(
+    offsets: List[float],
+    per_core: List[List[Optional[float]]],
+    run_queue: List[Optional[int]],
+    cpu_count: int,
+    interval: float,
+) -> Dict[str, Any]:
+    """Find stalls in a burst buffer.
+
+    Three kinds of stall are reported: ``late_tick`` (the sampler woke up
+    more than LATE_FACTOR intervals late), ``core_saturated`` (a core at
+    or above STALL_CORE_PERCENT) and ``run_queue`` (more runnable tasks
+    than logical CPUs). The last two must last MIN_STALL_SECONDS.
+
+    Args:
+        offsets: Seconds since the burst started, per sample.
+        per_core: Per-core CPU percent series (None where unknown).
+        run_queue: Runnable tasks per sample (None where unknown).
+        cpu_count: Number of logical CPUs.
+        interval: Target seconds between samples.
+
+    Returns:
+        Summary dict with tick timing statistics, peaks, stall counts by
+        kind and the longest stall events.
+    """
+    gaps = [b - a for a, b in zip([0.0] + offsets, offsets)]
+    events: List[Dict[str, Any]] = []
+    min_run = max(int(math.ceil(MIN_STALL_SECONDS / interval - 1e-9)), 1)
+
+    def _event(kind: str, start: int, end: int, **extra: Any) -> None:
+        begin = offsets[start] - gaps[start]
+        events.append(
+            {
+                "kind": kind,
+                "start_ms": round(begin * 1000, 1),
+                "duration_ms": round((offsets[end - 1] - begin) * 1000, 1),
+                **extra,
+            }
+        )
+
+    for i, gap in enumerate(gaps):
+        if gap > LATE_FACTOR * interval:
+            _event(
+                "late_tick",
+                i,
+                i + 1,
+                late_ms=round((gap - interval) * 1000, 1),
+            )
+
+    for core, series in enumerate(per_core):
+        # Samples with no clock tick on the core (None) continue the run
+        hot, state = [], False
+        for v in series:
+            if v is not None:
+                state = v >= STALL_CORE_PERCENT
+            hot.append(state)
+        for start, end in _runs(hot):
+            if end - start >= min_run:
+                _event("core_saturated", start, end, core=core)
+
+    queued = [q is not None and q > cpu_count for q in run_queue]
+    for start, end in _runs(queued):
+        if end - start >= min_run:
+            peak = max(q for q in run_queue[start:end] if q is not None)
+            _event("run_queue", start, end, peak=peak)
+
+    sorted_gaps = sorted(gaps)
+    known = [v for series in per_core for v in series if v is not None]
+    queue = [q for q in run_queue if q is not None]
+    counts: Dict[str, int] = {}
+    for event in events:
+        counts[event["kind"]] = counts.get(event["kind"], 0) + 1
+    return {
+        "samples": len(offsets),
+        "max_tick_gap_ms": round(sorted_gaps[-1] * 1000, 1) if gaps else None,
+        "p99_tick_gap_ms": (
+            round(sorted_gaps[int(0.99 * (len(gaps) - 1))] * 1000, 1)
+            if gaps
+            else None
+        ),
+        "peak_core_percent": max(known) if known else None,
+        "max_run_queue": max(queue) if queue else None,
+        "stall_counts": counts,
+        "stalls": sorted(events, key=lambda e: e["duration_ms"], reverse=True)[
+            :MAX_STALL_EVENTS
+        ],
+    }
+
+
+def collect_burst(
+    duration: float = 2.0,
+    interval: float = 0.01,
+    backend: str = "auto",
+) -> Dict[str, Any]:
+    """Sample per-core CPU, run queue and memory at a high rate.
+
+    Args:
+        duration: Seconds to sample for.
+        interval: Seconds between samples (10-20 ms is the intended
+                  range).
+        backend: Sampler counter backend ("auto", "psutil" or "procfs").
+                 The run queue is only available from procfs.
+
+    Returns:
+        Dict with the full-resolution buffer (one list per series, and
+        one per core) and a summary of the stalls found in it.
+    """
+    count = max(int(round(duration / interval)), 1)
+    print(
+        f"  Burst sampling {duration}s at {interval * 1000:.0f} ms "
+        f"({count} samples)..."
+    )
+    sampler = TickSampler(
+        interval=interval,
+        channels=("cpu", "memory", "runqueue"),
+        backend=backend,
+    )
+    try:
+        prev = sampler.read()
+        start = prev.monotonic
+        last = [_busy_and_total(t) for t in prev.counters["cpu"]]
+        cores = len(last)
+
+        # Preallocated for the whole window; -1 marks "unknown"
+        offsets = array("d", [0.0]) * count
+        cpu = array("f", [-1.0]) * (count * cores)
+        memory = array("f", [0.0]) * count
+        queue = array("i", [-1]) * count
+
+        for i in ticks(interval, count, start=start):
+            reading = sampler.read()
+            k = i - 1
+            offsets[k] = reading.monotonic - start
+            row = k * cores
+            for c, times in enumerate(reading.counters["cpu"][:cores]):
+                busy, total = _busy_and_total(times)
+                d_total = total - last[c][1]
+                if d_total > 0:
+                    cpu[row + c] = min(
+                        100.0 * max(busy - last[c][0], 0.0) / d_total, 100.0
+                    )
+                    last[c] = (busy, total)
+            memory[k] = reading.counters["memory"].percent
+            runqueue = reading.counters.get("runqueue")
+            if runqueue is not None:
+                queue[k] = runqueue.running
+    finally:
+        sampler.close()
+
+    per_core = [
+        [round(v, 1) if v >= 0 else None for v in cpu[c::cores]]
+        for c in range(cores)
+    ]
+    run_queue = [q if q >= 0 else None for q in queue]
+    offset_list = [round(t, 5) for t in offsets]
+    return {
+        "interval_seconds": interval,
+        "duration_seconds": duration,
+        "cpu_count": cores,
+        "buffer": {
+            "offset_seconds": offset_list,
+            "cpu_percent_per_core": per_core,
+            "run_queue": run_queue,
+            "memory_percent": [round(v, 1) for v in memory],
+        },
+        "summary": detect_stalls(
+            offset_list, per_core, run_queue, cores, interval
+        ),
+    }
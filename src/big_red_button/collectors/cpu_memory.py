@@ -1,41 +1,65 @@
 """CPU and memory information collector."""
 
-from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import psutil
 
+from ..sampler import AdaptiveController, TickSampler
+
 
 def collect_cpu_memory(
-    sample_count: int = 10, sample_interval: float = 1.0
+    sample_count: int = 10,
+    sample_interval: float = 1.0,
+    backend: str = "auto",
+    max_seconds: Optional[float] = None,
 ) -> Dict[str, Any]:
-    """Collect CPU and memory statistics with multiple samples.
+    """Collect CPU, memory and I/O statistics with multiple samples.
+
+    Each sample covers one interval and includes per-CPU and overall
+    utilization, memory and swap usage, and per-second rates for disk
+    and network I/O, swap-ins, context switches and interrupts. On Linux
+    the procfs backend also reports pressure stall (PSI) percentages.
+
+    With ``max_seconds`` set, sampling is adaptive (see
+    sampler.AdaptiveController): it stops early on an idle machine, and
+    while a spike is in progress it samples faster and extends past
+    ``sample_count`` samples until the spike settles or ``max_seconds``
+    is reached. Sample intervals then vary.
 
     Args:
-        sample_count: Number of CPU samples to take.
+        sample_count: Number of CPU samples to take (the nominal window
+                      when adaptive).
         sample_interval: Time in seconds between samples.
+        backend: Sampler counter backend ("auto", "psutil" or "procfs").
+        max_seconds: Longest adaptive sampling time, or None to take
+                     exactly sample_count samples.
 
     Returns:
         Dict containing CPU and memory details.
     """
     print(
         f"  Sampling CPU {sample_count} times "
-        f"({sample_interval}s intervals)..."
+        f"({sample_interval}s intervals"
+        f"{', adaptive' if max_seconds is not None else ''})..."
     )
 
-    cpu_samples = []
-    for i in range(sample_count):
-        sample = {
-            "timestamp": datetime.now().isoformat(),
-            "cpu_percent_per_cpu": psutil.cpu_percent(
-                interval=sample_interval, percpu=True
-            ),
-            "cpu_percent_overall": psutil.cpu_percent(interval=None),
-        }
-        cpu_samples.append(sample)
+    def _progress(i: int, sample: Dict[str, Any]) -> None:
         if i < sample_count - 1:
             print(f"    Sample {i + 1}/{sample_count} complete")
 
+    # One set of counter reads per tick; CPU, memory, swap, disk and
+    # network I/O, context switches and load are all sampled together.
+    sampler = TickSampler(interval=sample_interval, backend=backend)
+    adaptive = None
+    if max_seconds is None:
+        cpu_samples = sampler.run(sample_count, on_tick=_progress)
+    else:
+        controller = AdaptiveController(
+            sample_interval, sample_count, max_seconds
+        )
+        cpu_samples = sampler.run_adaptive(controller)
+        adaptive = controller.summary()
+
     vm = psutil.virtual_memory()
     sm = psutil.swap_memory()
 
@@ -43,6 +67,7 @@ def collect_cpu_memory(
         "cpu_count_logical": psutil.cpu_count(logical=True),
         "cpu_count_physical": psutil.cpu_count(logical=False),
         "cpu_samples": cpu_samples,
+        "adaptive_sampling": adaptive,
         "virtual_memory": {
             "total": vm.total,
             "available": vm.available,
@@ -1,15 +1,155 @@
 """Disk and I/O information collector."""
 
-from typing import Any, Dict
+from typing import Any, Collection, Dict, List, Optional
 
 import psutil
 
+from ..sampler import TickSampler
 
-def collect_disks() -> Dict[str, Any]:
+# Utilization (busy time) at or above which a disk counts as saturated
+SATURATION_PERCENT = 90.0
+
+
+def disk_interval_metrics(rates: Dict[str, float]) -> Dict[str, Any]:
+    """Derive throughput, IOPS and latency from per-second counter rates.
+
+    Args:
+        rates: counter_rates() of a psutil per-disk I/O counter tuple.
+
+    Returns:
+        Dict with MB/s, IOPS, average service time, average queue depth
+        and (where the platform reports busy time) utilization.
+    """
+    read_iops = rates["read_count_per_sec"]
+    write_iops = rates["write_count_per_sec"]
+    iops = read_iops + write_iops
+    # read_time/write_time are milliseconds spent on I/O, so their rates
+    # are ms of I/O per second: divided by IOPS that is the average
+    # service time, divided by 1000 it is the average number of requests
+    # in flight (Little's law).
+    io_ms_per_sec = rates["read_time_per_sec"] + rates["write_time_per_sec"]
+    busy = rates.get("busy_time_per_sec")
+    return {
+        "read_mb_per_sec": round(rates["read_bytes_per_sec"] / 1e6, 3),
+        "write_mb_per_sec": round(rates["write_bytes_per_sec"] / 1e6, 3),
+        "read_iops": round(read_iops, 1),
+        "write_iops": round(write_iops, 1),
+        "avg_service_time_ms": (
+            round(io_ms_per_sec / iops, 3) if iops else None
+        ),
+        "avg_queue_depth": round(io_ms_per_sec / 1000.0, 3),
+        "utilization_percent": (
+            round(min(busy / 10.0, 100.0), 1) if busy is not None else None
+        ),
+    }
+
+
+def _peak_key(metrics: Dict[str, Any]) -> float:
+    """Rank intervals by utilization, or by throughput if unavailable."""
+    if metrics["utilization_percent"] is not None:
+        return float(metrics["utilization_percent"])
+    return float(metrics["read_mb_per_sec"] + metrics["write_mb_per_sec"])
+
+
+def summarize_disk_rates(
+    samples: List[Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """Summarize per-disk interval metrics over the sampling window.
+
+    Args:
+        samples: Samples with ``timestamp`` and per-disk ``disks`` metrics.
+
+    Returns:
+        Dict mapping disk name to mean values, the busiest (peak)
+        interval and whether the disk was saturated.
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    names = {name for sample in samples for name in sample["disks"]}
+    for name in sorted(names):
+        series = [
+            (sample["timestamp"], sample["disks"][name])
+            for sample in samples
+            if name in sample["disks"]
+        ]
+        mean = {}
+        for key in series[0][1]:
+            values = [m[key] for _, m in series if m[key] is not None]
+            mean[key] = round(sum(values) / len(values), 3) if values else None
+        peak_time, peak = max(series, key=lambda item: _peak_key(item[1]))
+        utilization = peak["utilization_percent"]
+        summary[name] = {
+            "mean": mean,
+            "peak_interval": {"timestamp": peak_time, **peak},
+            "saturated": (
+                utilization is not None and utilization >= SATURATION_PERCENT
+            ),
+        }
+    return summary
+
+
+def sample_disk_rates(
+    sample_count: int,
+    sample_interval: float,
+    exclude: Collection[str] = (),
+    backend: str = "auto",
+) -> Optional[Dict[str, Any]]:
+    """Sample per-disk I/O counters over a window.
+
+    Args:
+        sample_count: Number of intervals to sample.
+        sample_interval: Seconds per interval.
+        exclude: Disk names to leave out of the results.
+        backend: Sampler counter backend ("auto", "psutil" or "procfs").
+
+    Returns:
+        Dict with per-interval metrics and a per-disk summary, or None if
+        the platform does not report per-disk counters.
+    """
+    sampler = TickSampler(
+        interval=sample_interval,
+        channels=("disk",),
+        perdisk=True,
+        backend=backend,
+    )
+    ticks = sampler.run(sample_count)
+    if not ticks or not ticks[0]["disk_io"]:
+        return None
+
+    samples = [
+        {
+            "timestamp": tick["timestamp"],
+            "interval_seconds": tick["interval_seconds"],
+            "disks": {
+                name: disk_interval_metrics(rates)
+                for name, rates in (tick["disk_io"] or {}).items()
+                if name not in exclude
+            },
+        }
+        for tick in ticks
+    ]
+    return {
+        "sample_interval": sample_interval,
+        "samples": samples,
+        "summary": summarize_disk_rates(samples),
+    }
+
+
+def collect_disks(
+    sample_count: int = 10,
+    sample_interval: float = 1.0,
+    backend: str = "auto",
+) -> Dict[str, Any]:
     """Collect disk partition and I/O information.
 
+    Args:
+        sample_count: Number of I/O rate samples to take.
+        sample_interval: Time in seconds between samples.
+        backend: Sampler counter backend ("auto", "psutil" or "procfs").
+
     Returns:
-        Dict containing disk details and I/O counters.
+        Dict containing disk details, cumulative I/O counters, and
+        per-disk throughput, IOPS, latency and utilization over the
+        sampling window.
     """
     disks = []
     for part in psutil.disk_partitions(all=True):
@@ -55,7 +195,23 @@ def collect_disks() -> Dict[str, Any]:
     except Exception as e:
         io_counters = {"error": str(e)}
 
+    # Cumulative counters since boot say little about the incident, so
+    # also sample per-interval rates (skipping devices that never did I/O)
+    never_used = {
+        disk
+        for disk, c in io_counters.items()
+        if isinstance(c, dict) and not c["read_count"] + c["write_count"]
+    }
+    io_rates: Optional[Dict[str, Any]]
+    try:
+        io_rates = sample_disk_rates(
+            sample_count, sample_interval, never_used, backend
+        )
+    except Exception as e:
+        io_rates = {"error": str(e)}
+
     return {
         "partitions": disks,
         "io_counters": io_counters,
+        "io_rates": io_rates,
     }
@@ -0,0 +1,63 @@
+"""Flight recorder history collector."""
+
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from ..recorder import read_recent
+
+
+def collect_flight_recorder(
+    path: str, minutes: float = 10.0
+) -> Dict[str, Any]:
+    """Collect the last few minutes recorded by the background agent.
+
+    Args:
+        path: Flight recorder file written by ``big-red-button agent``.
+        minutes: How many minutes of history to include.
+
+    Returns:
+        Dict containing recorded samples, or a note if no agent is running.
+        A recorder with no samples inside the window (the agent has
+        stopped) is reported unavailable and ``stale``, with the age of
+        its newest sample.
+    """
+    recorder_path = Path(path).expanduser()
+    if not recorder_path.exists():
+        return {
+            "available": False,
+            "path": str(recorder_path),
+            "note": "No flight recorder file; start 'big-red-button agent' "
+            "to capture history before the button is pressed",
+        }
+
+    try:
+        history = read_recent(recorder_path, minutes * 60)
+    except (OSError, ValueError) as e:
+        return {
+            "available": False,
+            "path": str(recorder_path),
+            "error": str(e),
+        }
+
+    if not history["samples"]:
+        newest = history["newest_timestamp"]
+        return {
+            "available": False,
+            "stale": True,
+            "path": str(recorder_path),
+            "window_minutes": minutes,
+            "newest_sample_age_seconds": (
+                None if newest is None else round(time.time() - newest, 1)
+            ),
+            "note": "No flight recorder samples in the window; the "
+            "'big-red-button agent' does not appear to be running",
+        }
+
+    print(f"  Read {len(history['samples'])} flight recorder samples")
+    return {
+        "available": True,
+        "path": str(recorder_path),
+        "window_minutes": minutes,
+        **history,
+    }
@@ -5,6 +5,7 @@ from typing import Any, Dict
 
 import psutil
 
+from .. import capabilities
 from ..utils import safe_run
 
 
@@ -35,6 +36,12 @@ def collect_foreground_app() -> Dict[str, Any]:
 
     elif system == "Windows":
         # Windows: try using pywin32
+        if not capabilities.available("win32gui"):
+            return {
+                "method": "win32gui",
+                "error": "pywin32 is not available",
+                "note": "Install pywin32 for foreground app detection",
+            }
         try:
             import win32gui
             import win32process
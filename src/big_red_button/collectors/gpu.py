@@ -1,108 +1,454 @@
-"""GPU information collector."""
+"""GPU information collector.
 
+One backend is chosen per run: NVML (through py3nvml or pynvml) when it
+initializes, otherwise a single nvidia-smi query per sample. The NVML
+session stays open for the whole sampling window, so utilization, VRAM,
+clocks, power and temperature are read as a time series without
+re-initializing the driver library or spawning processes.
+"""
+
+import importlib
 import platform
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
 
+from .. import capabilities
+from ..sampler import ticks
 from ..utils import safe_run
 
+# NVML bindings to try, in order (capability name, module)
+NVML_MODULES = (("py3nvml", "py3nvml.py3nvml"), ("pynvml", "pynvml"))
 
-def collect_gpu_info() -> Dict[str, Any]:
-    """Collect GPU information across platforms.
+# Per-device fields in every sample
+SAMPLE_FIELDS = (
+    "gpu_utilization",
+    "memory_utilization",
+    "memory_used",
+    "memory_free",
+    "temperature",
+    "power_watts",
+    "clock_graphics_mhz",
+    "clock_sm_mhz",
+    "clock_memory_mhz",
+)
+
+_SMI_GPU_FIELDS = (
+    "index",
+    "uuid",
+    "name",
+    "driver_version",
+    "memory.total",
+    "power.limit",
+    "utilization.gpu",
+    "utilization.memory",
+    "memory.used",
+    "memory.free",
+    "temperature.gpu",
+    "power.draw",
+    "clocks.gr",
+    "clocks.sm",
+    "clocks.mem",
+)
+_MIB = 1024 * 1024
+
+
+def _try(func: Callable[..., Any], *args: Any) -> Any:
+    """Call an NVML function, returning None if it is unsupported."""
+    try:
+        return func(*args)
+    except Exception:
+        return None
 
-    Returns:
-        Dict containing GPU details.
-    """
-    system = platform.system()
-    gpu_info: Dict[str, Any] = {"platform": system}
 
-    # Try nvidia-smi for NVIDIA GPUs
-    nvidia_smi = safe_run(
-        [
-            "nvidia-smi",
-            "--query-gpu=index,name,driver_version,"
-            "temperature.gpu,utilization.gpu,utilization.memory,"
-            "memory.total,memory.used,memory.free",
-            "--format=csv,noheader,nounits",
-        ],
-        timeout=5,
+def _text(value: Any) -> Any:
+    """Decode bytes returned by older NVML bindings."""
+    return (
+        value.decode(errors="replace") if isinstance(value, bytes) else value
     )
-    if nvidia_smi["returncode"] == 0:
-        gpu_info["nvidia_smi"] = nvidia_smi["stdout"]
 
-    # Try py3nvml for detailed NVIDIA info
+
+def _process_name(pid: int) -> Optional[str]:
     try:
-        import py3nvml.py3nvml as nvml  # type: ignore[import-untyped]
+        return psutil.Process(pid).name()
+    except (psutil.Error, OSError):
+        return None
 
-        nvml.nvmlInit()
-        device_count = nvml.nvmlDeviceGetCount()
-        nvidia_devices = []
 
-        for i in range(device_count):
-            handle = nvml.nvmlDeviceGetHandleByIndex(i)
-            name = nvml.nvmlDeviceGetName(handle)
-            try:
-                temp = nvml.nvmlDeviceGetTemperature(
-                    handle, nvml.NVML_TEMPERATURE_GPU
-                )
-            except Exception:
-                temp = None
+class NvmlBackend:
+    """A single NVML session used for every reading.
 
-            try:
-                util = nvml.nvmlDeviceGetUtilizationRates(handle)
-                gpu_util = util.gpu
-                mem_util = util.memory
-            except Exception:
-                gpu_util = None
-                mem_util = None
+    Args:
+        nvml: NVML bindings module (py3nvml.py3nvml, pynvml or a fake).
+    """
 
-            try:
-                mem_info = nvml.nvmlDeviceGetMemoryInfo(handle)
-                mem_total = mem_info.total
-                mem_used = mem_info.used
-                mem_free = mem_info.free
-            except Exception:
-                mem_total = None
-                mem_used = None
-                mem_free = None
-
-            nvidia_devices.append(
+    name = "nvml"
+
+    def __init__(self, nvml: Any):
+        self.nvml = nvml
+        nvml.nvmlInit()
+        try:
+            self.handles = [
+                nvml.nvmlDeviceGetHandleByIndex(i)
+                for i in range(nvml.nvmlDeviceGetCount())
+            ]
+        except Exception:
+            nvml.nvmlShutdown()
+            raise
+
+    def devices(self) -> List[Dict[str, Any]]:
+        """Return static information for every device."""
+        nvml = self.nvml
+        driver = _text(_try(nvml.nvmlSystemGetDriverVersion))
+        devices = []
+        for index, handle in enumerate(self.handles):
+            memory = _try(nvml.nvmlDeviceGetMemoryInfo, handle)
+            limit = _try(nvml.nvmlDeviceGetEnforcedPowerLimit, handle)
+            devices.append(
                 {
-                    "index": i,
-                    "name": name,
-                    "temperature": temp,
-                    "gpu_utilization": gpu_util,
-                    "memory_utilization": mem_util,
-                    "memory_total": mem_total,
-                    "memory_used": mem_used,
-                    "memory_free": mem_free,
+                    "index": index,
+                    "name": _text(_try(nvml.nvmlDeviceGetName, handle)),
+                    "driver_version": driver,
+                    "memory_total": memory.total if memory else None,
+                    "power_limit_watts": (
+                        round(limit / 1000.0, 1) if limit else None
+                    ),
                 }
             )
+        return devices
 
-        nvml.nvmlShutdown()
-        gpu_info["nvidia_devices"] = nvidia_devices
-    except Exception as e:
-        gpu_info["nvidia_py3nvml_error"] = str(e)
+    def read(self) -> List[Dict[str, Any]]:
+        """Read the current values of SAMPLE_FIELDS for every device."""
+        nvml = self.nvml
+        readings = []
+        for index, handle in enumerate(self.handles):
+            util = _try(nvml.nvmlDeviceGetUtilizationRates, handle)
+            memory = _try(nvml.nvmlDeviceGetMemoryInfo, handle)
+            power = _try(nvml.nvmlDeviceGetPowerUsage, handle)
+            readings.append(
+                {
+                    "index": index,
+                    "gpu_utilization": util.gpu if util else None,
+                    "memory_utilization": util.memory if util else None,
+                    "memory_used": memory.used if memory else None,
+                    "memory_free": memory.free if memory else None,
+                    "temperature": _try(
+                        nvml.nvmlDeviceGetTemperature,
+                        handle,
+                        nvml.NVML_TEMPERATURE_GPU,
+                    ),
+                    "power_watts": (
+                        round(power / 1000.0, 1) if power is not None else None
+                    ),
+                    "clock_graphics_mhz": _try(
+                        nvml.nvmlDeviceGetClockInfo,
+                        handle,
+                        nvml.NVML_CLOCK_GRAPHICS,
+                    ),
+                    "clock_sm_mhz": _try(
+                        nvml.nvmlDeviceGetClockInfo, handle, nvml.NVML_CLOCK_SM
+                    ),
+                    "clock_memory_mhz": _try(
+                        nvml.nvmlDeviceGetClockInfo,
+                        handle,
+                        nvml.NVML_CLOCK_MEM,
+                    ),
+                }
+            )
+        return readings
+
+    def processes(self) -> List[Dict[str, Any]]:
+        """Return per-process VRAM use on every device."""
+        nvml = self.nvml
+        found: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for index, handle in enumerate(self.handles):
+            for getter in (
+                "nvmlDeviceGetComputeRunningProcesses",
+                "nvmlDeviceGetGraphicsRunningProcesses",
+            ):
+                func = getattr(nvml, getter, None)
+                for proc in (_try(func, handle) if func else None) or []:
+                    # A process can appear in both lists; keep one entry
+                    used = getattr(proc, "usedGpuMemory", None)
+                    entry = found.setdefault(
+                        (index, proc.pid),
+                        {
+                            "gpu_index": index,
+                            "pid": proc.pid,
+                            "used_memory": used,
+                        },
+                    )
+                    if used is not None and used > (entry["used_memory"] or 0):
+                        entry["used_memory"] = used
+        return list(found.values())
 
-    # Try GPUtil as fallback
+    def close(self) -> None:
+        """End the NVML session."""
+        _try(self.nvml.nvmlShutdown)
+
+
+def _smi_value(raw: str) -> Any:
+    """Parse one nvidia-smi CSV cell (N/A and similar become None)."""
+    raw = raw.strip()
+    if not raw or raw.startswith("[") or raw in ("N/A", "Not Supported"):
+        return None
     try:
-        import GPUtil  # type: ignore[import-untyped]
+        number = float(raw)
+    except ValueError:
+        return raw
+    return int(number) if number.is_integer() else number
+
+
+class SmiBackend:
+    """nvidia-smi fallback: one process spawn per reading."""
+
+    name = "nvidia-smi"
+
+    def __init__(self) -> None:
+        self._rows = self._query()
+        if not self._rows:
+            raise RuntimeError("nvidia-smi returned no devices")
+
+    def _query(self) -> List[Dict[str, Any]]:
+        result = safe_run(
+            [
+                "nvidia-smi",
+                f"--query-gpu={','.join(_SMI_GPU_FIELDS)}",
+                "--format=csv,noheader,nounits",
+            ]
+        )
+        if result["returncode"] != 0:
+            raise RuntimeError(result["stderr"].strip() or "nvidia-smi failed")
+        return [
+            dict(zip(_SMI_GPU_FIELDS, map(_smi_value, line.split(","))))
+            for line in result["stdout"].splitlines()
+            if line.strip()
+        ]
+
+    def devices(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "index": row["index"],
+                "name": row["name"],
+                "driver_version": row["driver_version"],
+                "memory_total": (
+                    row["memory.total"] * _MIB
+                    if row["memory.total"] is not None
+                    else None
+                ),
+                "power_limit_watts": row["power.limit"],
+            }
+            for row in self._rows
+        ]
+
+    def read(self) -> List[Dict[str, Any]]:
+        self._rows = self._query()
+
+        def mib(value: Any) -> Any:
+            return value * _MIB if value is not None else None
+
+        return [
+            {
+                "index": row["index"],
+                "gpu_utilization": row["utilization.gpu"],
+                "memory_utilization": row["utilization.memory"],
+                "memory_used": mib(row["memory.used"]),
+                "memory_free": mib(row["memory.free"]),
+                "temperature": row["temperature.gpu"],
+                "power_watts": row["power.draw"],
+                "clock_graphics_mhz": row["clocks.gr"],
+                "clock_sm_mhz": row["clocks.sm"],
+                "clock_memory_mhz": row["clocks.mem"],
+            }
+            for row in self._rows
+        ]
+
+    def processes(self) -> List[Dict[str, Any]]:
+        index_by_uuid = {row["uuid"]: row["index"] for row in self._rows}
+        result = safe_run(
+            [
+                "nvidia-smi",
+                "--query-compute-apps=gpu_uuid,pid,used_memory",
+                "--format=csv,noheader,nounits",
+            ]
+        )
+        if result["returncode"] != 0:
+            return []
+        procs = []
+        for line in result["stdout"].splitlines():
+            cells = [c.strip() for c in line.split(",")]
+            if len(cells) != 3 or not cells[1].isdigit():
+                continue
+            used = _smi_value(cells[2])
+            procs.append(
+                {
+                    "gpu_index": index_by_uuid.get(cells[0]),
+                    "pid": int(cells[1]),
+                    "used_memory": used * _MIB if used is not None else None,
+                }
+            )
+        return procs
+
+    def close(self) -> None:
+        pass
+
+
+def open_backend(nvml: Any = None) -> Tuple[Any, List[str]]:
+    """Open the fastest available GPU backend.
 
-        gpus = GPUtil.getGPUs()
-        gpu_info["gputil_devices"] = [
+    Backends the capability cache knows to be missing or broken are
+    skipped, and backends that fail are recorded there.
+
+    Args:
+        nvml: NVML bindings module to use instead of importing one
+              (tests pass a fake).
+
+    Returns:
+        Tuple of (backend or None, errors from backends that failed).
+    """
+    errors: List[str] = []
+    if nvml is not None:
+        try:
+            return NvmlBackend(nvml), errors
+        except Exception as e:
+            errors.append(f"nvml: {e}")
+    else:
+        for name, module in NVML_MODULES:
+            if not capabilities.available(name):
+                continue
+            try:
+                backend = NvmlBackend(importlib.import_module(module))
+            except Exception as e:
+                # Installed but unusable (e.g. no NVIDIA driver)
+                capabilities.record(name, False, str(e))
+                errors.append(f"{name}: {e}")
+                continue
+            return backend, errors
+
+    if capabilities.available("nvidia-smi"):
+        try:
+            return SmiBackend(), errors
+        except Exception as e:
+            capabilities.record("nvidia-smi", False, str(e))
+            errors.append(f"nvidia-smi: {e}")
+    return None, errors
+
+
+def summarize_gpu_samples(
+    samples: List[Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """Summarize per-device GPU samples.
+
+    Args:
+        samples: Samples with a ``devices`` list of readings.
+
+    Returns:
+        Dict mapping device index (as a string) to the mean and max of
+        every SAMPLE_FIELDS value, plus the minimum graphics clock (a
+        drop points at throttling).
+    """
+    series: Dict[str, Dict[str, List[float]]] = {}
+    for sample in samples:
+        for reading in sample["devices"]:
+            fields = series.setdefault(str(reading["index"]), {})
+            for key in SAMPLE_FIELDS:
+                if reading.get(key) is not None:
+                    fields.setdefault(key, []).append(reading[key])
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for index, fields in series.items():
+        summary[index] = {
+            key: {
+                "mean": round(sum(values) / len(values), 1),
+                "max": max(values),
+            }
+            for key, values in fields.items()
+        }
+        clocks = fields.get("clock_graphics_mhz")
+        if clocks:
+            summary[index]["clock_graphics_mhz"]["min"] = min(clocks)
+    return summary
+
+
+def collect_gpu_info(
+    sample_count: int = 10,
+    sample_interval: float = 1.0,
+    nvml: Any = None,
+) -> Dict[str, Any]:
+    """Collect GPU information across platforms.
+
+    Samples every NVIDIA GPU ``sample_count`` times, ``sample_interval``
+    seconds apart (the same window as the CPU samples), through a single
+    backend session.
+
+    If the backend fails part way (for example nvidia-smi timing out),
+    sampling stops, the error is added to ``backend_errors`` and the
+    samples taken so far are still reported.
+
+    Args:
+        sample_count: Number of GPU samples to take.
+        sample_interval: Time in seconds between samples.
+        nvml: NVML bindings module to use instead of importing one.
+
+    Returns:
+        Dict containing GPU details, the sample time series, a per-device
+        summary and per-process VRAM usage.
+    """
+    system = platform.system()
+    gpu_info: Dict[str, Any] = {"platform": system}
+
+    backend, errors = open_backend(nvml)
+    gpu_info["backend"] = backend.name if backend else None
+
+    if backend is not None:
+        devices: List[Dict[str, Any]] = []
+        samples: List[Dict[str, Any]] = []
+        processes: List[Dict[str, Any]] = []
+        try:
+            devices = backend.devices()
+            for _ in ticks(sample_interval, max(sample_count, 1)):
+                samples.append(
+                    {
+                        "timestamp": datetime.now().isoformat(),
+                        "devices": backend.read(),
+                    }
+                )
+            processes = backend.processes()
+        except Exception as e:
+            # A failed read (e.g. nvidia-smi timing out) ends sampling;
+            # keep the samples taken so far
+            errors.append(f"{backend.name}: {e}")
+        finally:
+            backend.close()
+
+        for proc in processes:
+            proc["name"] = _process_name(proc["pid"])
+        processes.sort(key=lambda p: p["used_memory"] or 0, reverse=True)
+
+        gpu_info["devices"] = devices
+        gpu_info["samples"] = samples
+        gpu_info["summary"] = summarize_gpu_samples(samples)
+        gpu_info["processes"] = processes
+        # Latest reading in the original per-device layout
+        gpu_info["nvidia_devices"] = [
             {
-                "id": gpu.id,
-                "name": gpu.name,
-                "load": gpu.load,
-                "memory_util": gpu.memoryUtil,
-                "memory_total": gpu.memoryTotal,
-                "memory_used": gpu.memoryUsed,
-                "memory_free": gpu.memoryFree,
-                "temperature": gpu.temperature,
+                "index": dev["index"],
+                "name": dev["name"],
+                "temperature": reading["temperature"],
+                "gpu_utilization": reading["gpu_utilization"],
+                "memory_utilization": reading["memory_utilization"],
+                "memory_total": dev["memory_total"],
+                "memory_used": reading["memory_used"],
+                "memory_free": reading["memory_free"],
             }
-            for gpu in gpus
+            for dev, reading in zip(
+                devices, samples[-1]["devices"] if samples else []
+            )
         ]
-    except Exception as e:
-        gpu_info["gputil_error"] = str(e)
+
+    if errors:
+        gpu_info["backend_errors"] = errors
 
     # Platform-specific commands
     if system == "Darwin":
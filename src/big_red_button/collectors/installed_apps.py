@@ -1,70 +1,232 @@
-"""Installed creative applications detector."""
+"""Installed creative applications detector.
 
+Applications are found in-process by globbing the install locations in
+the application catalog, and macOS versions are read from each bundle's
+Info.plist. Installs rarely change between snapshots, so results are
+cached and reused while the modification times of the install parent
+directories (and of the installs themselves) are unchanged.
+"""
+
+import json
 import os
 import platform
-from typing import Any, Dict
+import plistlib
+import re
+from glob import glob
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
 
-from ..utils import safe_run
+CACHE_VERSION = 1
 
+# Application name -> platform.system() name -> install path glob
+# patterns. Only the current platform's patterns are scanned, so one
+# catalog covers macOS, Windows and Linux. Extended or overridden by the
+# [apps] table in config.toml.
+DEFAULT_CATALOG: Dict[str, Dict[str, List[str]]] = {
+    "Pro Tools": {
+        "Darwin": ["/Applications/Pro Tools.app"],
+        "Windows": [r"C:\Program Files\Avid\Pro Tools"],
+    },
+    "DaVinci Resolve": {
+        "Darwin": ["/Applications/DaVinci Resolve/DaVinci Resolve.app"],
+        "Windows": [r"C:\Program Files\Blackmagic Design\DaVinci Resolve"],
+        "Linux": ["/opt/resolve"],
+    },
+    "Nuke": {
+        "Darwin": ["/Applications/Nuke*/Nuke*.app"],
+        "Windows": [r"C:\Program Files\Nuke*"],
+        "Linux": ["/usr/local/Nuke*", "/opt/Nuke*"],
+    },
+    "Houdini": {
+        "Darwin": ["/Applications/Houdini/Houdini*.app"],
+        "Windows": [r"C:\Program Files\Side Effects Software\Houdini*"],
+        "Linux": ["/opt/hfs*"],
+    },
+    "Maya": {
+        "Darwin": ["/Applications/Autodesk/maya*/Maya.app"],
+        "Windows": [r"C:\Program Files\Autodesk\Maya*"],
+        "Linux": ["/usr/autodesk/maya*"],
+    },
+}
 
-def detect_installed_apps() -> Dict[str, Any]:
-    """Detect installed creative applications and their versions.
+# Catalog entry from config.toml: a table keyed by platform, or a
+# pattern or list of patterns used on every platform
+AppPatterns = Union[str, List[str], Dict[str, Union[str, List[str]]]]
+
+_MAGIC_RE = re.compile(r"[*?[]")
+_VERSION_RE = re.compile(r"\d+(?:\.\d+)*(?:v\d+)?")
+
+
+def _pattern_list(patterns: Union[str, List[str]]) -> List[str]:
+    return [patterns] if isinstance(patterns, str) else list(patterns)
+
+
+def build_catalog(
+    apps: Optional[Dict[str, AppPatterns]] = None,
+    system: Optional[str] = None,
+) -> Dict[str, List[str]]:
+    """Merge the [apps] table into the default catalog for one platform.
+
+    Args:
+        apps: Application name -> patterns: a table keyed by platform
+              ("Darwin", "Windows", "Linux"), or a glob pattern or list
+              of patterns used on every platform. An empty list or table
+              removes a built-in application.
+        system: Platform to select patterns for (default: this one).
 
     Returns:
-        Dict containing detected applications.
+        Application name -> list of patterns for the platform.
     """
-    apps = {}
-    system = platform.system()
-
-    if system == "Darwin":
-        # macOS: Check common application paths
-        app_paths = {
-            "Pro Tools": "/Applications/Pro Tools.app",
-            "DaVinci Resolve": "/Applications/DaVinci Resolve/"
-            "DaVinci Resolve.app",
-            "Nuke": "/Applications/Nuke*/Nuke*.app",
-            "Houdini": "/Applications/Houdini/Houdini*.app",
-            "Maya": "/Applications/Autodesk/maya*/Maya.app",
-        }
+    system = system or platform.system()
+    catalog = {
+        name: list(patterns.get(system, []))
+        for name, patterns in DEFAULT_CATALOG.items()
+    }
+    for name, patterns in (apps or {}).items():
+        if isinstance(patterns, dict):
+            catalog[name] = _pattern_list(patterns.get(system, []))
+        else:
+            catalog[name] = _pattern_list(patterns)
+    return {name: patterns for name, patterns in catalog.items() if patterns}
+
+
+def _watch_dir(pattern: str) -> str:
+    """Directory whose mtime changes when installs matching pattern do."""
+    path = Path(pattern)
+    parts = path.parts
+    for i, part in enumerate(parts):
+        if _MAGIC_RE.search(part):
+            return str(Path(*parts[:i]))
+    return str(path.parent)
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _natural_key(path: str) -> List[int]:
+    return [int(n) for n in re.findall(r"\d+", path)]
+
+
+def app_version(path: str) -> str:
+    """Read an install's version.
+
+    macOS bundles use CFBundleShortVersionString from Info.plist; other
+    installs fall back to the version in the directory name (Nuke15.1v2,
+    hfs20.0.547, Maya2025).
+
+    Args:
+        path: Install path.
 
-        for app_name, path_pattern in app_paths.items():
-            result = safe_run(
-                [
-                    "bash",
-                    "-c",
-                    f"ls -d {path_pattern} " f"2>/dev/null | head -1",
-                ]
+    Returns:
+        Version string, or "unknown".
+    """
+    plist = Path(path) / "Contents" / "Info.plist"
+    if plist.is_file():
+        try:
+            with open(plist, "rb") as f:
+                info = plistlib.load(f)
+            version = info.get("CFBundleShortVersionString") or info.get(
+                "CFBundleVersion"
             )
-            if result["returncode"] == 0 and result["stdout"].strip():
-                app_path = result["stdout"].strip()
-                # Try to get version
-                version_result = safe_run(
-                    ["mdls", "-name", "kMDItemVersion", app_path]
-                )
-                version = (
-                    version_result["stdout"].strip()
-                    if version_result["returncode"] == 0
-                    else "unknown"
-                )
-                apps[app_name] = {
-                    "path": app_path,
-                    "version": version,
-                }
-
-    elif system == "Windows":
-        # Windows: Check registry or common paths
-        common_paths = {
-            "Pro Tools": r"C:\Program Files\Avid\Pro Tools",
-            "DaVinci Resolve": (
-                r"C:\Program Files\Blackmagic Design" r"\DaVinci Resolve"
-            ),
-            "Nuke": r"C:\Program Files\Nuke",
-            "Houdini": r"C:\Program Files\Side Effects Software",
-            "Maya": r"C:\Program Files\Autodesk\Maya",
-        }
+            if version:
+                return str(version)
+        except (OSError, plistlib.InvalidFileException, ValueError):
+            pass
+    match = _VERSION_RE.search(Path(path).name)
+    return match.group(0) if match else "unknown"
+
+
+def _scan(catalog: Dict[str, List[str]]) -> Dict[str, Any]:
+    apps: Dict[str, Any] = {}
+    for name, patterns in catalog.items():
+        matches = sorted(
+            {match for pattern in patterns for match in glob(pattern)},
+            key=_natural_key,
+        )
+        if not matches:
+            continue
+        installs = [{"path": m, "version": app_version(m)} for m in matches]
+        # Report the newest install, listing every one found
+        apps[name] = dict(installs[-1])
+        if len(installs) > 1:
+            apps[name]["installs"] = installs
+    return apps
+
+
+def _fingerprint(
+    catalog: Dict[str, List[str]], apps: Dict[str, Any]
+) -> Dict[str, Optional[int]]:
+    """mtimes of the install parent directories and of the installs."""
+    paths = {
+        _watch_dir(pattern)
+        for patterns in catalog.values()
+        for pattern in patterns
+    }
+    for info in apps.values():
+        paths.update(i["path"] for i in info.get("installs", [info]))
+    return {path: _mtime(path) for path in sorted(paths)}
+
 
-        for app_name, path in common_paths.items():
-            if os.path.exists(path):
-                apps[app_name] = {"path": path, "version": "detected"}
+def _load_cache(
+    cache_path: Path, catalog: Dict[str, List[str]]
+) -> Optional[Dict[str, Any]]:
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("version") != CACHE_VERSION
+        or cached.get("catalog") != catalog
+    ):
+        return None
+    mtimes = cached.get("mtimes") or {}
+    if any(_mtime(path) != mtime for path, mtime in mtimes.items()):
+        return None
+    apps: Dict[str, Any] = cached.get("apps") or {}
+    return apps
+
+
+def detect_installed_apps(
+    catalog: Optional[Dict[str, AppPatterns]] = None,
+    cache_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Detect installed creative applications and their versions.
+
+    Args:
+        catalog: Extra or overriding catalog entries (the [apps] table
+                 from config.toml).
+        cache_path: JSON file to cache results in, or None to always
+                    scan.
 
+    Returns:
+        Dict mapping application name to the path and version of its
+        newest install (plus ``installs`` when several are present).
+    """
+    merged = build_catalog(catalog)
+    path = Path(cache_path).expanduser() if cache_path else None
+    if path is not None:
+        cached = _load_cache(path, merged)
+        if cached is not None:
+            return cached
+
+    apps = _scan(merged)
+    if path is not None:
+        data = {
+            "version": CACHE_VERSION,
+            "catalog": merged,
+            "mtimes": _fingerprint(merged, apps),
+            "apps": apps,
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass
     return apps
@@ -1,21 +1,174 @@
 """Network and storage connectivity collector."""
 
-import platform
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Collection, Dict, List, Optional
 
 import psutil
 
-from ..utils import safe_run
+from ..sampler import TickSampler
+from .storage_probes import probe_storage_hosts
 
+# Link utilization at or above which an interface counts as saturated
+SATURATION_PERCENT = 90.0
 
-def collect_network(storage_hosts: List[str]) -> Dict[str, Any]:
+_ERROR_FIELDS = ("errin", "errout", "dropin", "dropout")
+
+
+def nic_interval_metrics(
+    rates: Dict[str, float], interval: float, speed_mbps: int
+) -> Dict[str, Any]:
+    """Derive throughput, packet and error rates for one interval.
+
+    Args:
+        rates: counter_rates() of a psutil per-NIC I/O counter tuple.
+        interval: Length of the interval in seconds.
+        speed_mbps: Link speed from net_if_stats (0 if unknown).
+
+    Returns:
+        Dict with rx/tx Mbit/s, percentage of link speed, packets/s and
+        the number of errors and drops during the interval.
+    """
+    rx_mbps = rates["bytes_recv_per_sec"] * 8 / 1e6
+    tx_mbps = rates["bytes_sent_per_sec"] * 8 / 1e6
+    metrics: Dict[str, Any] = {
+        "rx_mbps": round(rx_mbps, 3),
+        "tx_mbps": round(tx_mbps, 3),
+        "rx_percent_of_link": (
+            round(100.0 * rx_mbps / speed_mbps, 1) if speed_mbps else None
+        ),
+        "tx_percent_of_link": (
+            round(100.0 * tx_mbps / speed_mbps, 1) if speed_mbps else None
+        ),
+        "rx_packets_per_sec": round(rates["packets_recv_per_sec"], 1),
+        "tx_packets_per_sec": round(rates["packets_sent_per_sec"], 1),
+    }
+    for name in _ERROR_FIELDS:
+        metrics[name] = int(round(rates[f"{name}_per_sec"] * interval))
+    return metrics
+
+
+def summarize_nic_rates(
+    samples: List[Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """Summarize per-interface interval metrics over the sampling window.
+
+    Args:
+        samples: Samples with per-interface ``interfaces`` metrics.
+
+    Returns:
+        Dict mapping interface name to mean/peak throughput, peak link
+        utilization, total errors and drops, and a saturated flag.
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    names = {name for sample in samples for name in sample["interfaces"]}
+    for name in sorted(names):
+        series = [
+            sample["interfaces"][name]
+            for sample in samples
+            if name in sample["interfaces"]
+        ]
+        link = [
+            max(m["rx_percent_of_link"], m["tx_percent_of_link"])
+            for m in series
+            if m["rx_percent_of_link"] is not None
+        ]
+        peak_link = max(link) if link else None
+        totals = {key: sum(m[key] for m in series) for key in _ERROR_FIELDS}
+        summary[name] = {
+            "mean_rx_mbps": round(
+                sum(m["rx_mbps"] for m in series) / len(series), 3
+            ),
+            "mean_tx_mbps": round(
+                sum(m["tx_mbps"] for m in series) / len(series), 3
+            ),
+            "peak_rx_mbps": max(m["rx_mbps"] for m in series),
+            "peak_tx_mbps": max(m["tx_mbps"] for m in series),
+            "peak_percent_of_link": peak_link,
+            **totals,
+            "errors_or_drops": any(totals.values()),
+            "saturated": (
+                peak_link is not None and peak_link >= SATURATION_PERCENT
+            ),
+        }
+    return summary
+
+
+def sample_nic_rates(
+    sample_count: int,
+    sample_interval: float,
+    speeds: Dict[str, int],
+    exclude: Collection[str] = (),
+    backend: str = "auto",
+) -> Optional[Dict[str, Any]]:
+    """Sample per-interface network counters over a window.
+
+    Args:
+        sample_count: Number of intervals to sample.
+        sample_interval: Seconds per interval.
+        speeds: Link speed in Mbit/s per interface (from net_if_stats).
+        exclude: Interface names to leave out of the results.
+        backend: Sampler counter backend ("auto", "psutil" or "procfs").
+
+    Returns:
+        Dict with per-interval metrics and a per-interface summary, or
+        None if no per-interface counters are available.
+    """
+    sampler = TickSampler(
+        interval=sample_interval,
+        channels=("net",),
+        pernic=True,
+        backend=backend,
+    )
+    ticks = sampler.run(sample_count)
+    if not ticks or not ticks[0]["net_io"]:
+        return None
+
+    samples = [
+        {
+            "timestamp": tick["timestamp"],
+            "interval_seconds": tick["interval_seconds"],
+            "interfaces": {
+                name: nic_interval_metrics(
+                    rates, tick["interval_seconds"], speeds.get(name, 0)
+                )
+                for name, rates in (tick["net_io"] or {}).items()
+                if name not in exclude
+            },
+        }
+        for tick in ticks
+    ]
+    return {
+        "sample_interval": sample_interval,
+        "samples": samples,
+        "summary": summarize_nic_rates(samples),
+    }
+
+
+def collect_network(
+    storage_hosts: List[str],
+    probe_ports: Optional[List[int]] = None,
+    probe_count: int = 3,
+    probe_deadline: float = 5.0,
+    sample_count: int = 10,
+    sample_interval: float = 1.0,
+    backend: str = "auto",
+) -> Dict[str, Any]:
     """Collect network interface and connectivity information.
 
     Args:
         storage_hosts: List of hostnames to check connectivity.
+        probe_ports: TCP service ports (e.g. SMB 445, NFS 2049) to probe
+                     on each storage host.
+        probe_count: Number of probes per host and port.
+        probe_deadline: Total time budget for all storage probes, in
+                        seconds.
+        sample_count: Number of per-interface throughput samples.
+        sample_interval: Time in seconds between samples.
+        backend: Sampler counter backend ("auto", "psutil" or "procfs").
 
     Returns:
-        Dict containing network details.
+        Dict containing network details, per-interface throughput and
+        error rates over the sampling window, and storage host checks.
     """
     addrs = {}
     for iface, addr_list in psutil.net_if_addrs().items():
@@ -53,29 +206,44 @@ def collect_network(storage_hosts: List[str]) -> Dict[str, Any]:
             "dropout": c.dropout,
         }
 
-    # Storage host connectivity checks
-    print("  Checking storage host connectivity...")
-    host_checks = []
-    for host in storage_hosts:
-        if platform.system() == "Windows":
-            cmd = ["ping", "-n", "2", host]
-        else:
-            cmd = ["ping", "-c", "2", host]
-        result = safe_run(cmd, timeout=10)
-        host_checks.append(
-            {
-                "host": host,
-                "returncode": result["returncode"],
-                "stdout": result["stdout"],
-                "stderr": result["stderr"],
-            }
+    # Sample per-interface rates in the background while probing storage
+    idle = {
+        iface
+        for iface, c in counters_dict.items()
+        if not c["packets_sent"] + c["packets_recv"]
+    }
+    speeds = {iface: s["speed"] for iface, s in stats.items()}
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        rates_future = executor.submit(
+            sample_nic_rates,
+            sample_count,
+            sample_interval,
+            speeds,
+            idle,
+            backend,
+        )
+
+        # Storage host connectivity checks (all hosts probed concurrently)
+        print("  Checking storage host connectivity...")
+        host_checks = probe_storage_hosts(
+            storage_hosts,
+            ports=probe_ports or (),
+            count=probe_count,
+            deadline=probe_deadline,
         )
-        status = "OK" if result["returncode"] == 0 else "FAILED"
-        print(f"    {host}: {status}")
+
+        io_rates: Optional[Dict[str, Any]]
+        try:
+            io_rates = rates_future.result()
+        except Exception as e:
+            io_rates = {"error": str(e)}
+    for check in host_checks:
+        print(f"    {check['host']}: {check['status']}")
 
     return {
         "interfaces": addrs,
         "stats": stats,
         "counters": counters_dict,
+        "io_rates": io_rates,
         "storage_host_checks": host_checks,
     }
@@ -0,0 +1,424 @@
+"""Collector registry, cost metadata and collection profiles.
+
+Collectors are referenced by "module:function" name and imported only
+when they are scheduled, so importing the registry (and the CLI) does not
+pull in psutil or any optional backend.
+"""
+
+import importlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .. import capabilities
+
+Cost = Union[float, Callable[[Dict[str, Any]], float]]
+
+
+@dataclass(frozen=True)
+class CollectorSpec:
+    """Registry entry describing a collector and what it costs to run.
+
+    Attributes:
+        name: Short collector name.
+        filename: Snapshot file the collector's output is written to.
+        func: Collector callable, or "module:function" naming one in this
+              package (imported by load()).
+        description: One-line description of what is collected.
+        cost: Estimated run time in seconds, either fixed or computed
+              from the (profile-adjusted) configuration.
+        max_cost: Longest the collector may legitimately run when that
+                  is more than its estimated cost (adaptive sampling),
+                  fixed or computed like cost; None means cost.
+        timeout: Seconds the collector may run beyond its maximum cost
+                 before it is abandoned.
+        blocking: True if the collector blocks on a sampling window.
+        platforms: platform.system() values the collector supports. An
+                   empty tuple means all platforms.
+        kwargs: Builds the collector's keyword arguments from config.
+    """
+
+    name: str
+    filename: str
+    func: Union[str, Callable[..., Any]]
+    description: str
+    cost: Cost = 0.1
+    max_cost: Optional[Cost] = None
+    timeout: float = 10.0
+    blocking: bool = False
+    platforms: Tuple[str, ...] = ()
+    kwargs: Callable[[Dict[str, Any]], Dict[str, Any]] = field(
+        default=lambda config: {}
+    )
+
+    def load(self) -> Callable[..., Any]:
+        """Import and return the collector callable.
+
+        Returns:
+            The collector function.
+        """
+        if callable(self.func):
+            return self.func
+        module, _, name = self.func.partition(":")
+        func: Callable[..., Any] = getattr(
+            importlib.import_module(f".{module}", __package__), name
+        )
+        return func
+
+    def estimate_cost(self, config: Dict[str, Any]) -> float:
+        """Estimate how long the collector takes with this config.
+
+        Args:
+            config: Configuration dict.
+
+        Returns:
+            Estimated run time in seconds.
+        """
+        if callable(self.cost):
+            return float(self.cost(config))
+        return float(self.cost)
+
+    def effective_timeout(self, config: Dict[str, Any]) -> float:
+        """Return the time after which the collector is abandoned.
+
+        Args:
+            config: Configuration dict.
+
+        Returns:
+            Timeout in seconds.
+        """
+        limit = self.estimate_cost(config)
+        if callable(self.max_cost):
+            limit = max(limit, float(self.max_cost(config)))
+        elif self.max_cost is not None:
+            limit = max(limit, float(self.max_cost))
+        return limit + self.timeout
+
+    def supports(self, system: str) -> bool:
+        """Check whether the collector runs on a platform.
+
+        Args:
+            system: Value of platform.system().
+
+        Returns:
+            True if the collector supports the platform.
+        """
+        return not self.platforms or system in self.platforms
+
+
+@dataclass(frozen=True)
+class Profile:
+    """A named selection of collectors with a target duration.
+
+    Attributes:
+        name: Profile name.
+        description: One-line description shown to users.
+        collectors: Names of the collectors to run.
+        target_seconds: Wall time the scheduler aims to stay within.
+        overrides: Configuration values applied on top of config.toml.
+    """
+
+    name: str
+    description: str
+    collectors: Tuple[str, ...]
+    target_seconds: float
+    overrides: Dict[str, Any] = field(default_factory=dict)
+
+    def apply(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of config with the profile overrides applied.
+
+        Args:
+            config: Configuration dict.
+
+        Returns:
+            New configuration dict.
+        """
+        merged = dict(config)
+        merged.update(self.overrides)
+        merged["profile"] = self.name
+        return merged
+
+
+def _sample_window(config: Dict[str, Any]) -> float:
+    return float(config["cpu_sample_count"] * config["cpu_sample_interval"])
+
+
+def _cpu_window_limit(config: Dict[str, Any]) -> float:
+    # Adaptive sampling may extend the window while a spike lasts
+    if not config.get("cpu_adaptive"):
+        return _sample_window(config)
+    return max(config["cpu_sample_max_seconds"], _sample_window(config))
+
+
+def _network_cost(config: Dict[str, Any]) -> float:
+    # Storage hosts are probed concurrently under a single deadline, while
+    # interface rates are sampled over the capture window
+    probes = 0.0
+    if config.get("storage_hosts"):
+        spacing = 0.2 * (config["storage_probe_count"] - 1)
+        probes = min(spacing + 0.5, config["storage_probe_deadline"])
+    return 0.2 + max(probes, _sample_window(config))
+
+
+# GPU backends collectors.gpu can sample through, in the order it tries
+_GPU_BACKENDS = ("py3nvml", "pynvml", "nvidia-smi")
+
+
+def _gpu_cost(config: Dict[str, Any]) -> float:
+    # Without a backend there is nothing to sample; only the platform
+    # query (system_profiler or wmic) runs
+    if any(capabilities.available(name) for name in _GPU_BACKENDS):
+        return _sample_window(config)
+    return 0.5
+
+
+REGISTRY: Dict[str, CollectorSpec] = {
+    spec.name: spec
+    for spec in [
+        CollectorSpec(
+            name="system_info",
+            filename="system_info.json",
+            func="system:collect_system_info",
+            description="OS, hardware, timestamps, boot time",
+            cost=0.05,
+        ),
+        CollectorSpec(
+            name="cpu_memory",
+            filename="cpu_memory.json",
+            func="cpu_memory:collect_cpu_memory",
+            description="CPU samples, per-core usage, RAM, swap",
+            cost=_sample_window,
+            max_cost=_cpu_window_limit,
+            blocking=True,
+            kwargs=lambda config: {
+                "sample_count": config["cpu_sample_count"],
+                "sample_interval": config["cpu_sample_interval"],
+                "backend": config.get("sampler_backend", "auto"),
+                "max_seconds": (
+                    config["cpu_sample_max_seconds"]
+                    if config.get("cpu_adaptive")
+                    else None
+                ),
+            },
+        ),
+        CollectorSpec(
+            name="burst",
+            filename="burst.json",
+            func="burst:collect_burst",
+            description="10-20 ms per-core CPU, run queue and memory buffer",
+            cost=lambda config: config["burst_seconds"],
+            blocking=True,
+            kwargs=lambda config: {
+                "duration": config["burst_seconds"],
+                "interval": config["burst_interval"],
+                "backend": config.get("sampler_backend", "auto"),
+            },
+        ),
+        CollectorSpec(
+            name="disks",
+            filename="disks.json",
+            func="disks:collect_disks",
+            description="Mounted volumes, usage, per-disk I/O rates",
+            cost=_sample_window,
+            blocking=True,
+            kwargs=lambda config: {
+                "sample_count": config["cpu_sample_count"],
+                "sample_interval": config["cpu_sample_interval"],
+                "backend": config.get("sampler_backend", "auto"),
+            },
+        ),
+        CollectorSpec(
+            name="network",
+            filename="network.json",
+            func="network:collect_network",
+            description="NICs, throughput, storage host checks",
+            cost=_network_cost,
+            timeout=5.0,
+            blocking=True,
+            kwargs=lambda config: {
+                "storage_hosts": config.get("storage_hosts", []),
+                "probe_ports": config["storage_probe_ports"],
+                "probe_count": config["storage_probe_count"],
+                "probe_deadline": config["storage_probe_deadline"],
+                "sample_count": config["cpu_sample_count"],
+                "sample_interval": config["cpu_sample_interval"],
+                "backend": config.get("sampler_backend", "auto"),
+            },
+        ),
+        CollectorSpec(
+            name="processes",
+            filename="processes.json",
+            func="processes:collect_processes",
+            description="Top processes by CPU, memory and I/O",
+            cost=lambda config: 2 * config["process_sample_window"] + 0.5,
+            blocking=True,
+            kwargs=lambda config: {
+                "max_processes": config["max_processes"],
+                "sample_window": config["process_sample_window"],
+                "own_processes": config.get("own_processes", "exclude"),
+            },
+        ),
+        CollectorSpec(
+            name="gpu",
+            filename="gpu_info.json",
+            func="gpu:collect_gpu_info",
+            description="GPU utilization, VRAM, clocks, power, per-process VRAM",
+            cost=_gpu_cost,
+            timeout=15.0,
+            blocking=True,
+            kwargs=lambda config: {
+                "sample_count": config["cpu_sample_count"],
+                "sample_interval": config["cpu_sample_interval"],
+            },
+        ),
+        CollectorSpec(
+            name="temperatures",
+            filename="temperatures.json",
+            func="temperatures:collect_temperatures",
+            description="System temperature sensors",
+            cost=0.5,
+        ),
+        CollectorSpec(
+            name="foreground_app",
+            filename="foreground_app.json",
+            func="foreground_app:collect_foreground_app",
+            description="Active application at capture time",
+            cost=0.3,
+            platforms=("Darwin", "Windows"),
+        ),
+        CollectorSpec(
+            name="installed_apps",
+            filename="installed_apps.json",
+            func="installed_apps:detect_installed_apps",
+            description="Detected creative applications",
+            cost=0.1,
+            kwargs=lambda config: {
+                "catalog": config.get("apps"),
+                "cache_path": config.get("app_cache"),
+            },
+        ),
+        CollectorSpec(
+            name="flight_recorder",
+            filename="flight_recorder.json",
+            func="flight_recorder:collect_flight_recorder",
+            description="Metrics recorded by the agent before the capture",
+            cost=0.05,
+            kwargs=lambda config: {
+                "path": config["recorder_path"],
+                "minutes": config["recorder_minutes"],
+            },
+        ),
+    ]
+}
+
+PROFILES: Dict[str, Profile] = {
+    profile.name: profile
+    for profile in [
+        Profile(
+            name="quick",
+            description="Fast capture for artists (about 3 seconds)",
+            collectors=(
+                "system_info",
+                "cpu_memory",
+                "disks",
+                "network",
+                "processes",
+                "gpu",
+                "foreground_app",
+                "flight_recorder",
+            ),
+            target_seconds=3.0,
+            overrides={
+                "cpu_sample_count": 4,
+                "cpu_sample_interval": 0.5,
+                "cpu_sample_max_seconds": 5.0,
+            },
+        ),
+        Profile(
+            name="standard",
+            description="Default capture using config.toml sampling",
+            collectors=tuple(REGISTRY),
+            target_seconds=15.0,
+        ),
+        Profile(
+            name="deep",
+            description="Long capture for IT investigations (about 60s)",
+            collectors=tuple(REGISTRY),
+            target_seconds=60.0,
+            overrides={"cpu_sample_count": 50, "cpu_sample_interval": 1.0},
+        ),
+    ]
+}
+
+DEFAULT_PROFILE = "standard"
+
+
+def get_profile(name: str, config: Dict[str, Any]) -> Profile:
+    """Look up a profile, applying any [profiles.<name>] config table.
+
+    The config table may set ``collectors`` and ``target_seconds``; any
+    other keys become configuration overrides for the profile.
+
+    Args:
+        name: Profile name.
+        config: Configuration dict.
+
+    Returns:
+        The resolved Profile.
+
+    Raises:
+        ValueError: If the profile or one of its collectors is unknown.
+    """
+    custom = dict(config.get("profiles", {}).get(name, {}))
+    base = PROFILES.get(name)
+    if base is None and not custom:
+        raise ValueError(
+            f"Unknown profile {name!r}; choose from: "
+            f"{', '.join(sorted(PROFILES))}"
+        )
+    if base is None:
+        base = Profile(
+            name=name,
+            description="Custom profile from config.toml",
+            collectors=tuple(REGISTRY),
+            target_seconds=PROFILES[DEFAULT_PROFILE].target_seconds,
+        )
+
+    collectors = tuple(custom.pop("collectors", base.collectors))
+    unknown = [c for c in collectors if c not in REGISTRY]
+    if unknown:
+        raise ValueError(
+            f"Profile {name!r} lists unknown collectors: {', '.join(unknown)}"
+        )
+
+    return Profile(
+        name=name,
+        description=base.description,
+        collectors=collectors,
+        target_seconds=float(
+            custom.pop("target_seconds", base.target_seconds)
+        ),
+        overrides={**base.overrides, **custom},
+    )
+
+
+def select_collectors(
+    profile: Profile, system: str
+) -> Tuple[List[CollectorSpec], List[str]]:
+    """Select the profile's collectors that support this platform.
+
+    Args:
+        profile: Profile to select collectors for.
+        system: Value of platform.system().
+
+    Returns:
+        Tuple of (selected specs, names skipped as unsupported).
+    """
+    selected = []
+    skipped = []
+    for name in profile.collectors:
+        spec = REGISTRY[name]
+        if spec.supports(system):
+            selected.append(spec)
+        else:
+            skipped.append(name)
+    return selected, skipped
@@ -0,0 +1,356 @@
+"""Concurrent storage host probes (ICMP via ping, TCP connect)."""
+
+import asyncio
+import contextlib
+import math
+import platform
+import re
+import socket
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from .. import capabilities
+from ..utils import note_subprocess, subprocess_slots
+
+# Well-known storage service ports, used to label TCP probe results
+STORAGE_SERVICES = {
+    445: "smb",
+    139: "netbios",
+    2049: "nfs",
+    111: "rpcbind",
+    548: "afp",
+    3260: "iscsi",
+}
+
+# Delay between successive probes of the same target (seconds)
+PROBE_SPACING = 0.2
+
+_PING_TIME_RE = re.compile(r"time\s*[=<]\s*([\d.]+)\s*ms", re.IGNORECASE)
+
+
+def latency_stats(
+    samples: Sequence[Optional[float]], sent: Optional[int] = None
+) -> Dict[str, Any]:
+    """Summarize probe round-trip times.
+
+    Args:
+        samples: Round-trip times in milliseconds; None marks a lost probe.
+        sent: Number of probes sent, if different from len(samples)
+              (ping only reports the replies it received).
+
+    Returns:
+        Dict with sent/received counts, loss percentage and
+        min/avg/p95/max latency in milliseconds (None if nothing came back).
+    """
+    received = sorted(s for s in samples if s is not None)
+    sent = len(samples) if sent is None else sent
+    stats: Dict[str, Any] = {
+        "sent": sent,
+        "received": len(received),
+        "loss_percent": (
+            round(100.0 * (sent - len(received)) / sent, 1) if sent else None
+        ),
+        "min_ms": None,
+        "avg_ms": None,
+        "p95_ms": None,
+        "max_ms": None,
+    }
+    if received:
+        # Nearest-rank percentile
+        p95_index = max(math.ceil(0.95 * len(received)) - 1, 0)
+        stats.update(
+            {
+                "min_ms": round(received[0], 3),
+                "avg_ms": round(sum(received) / len(received), 3),
+                "p95_ms": round(received[p95_index], 3),
+                "max_ms": round(received[-1], 3),
+            }
+        )
+    return stats
+
+
+def parse_ping_times(output: str) -> List[float]:
+    """Extract per-reply round-trip times from ping output.
+
+    Handles both the Unix (``time=1.23 ms``) and Windows (``time=1ms``,
+    ``time<1ms``) formats.
+
+    Args:
+        output: Standard output of the ping command.
+
+    Returns:
+        List of round-trip times in milliseconds.
+    """
+    return [float(m) for m in _PING_TIME_RE.findall(output)]
+
+
+def _ping_command(address: str, count: int, timeout: float) -> List[str]:
+    """Build a ping command line for the current platform."""
+    if platform.system() == "Windows":
+        return [
+            "ping",
+            "-n",
+            str(count),
+            "-w",
+            str(int(timeout * 1000)),
+            address,
+        ]
+    return ["ping", "-c", str(count), "-i", str(PROBE_SPACING), address]
+
+
+@contextlib.asynccontextmanager
+async def _subprocess_slot() -> AsyncIterator[None]:
+    """Hold a low-impact subprocess slot from the event loop.
+
+    The slot is polled for rather than waited on in a thread, so a probe
+    cancelled by the deadline never leaves a slot acquired.
+    """
+    slots = subprocess_slots()
+    if slots is None:
+        yield
+        return
+    while not slots.acquire(blocking=False):
+        await asyncio.sleep(0.01)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+async def icmp_probe(
+    address: str, count: int, timeout: float, result: Dict[str, Any]
+) -> None:
+    """Probe a host with the system ping command.
+
+    Replies are parsed as ping prints them and written into ``result``
+    as they arrive, so a probe cancelled by the global deadline still
+    reports the replies it received. Until ping exits, ``sent`` counts
+    only those replies; lost requests are known once ping has finished.
+
+    Args:
+        address: Host name or IP address to ping.
+        count: Number of echo requests to send.
+        timeout: Per-reply timeout in seconds (Windows only).
+        result: Dict the probe result is written into.
+    """
+    result.update(latency_stats([]))
+    result["returncode"] = None
+    if not capabilities.available("ping"):
+        result["error"] = "ping unavailable (capability cache)"
+        return
+    async with _subprocess_slot():
+        note_subprocess()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *_ping_command(address, count, timeout),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )  # nosec B603, B607
+        except (FileNotFoundError, PermissionError) as e:
+            result["error"] = f"ping unavailable: {e}"
+            return
+
+        times: List[float] = []
+        stdout, stderr_pipe = proc.stdout, proc.stderr
+        if stdout is None or stderr_pipe is None:
+            proc.kill()
+            await proc.wait()
+            result["error"] = "ping output unavailable"
+            return
+        stderr_read = asyncio.ensure_future(stderr_pipe.read())
+        try:
+            # Parse replies as they arrive so a cancelled probe keeps them
+            async for line in stdout:
+                reply = parse_ping_times(line.decode(errors="replace"))
+                if reply:
+                    times.extend(reply)
+                    result.update(latency_stats(times))
+            stderr = await stderr_read
+            await proc.wait()
+        except asyncio.CancelledError:
+            stderr_read.cancel()
+            proc.kill()
+            await proc.wait()
+            result["error"] = "deadline exceeded"
+            raise
+
+    result.update(latency_stats(times, sent=count))
+    result["returncode"] = proc.returncode
+    if proc.returncode != 0 and stderr:
+        result["error"] = stderr.decode(errors="replace").strip()
+
+
+async def tcp_probe(
+    address: str,
+    port: int,
+    count: int,
+    timeout: float,
+    result: Dict[str, Any],
+) -> None:
+    """Measure TCP connect latency to a service port.
+
+    Args:
+        address: Host name or IP address to connect to.
+        port: TCP port.
+        count: Number of connection attempts.
+        timeout: Per-attempt timeout in seconds.
+        result: Dict the probe result is written into.
+    """
+    samples: List[Optional[float]] = []
+    errors: Dict[str, int] = {}
+    result["service"] = STORAGE_SERVICES.get(port)
+    result.update(latency_stats([]))
+
+    for i in range(count):
+        if i:
+            await asyncio.sleep(PROBE_SPACING)
+        t0 = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(address, port), timeout
+            )
+        except asyncio.TimeoutError:
+            samples.append(None)
+            errors["timeout"] = errors.get("timeout", 0) + 1
+        except OSError as e:
+            samples.append(None)
+            key = (
+                "refused"
+                if isinstance(e, ConnectionRefusedError)
+                else type(e).__name__
+            )
+            errors[key] = errors.get(key, 0) + 1
+        else:
+            samples.append((time.perf_counter() - t0) * 1000.0)
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+        result.update(latency_stats(samples))
+        result["errors"] = errors
+
+
+async def _resolve(host: str, timeout: float) -> Optional[str]:
+    """Resolve a host name to an address, or None on failure."""
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await asyncio.wait_for(
+            loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return None
+    return str(infos[0][4][0]) if infos else None
+
+
+async def _probe_host(
+    host: str,
+    ports: Sequence[int],
+    count: int,
+    timeout: float,
+    icmp: bool,
+    result: Dict[str, Any],
+) -> None:
+    """Run all probes for one host concurrently."""
+    address = await _resolve(host, timeout)
+    result["address"] = address
+    if address is None:
+        result["error"] = "DNS resolution failed"
+        return
+
+    probes = []
+    if icmp:
+        result["icmp"] = {}
+        probes.append(icmp_probe(address, count, timeout, result["icmp"]))
+    for port in ports:
+        port_result: Dict[str, Any] = {}
+        result["tcp"][str(port)] = port_result
+        probes.append(tcp_probe(address, port, count, timeout, port_result))
+    await asyncio.gather(*probes)
+
+
+def _host_status(result: Dict[str, Any]) -> str:
+    """Classify a host result as OK, DEGRADED or FAILED."""
+    probes = list(result["tcp"].values())
+    if "icmp" in result:
+        probes.append(result["icmp"])
+    received = sum(p.get("received", 0) for p in probes)
+    sent = sum(p.get("sent", 0) for p in probes)
+    if not received:
+        return "FAILED"
+    if received < sent:
+        return "DEGRADED"
+    return "OK"
+
+
+async def _probe_all(
+    hosts: Sequence[str],
+    ports: Sequence[int],
+    count: int,
+    timeout: float,
+    deadline: float,
+    icmp: bool,
+) -> List[Dict[str, Any]]:
+    """Probe every host concurrently under a single deadline."""
+    results: List[Dict[str, Any]] = [
+        {"host": host, "address": None, "tcp": {}} for host in hosts
+    ]
+    tasks = [
+        asyncio.ensure_future(
+            _probe_host(host, ports, count, timeout, icmp, result)
+        )
+        for host, result in zip(hosts, results)
+    ]
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    for task, result in zip(tasks, results):
+        if task in pending:
+            result["deadline_exceeded"] = True
+        elif task.exception() is not None:
+            result["error"] = str(task.exception())
+    return results
+
+
+def probe_storage_hosts(
+    hosts: Sequence[str],
+    ports: Sequence[int] = (),
+    count: int = 3,
+    timeout: float = 2.0,
+    deadline: float = 5.0,
+    icmp: bool = True,
+) -> List[Dict[str, Any]]:
+    """Probe storage hosts concurrently with ICMP and TCP connects.
+
+    All hosts and probes run at once on an asyncio event loop, bounded by
+    a single global deadline, so a degraded network costs at most
+    ``deadline`` seconds instead of one timeout per host.
+
+    Args:
+        hosts: Host names to probe.
+        ports: TCP service ports to connect to on every host.
+        count: Number of probes per target.
+        timeout: Per-probe timeout in seconds.
+        deadline: Total time budget for all probes, in seconds.
+        icmp: Whether to run the ping (ICMP) probe.
+
+    Returns:
+        List of per-host dicts with ICMP/TCP latency statistics, loss,
+        overall status ("OK", "DEGRADED" or "FAILED") and reachability.
+    """
+    if not hosts:
+        return []
+
+    t0 = time.perf_counter()
+    results = asyncio.run(
+        _probe_all(hosts, ports, count, timeout, deadline, icmp)
+    )
+    elapsed = round(time.perf_counter() - t0, 3)
+
+    for result in results:
+        result["status"] = _host_status(result)
+        result["reachable"] = result["status"] != "FAILED"
+        # Kept for compatibility with the original ping-only check
+        result["returncode"] = result.get("icmp", {}).get("returncode")
+        result["elapsed_seconds"] = elapsed
+    return results
@@ -5,6 +5,7 @@ from typing import Any, Dict
 
 import psutil
 
+from .. import capabilities
 from ..utils import safe_run
 
 
@@ -43,5 +44,15 @@ def collect_temperatures() -> Dict[str, Any]:
         )
         if result["returncode"] == 0:
             temps["powermetrics"] = result["stdout"]
+        elif result["returncode"] is not None and capabilities.available(
+            "powermetrics"
+        ):
+            # Present but unusable (exited nonzero, e.g. needs sudo); skip
+            # it until the capability cache entry expires. A timeout
+            # (returncode None) is usually a loaded machine, so it is not
+            # cached and the next snapshot tries again.
+            capabilities.record(
+                "powermetrics", False, result["stderr"].strip()[:200]
+            )
 
     return temps
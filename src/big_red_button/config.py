@@ -38,13 +38,30 @@ studio_name = "Your Studio Name"
 #   - Windows shared location: "C:\\\\ProgramData\\\\PerformanceSnapshots"
 # snapshot_root = "/Users/Shared/PerformanceSnapshots"
 
+# How snapshots are written (can be forced with --directory)
+#   - "zip":       each file is streamed straight into the ZIP archive
+#   - "directory": files are written to a folder, then zipped (debugging)
+snapshot_format = "zip"
+
+# Compression for the snapshot ZIP. Members are compressed in parallel.
+#   - "stored":  no compression (fastest, largest)
+#   - "deflate": standard ZIP compression, levels 0-9 (default)
+#   - "bzip2":   smaller for text-heavy captures, levels 1-9
+#   - "lzma":    smallest, slowest (no level)
+#   - "zstd":    fast and small, levels -7..22 (Python 3.14+ only; the
+#                archive needs a recent unzip tool)
+# Run benchmarks/archive_codecs.py on a deep capture to compare.
+archive_codec = "deflate"
+# archive_level = 6
+
 
 # -----------------------------------------------------------------------------
 # Network
 # -----------------------------------------------------------------------------
 
 # Storage server hostnames to check connectivity
-# The tool will ping these hosts to verify network connectivity
+# The tool will ping these hosts and connect to their storage service ports
+# to verify network connectivity
 # Common examples:
 #   - Avid Nexis servers: nexis1.yourdomain.local, nexis2.yourdomain.local
 #   - NetApp filers: netapp-prod.yourdomain.local
@@ -54,6 +71,21 @@ storage_hosts = [
     "netapp1.yourdomain.local",
 ]
 
+# TCP service ports to probe on each storage host, in addition to ping.
+# Connect latency to the actual file service is often more telling than
+# ICMP, which some storage heads deprioritize or block.
+#   - 445: SMB
+#   - 2049: NFS
+# Add the service ports used by your Avid Nexis / NAS heads as needed.
+storage_probe_ports = [445, 2049]
+
+# Number of probes per host and port (used for loss and latency stats)
+storage_probe_count = 3
+
+# Total time budget in seconds for all storage probes. Hosts are probed
+# in parallel, so a degraded network costs at most this long.
+storage_probe_deadline = 5.0
+
 
 # -----------------------------------------------------------------------------
 # System Collection Settings
@@ -64,8 +96,14 @@ storage_hosts = [
 # Recommended: 30-50 for most cases
 max_processes = 30
 
+# Seconds over which per-process CPU is measured to rank the top
+# processes; their I/O, context switch and page fault rates are then
+# measured over a second window of the same length
+process_sample_window = 1.0
+
 # Number of CPU samples to take
 # Multiple samples help catch intermittent performance spikes
+# Disk and network interface rates are sampled over the same window
 # Each sample is taken at the interval specified below
 # Recommended: 10 samples = 10 seconds of monitoring (with 1.0s interval)
 cpu_sample_count = 10
@@ -78,6 +116,208 @@ cpu_sample_count = 10
 #   - 1.0: Standard monitoring (10 seconds for 10 samples)
 #   - 2.0: Longer monitoring period (20 seconds for 10 samples)
 cpu_sample_interval = 1.0
+
+# Adaptive sampling: stop after 3 samples when the machine is clearly
+# idle, and while a CPU or swap spike is in progress sample 4x faster and
+# keep going past cpu_sample_count until it settles, for at most
+# cpu_sample_max_seconds (never less than the normal window).
+cpu_adaptive = true
+cpu_sample_max_seconds = 30.0
+
+# Where CPU, memory, disk and network counters are read from:
+#   - "auto": /proc directly on Linux (cheap enough for 50-100 Hz
+#     sampling, adds pressure stall percentages), psutil elsewhere
+#   - "psutil": psutil on every platform
+#   - "procfs": /proc only (Linux; fails elsewhere)
+sampler_backend = "auto"
+
+# Burst capture for micro-stutters (audio dropouts, playback hitches):
+# per-core CPU, run queue and memory sampled every burst_interval seconds
+# for burst_seconds. burst.json holds the full-resolution buffer and the
+# stalls found in it. Runs in the standard and deep profiles.
+burst_seconds = 2.0
+burst_interval = 0.01
+
+
+# -----------------------------------------------------------------------------
+# Flight Recorder
+# -----------------------------------------------------------------------------
+
+# The optional background agent ("big-red-button agent") samples core
+# metrics into a fixed-size ring buffer file, so snapshots can include
+# what happened *before* the button was pressed.
+# Leave recorder_path commented out to use the default:
+#   ~/.cache/big-red-button/flight_recorder.bin
+# recorder_path = "/Users/Shared/PerformanceSnapshots/flight_recorder.bin"
+
+# Seconds between agent samples
+recorder_interval = 1.0
+
+# Number of samples kept in the ring (3600 = 1 hour at 1s, ~150 KB)
+recorder_capacity = 3600
+
+# Minutes of recorded history to include in each snapshot
+recorder_minutes = 10
+
+
+# -----------------------------------------------------------------------------
+# Watch Mode
+# -----------------------------------------------------------------------------
+
+# "big-red-button watch" samples core metrics and takes a snapshot, without
+# prompting, when one of these rules holds. Rules have the form
+#   <metric> <op> <value> [for <seconds>]
+# with op one of > >= < <=. Metrics: cpu_percent, core_max_percent,
+# memory_percent, swap_percent, swap_in_bytes_per_sec, load_1, run_queue,
+# disk_read_bytes_per_sec, disk_write_bytes_per_sec,
+# net_recv_bytes_per_sec, net_sent_bytes_per_sec, cpu_pressure_percent,
+# memory_pressure_percent, io_pressure_percent (Linux) and
+# storage_unreachable (number of storage_hosts failing their probe).
+watch_rules = [
+    "core_max_percent > 95 for 10s",
+    "swap_percent > 40",
+    # "storage_unreachable > 0 for 60s",
+]
+
+# Seconds between watch samples
+watch_interval = 1.0
+
+# Debounce: seconds a rule without "for" must hold before it fires
+watch_debounce_seconds = 10.0
+
+# Cooldown: seconds after an automatic snapshot before any rule can fire
+# again, so a long incident produces one snapshot every cooldown period
+watch_cooldown_seconds = 900.0
+
+# Seconds between storage host probes for storage_unreachable rules
+watch_storage_interval = 30.0
+
+
+# -----------------------------------------------------------------------------
+# Metrics Exporter
+# -----------------------------------------------------------------------------
+
+# "big-red-button exporter" serves collector metrics at /metrics in the
+# Prometheus text format. Listen on a local host:port, or on a Unix socket
+# with "unix:/path/to/exporter.sock". Bind to 127.0.0.1 unless the scraper
+# runs on another machine: the metrics include process names.
+exporter_listen = "127.0.0.1:9977"
+
+# Profile whose sampling settings the exporter's collectors use
+exporter_profile = "quick"
+
+# Collectors to serve
+exporter_collectors = [
+    "system_info",
+    "cpu_memory",
+    "disks",
+    "network",
+    "processes",
+    "gpu",
+    "temperatures",
+    "foreground_app",
+    "installed_apps",
+]
+
+# Seconds a collector's result is served from the cache before it is run
+# again. Collectors taking 0.5 s or more are refreshed in the background,
+# so scrapes never wait for them.
+exporter_ttl_seconds = 30.0
+
+# Per-collector TTLs overriding exporter_ttl_seconds
+exporter_ttl = { system_info = 300, installed_apps = 3600, foreground_app = 5 }
+
+
+# -----------------------------------------------------------------------------
+# Fleet Index
+# -----------------------------------------------------------------------------
+
+# SQLite database used by "big-red-button index" and "big-red-button query"
+# to search snapshots across workstations. Keep it on a local disk: SQLite
+# locking is unreliable on network shares.
+# Leave commented out to use the default:
+#   ~/.cache/big-red-button/fleet.sqlite
+# fleet_db = "/var/lib/big-red-button/fleet.sqlite"
+
+
+# -----------------------------------------------------------------------------
+# Baselines
+# -----------------------------------------------------------------------------
+
+# Directory for known-good baselines ("big-red-button baseline" / "diff").
+# Leave commented out to use <snapshot_root>/baselines, so baselines sit
+# next to the snapshots they are compared with.
+# baseline_dir = "/Users/Shared/PerformanceSnapshots/baselines"
+
+
+# -----------------------------------------------------------------------------
+# Low-Impact Mode
+# -----------------------------------------------------------------------------
+
+# On a starved workstation the snapshot tool itself competes with the
+# application for CPU and disk. With low_impact = true (or --low-impact)
+# the tool lowers its CPU and I/O priority, runs at most
+# low_impact_max_subprocesses external commands at a time and, if
+# low_impact_core is set, pins itself to that core.
+low_impact = false
+low_impact_max_subprocesses = 1
+# low_impact_core = 0
+
+# How the tool's own process and its children appear in processes.json:
+# "exclude" (default), "tag" (listed with "self": true) or "include"
+own_processes = "exclude"
+
+
+# -----------------------------------------------------------------------------
+# Capability Cache
+# -----------------------------------------------------------------------------
+
+# Which external tools (nvidia-smi, powermetrics, ping, ...) and Python
+# backends (py3nvml, win32gui) work on this machine is cached so missing
+# tools are not spawned on every run. Entries are re-checked after
+# capability_ttl_hours, or immediately with --reprobe.
+# Leave commented out to use the default:
+#   ~/.config/big-red-button/capabilities.json
+# capability_cache = "/Library/Application Support/big-red-button/capabilities.json"
+capability_ttl_hours = 24
+
+
+# -----------------------------------------------------------------------------
+# Installed Applications
+# -----------------------------------------------------------------------------
+
+# Pro Tools, DaVinci Resolve, Nuke, Houdini and Maya are detected in their
+# default macOS, Windows and Linux (/opt, /usr/local) locations. Add other
+# packages, or override a built-in entry, with glob patterns keyed by
+# platform (Darwin, Windows, Linux); only this platform's patterns are
+# scanned. A plain list of patterns is used on every platform, and an
+# empty list turns a built-in entry off. Results are cached until an
+# install directory changes.
+# [apps]
+# "Blender" = { Darwin = ["/Applications/Blender.app"], Linux = ["/opt/blender*"] }
+# "Katana" = { Linux = ["/opt/Katana*"], Windows = ['C:\\Program Files\\Katana*'] }
+# "Pro Tools" = []
+#
+# Leave commented out to cache in ~/.cache/big-red-button/installed_apps.json
+# app_cache = "/tmp/big-red-button-apps.json"
+
+
+# -----------------------------------------------------------------------------
+# Collection Profiles
+# -----------------------------------------------------------------------------
+
+# Which set of collectors to run (can be overridden with --profile)
+#   - quick:    ~3 seconds, core metrics only (good for a desktop button)
+#   - standard: all collectors, using the sampling settings above
+#   - deep:     ~60 seconds of sampling for IT investigations
+profile = "standard"
+
+# Profiles can be customized (or new ones added) with [profiles.<name>]
+# tables. "collectors" and "target_seconds" select what runs and how long
+# the scheduler aims for; any other key overrides the settings above.
+# [profiles.quick]
+# target_seconds = 5.0
+# cpu_sample_count = 6
 """
 
 
@@ -157,9 +397,62 @@ def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
     if config.get("snapshot_root") is None:
         config["snapshot_root"] = str(Path.home() / "SupportSnapshots")
 
+    config.setdefault("snapshot_format", "zip")
+    config.setdefault("archive_codec", "deflate")
     config.setdefault("max_processes", 30)
+    config.setdefault("process_sample_window", 1.0)
     config.setdefault("cpu_sample_count", 10)
     config.setdefault("cpu_sample_interval", 1.0)
+    config.setdefault("cpu_adaptive", True)
+    config.setdefault("cpu_sample_max_seconds", 30.0)
+    config.setdefault("sampler_backend", "auto")
+    config.setdefault("burst_seconds", 2.0)
+    config.setdefault("burst_interval", 0.01)
     config.setdefault("storage_hosts", [])
+    config.setdefault("storage_probe_ports", [445, 2049])
+    config.setdefault("storage_probe_count", 3)
+    config.setdefault("storage_probe_deadline", 5.0)
+    config.setdefault("profile", "standard")
+    config.setdefault("low_impact", False)
+    config.setdefault("low_impact_max_subprocesses", 1)
+    config.setdefault("own_processes", "exclude")
+    if config.get("recorder_path") is None:
+        config["recorder_path"] = str(
+            Path.home() / ".cache" / "big-red-button" / "flight_recorder.bin"
+        )
+    config.setdefault("recorder_interval", 1.0)
+    config.setdefault("recorder_capacity", 3600)
+    config.setdefault("recorder_minutes", 10)
+    config.setdefault(
+        "watch_rules", ["core_max_percent > 95 for 10s", "swap_percent > 40"]
+    )
+    config.setdefault("watch_interval", 1.0)
+    config.setdefault("watch_debounce_seconds", 10.0)
+    config.setdefault("watch_cooldown_seconds", 900.0)
+    config.setdefault("watch_storage_interval", 30.0)
+    config.setdefault("exporter_listen", "127.0.0.1:9977")
+    config.setdefault("exporter_profile", "quick")
+    config.setdefault("exporter_ttl_seconds", 30.0)
+    config.setdefault(
+        "exporter_ttl",
+        {"system_info": 300, "installed_apps": 3600, "foreground_app": 5},
+    )
+    if config.get("baseline_dir") is None:
+        config["baseline_dir"] = str(
+            Path(config["snapshot_root"]) / "baselines"
+        )
+    if config.get("capability_cache") is None:
+        config["capability_cache"] = str(
+            Path.home() / ".config" / "big-red-button" / "capabilities.json"
+        )
+    config.setdefault("capability_ttl_hours", 24)
+    if config.get("app_cache") is None:
+        config["app_cache"] = str(
+            Path.home() / ".cache" / "big-red-button" / "installed_apps.json"
+        )
+    if config.get("fleet_db") is None:
+        config["fleet_db"] = str(
+            Path.home() / ".cache" / "big-red-button" / "fleet.sqlite"
+        )
 
     return config
@@ -0,0 +1,453 @@
+"""Concurrent collector execution engine."""
+
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+from .utils import subprocess_count
+
+if TYPE_CHECKING:
+    from .collectors.registry import CollectorSpec
+
+# How often the engine checks running collectors against their timeouts
+# (and samples the process RSS for per-collector peaks)
+_POLL_INTERVAL = 0.1
+
+_SELF = psutil.Process()
+
+
+def _rss() -> int:
+    rss: int = _SELF.memory_info().rss
+    return rss
+
+
+def process_usage() -> Dict[str, Any]:
+    """Return this process's own CPU time and memory use.
+
+    Returns:
+        Dict with cpu_user_seconds and cpu_system_seconds (including
+        finished child processes where the platform reports them),
+        rss_bytes, peak_rss_bytes (lifetime high-water mark) and threads.
+    """
+    times = _SELF.cpu_times()
+    mem = _SELF.memory_info()
+    peak = getattr(mem, "peak_wset", None)  # Windows
+    if peak is None:
+        try:
+            import resource
+
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # Bytes on macOS, kilobytes elsewhere
+            peak = maxrss if sys.platform == "darwin" else maxrss * 1024
+        except ImportError:
+            peak = mem.rss
+    return {
+        "cpu_user_seconds": times.user + getattr(times, "children_user", 0.0),
+        "cpu_system_seconds": times.system
+        + getattr(times, "children_system", 0.0),
+        "rss_bytes": mem.rss,
+        "peak_rss_bytes": max(peak, mem.rss),
+        "threads": _SELF.num_threads(),
+    }
+
+
+@dataclass
+class CollectorTask:
+    """A single collector invocation scheduled by the engine.
+
+    Attributes:
+        name: Short collector name (used in progress output and metadata).
+        filename: Snapshot file the collector's output is written to.
+        func: Collector callable.
+        kwargs: Keyword arguments passed to the collector.
+        timeout: Seconds after which the collector is abandoned, or None
+                 to wait indefinitely.
+    """
+
+    name: str
+    filename: str
+    func: Callable[..., Any]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    timeout: Optional[float] = None
+
+
+@dataclass
+class CollectorResult:
+    """Output and timing of a finished collector.
+
+    Attributes:
+        name: Collector name.
+        filename: Snapshot file the output belongs in.
+        data: Collector output, or an error dict if the collector raised
+              or timed out.
+        started: ISO timestamp when the collector started.
+        finished: ISO timestamp when the collector finished.
+        duration_seconds: Wall time spent in the collector.
+        status: One of "ok", "error" or "timeout".
+        error: Error message if the collector failed, else None.
+        cpu_seconds: CPU time of the thread that ran the collector (None
+                     if it timed out). Helper threads the collector
+                     starts (thread pools, asyncio probe loops) and its
+                     subprocesses are not included; they show up only in
+                     the snapshot-wide tool usage.
+        peak_rss_bytes: Highest process RSS seen while the collector ran
+                        (shared with collectors running alongside it).
+        subprocesses: Number of processes the collector spawned (None if
+                      it timed out).
+    """
+
+    name: str
+    filename: str
+    data: Any
+    started: str
+    finished: str
+    duration_seconds: float
+    status: str = "ok"
+    error: Optional[str] = None
+    cpu_seconds: Optional[float] = None
+    peak_rss_bytes: Optional[int] = None
+    subprocesses: Optional[int] = None
+
+    def timing(self) -> Dict[str, Any]:
+        """Return the timing and overhead metadata for this result.
+
+        Returns:
+            Dict with start/end times, duration, CPU time, peak RSS,
+            subprocess count and error status.
+        """
+        return {
+            "filename": self.filename,
+            "started": self.started,
+            "finished": self.finished,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "cpu_seconds": (
+                round(self.cpu_seconds, 3)
+                if self.cpu_seconds is not None
+                else None
+            ),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "subprocesses": self.subprocesses,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+def run_task(task: CollectorTask) -> CollectorResult:
+    """Run a single collector, capturing its output and timing.
+
+    Exceptions raised by the collector are caught and recorded so one
+    failing collector never aborts the rest of the snapshot.
+
+    CPU time is measured with time.thread_time(), i.e. for the calling
+    thread only: collectors run concurrently, so process-wide CPU cannot
+    be attributed to one of them, and work on helper threads the
+    collector starts is not counted.
+
+    Args:
+        task: Collector task to run.
+
+    Returns:
+        CollectorResult for the task.
+    """
+    started = datetime.now().isoformat()
+    rss_start = _rss()
+    spawns = subprocess_count()
+    cpu0 = time.thread_time()
+    t0 = time.perf_counter()
+    error = None
+    try:
+        data = task.func(**task.kwargs)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        data = {"error": error}
+    duration = time.perf_counter() - t0
+    cpu = time.thread_time() - cpu0
+
+    return CollectorResult(
+        name=task.name,
+        filename=task.filename,
+        data=data,
+        started=started,
+        finished=datetime.now().isoformat(),
+        duration_seconds=duration,
+        status="ok" if error is None else "error",
+        error=error,
+        cpu_seconds=cpu,
+        peak_rss_bytes=max(rss_start, _rss()),
+        subprocesses=subprocess_count() - spawns,
+    )
+
+
+def _start_daemon_workers(
+    func: Callable[[CollectorTask], CollectorResult],
+    tasks: List[CollectorTask],
+    workers: int,
+) -> "List[Future[CollectorResult]]":
+    """Run ``func`` over tasks, in order, on daemon worker threads.
+
+    ThreadPoolExecutor joins its workers at interpreter exit, so a hung
+    collector would keep the CLI from exiting after the snapshot has
+    been written. Daemon workers are simply dropped at exit.
+
+    Args:
+        func: Function run for each task.
+        tasks: Tasks, started in list order.
+        workers: Number of worker threads.
+
+    Returns:
+        One future per task; cancelling a future that has not started
+        skips its task.
+    """
+    futures: List[Future[CollectorResult]] = [Future() for _ in tasks]
+    work: queue.SimpleQueue[Tuple[Future[CollectorResult], CollectorTask]]
+    work = queue.SimpleQueue()
+    for item in zip(futures, tasks):
+        work.put(item)
+
+    def _worker() -> None:
+        while True:
+            try:
+                future, task = work.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(task))
+            except BaseException as e:
+                future.set_exception(e)
+
+    for i in range(min(workers, len(tasks))):
+        threading.Thread(
+            target=_worker, name=f"collector_{i}", daemon=True
+        ).start()
+    return futures
+
+
+def timeout_result(
+    task: CollectorTask, started: str, duration: float
+) -> CollectorResult:
+    """Build the result recorded for a collector that timed out.
+
+    Args:
+        task: Collector task that was abandoned.
+        started: ISO timestamp when the collector started.
+        duration: Seconds it ran before being abandoned.
+
+    Returns:
+        CollectorResult with status "timeout".
+    """
+    error = f"Timed out after {task.timeout:.1f}s"
+    return CollectorResult(
+        name=task.name,
+        filename=task.filename,
+        data={"error": error},
+        started=started,
+        finished=datetime.now().isoformat(),
+        duration_seconds=duration,
+        status="timeout",
+        error=error,
+    )
+
+
+def run_task_with_timeout(task: CollectorTask) -> CollectorResult:
+    """Run a single collector, abandoning it after its timeout.
+
+    The collector runs on a daemon thread; if it has not finished after
+    ``task.timeout`` seconds a timeout result is returned and the thread
+    is left to finish in the background.
+
+    Args:
+        task: Collector task to run.
+
+    Returns:
+        CollectorResult for the task.
+    """
+    started = datetime.now().isoformat()
+    t0 = time.perf_counter()
+    (future,) = _start_daemon_workers(run_task, [task], 1)
+    try:
+        return future.result(timeout=task.timeout)
+    except FutureTimeoutError:
+        return timeout_result(task, started, time.perf_counter() - t0)
+
+
+def run_collectors(
+    tasks: List[CollectorTask],
+    max_workers: Optional[int] = None,
+    on_result: Optional[Callable[[CollectorResult], None]] = None,
+) -> List[CollectorResult]:
+    """Run collectors concurrently on a thread pool.
+
+    Collectors spend most of their time blocked in sleeps, subprocesses
+    or system calls, so threads let the total wall time approach that of
+    the slowest collector rather than the sum of all of them. Tasks are
+    started in list order, so callers should put long tasks first.
+
+    A collector that exceeds its timeout is recorded as timed out and
+    abandoned; its (daemon) thread is left to finish in the background
+    and does not keep the process from exiting.
+
+    Args:
+        tasks: Collector tasks to run.
+        max_workers: Maximum number of concurrent collectors. Defaults to
+                     one thread per task.
+        on_result: Optional callback invoked (from the calling thread) as
+                   each collector finishes, e.g. to write its output.
+
+    Returns:
+        List of CollectorResult in the same order as ``tasks``.
+    """
+    if not tasks:
+        return []
+
+    workers = max_workers or len(tasks)
+    results: Dict[str, CollectorResult] = {}
+    started: Dict[str, Tuple[float, str]] = {}
+    peaks: Dict[str, int] = {}
+
+    def _run(task: CollectorTask) -> CollectorResult:
+        started[task.name] = (time.perf_counter(), datetime.now().isoformat())
+        return run_task(task)
+
+    def _finish(result: CollectorResult) -> None:
+        result.peak_rss_bytes = max(
+            result.peak_rss_bytes or 0, peaks.get(result.name, 0)
+        )
+        results[result.name] = result
+        label = "done" if result.status == "ok" else result.status.upper()
+        print(f"  {result.name}: {label} ({result.duration_seconds:.1f}s)")
+        if on_result is not None:
+            on_result(result)
+
+    submitted = _start_daemon_workers(_run, tasks, workers)
+    try:
+        futures = dict(zip(submitted, tasks))
+        pending = set(futures)
+        while pending:
+            done, pending = wait(
+                pending, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                _finish(future.result())
+
+            # Attribute the current RSS to every collector still running
+            rss = _rss()
+            for future in pending:
+                name = futures[future].name
+                if name in started:
+                    peaks[name] = max(peaks.get(name, 0), rss)
+
+            now = time.perf_counter()
+            for future in list(pending):
+                task = futures[future]
+                if (
+                    task.timeout is None
+                    or task.name not in started
+                    or future.done()
+                ):
+                    continue
+                t_start, started_iso = started[task.name]
+                if now - t_start <= task.timeout:
+                    continue
+                pending.discard(future)
+                _finish(timeout_result(task, started_iso, now - t_start))
+    finally:
+        # Skip collectors that have not started yet
+        for future in submitted:
+            future.cancel()
+
+    return [results[task.name] for task in tasks]
+
+
+@dataclass
+class Schedule:
+    """Execution plan produced by the scheduler.
+
+    Attributes:
+        tasks: Tasks in start order (longest first).
+        max_workers: Number of collectors allowed to run at once.
+        estimated_seconds: Estimated wall time of the plan.
+        target_seconds: Wall time the plan was asked to meet.
+    """
+
+    tasks: List[CollectorTask]
+    max_workers: int
+    estimated_seconds: float
+    target_seconds: float
+
+
+def _makespan(costs: List[float], workers: int) -> float:
+    """Estimate wall time of longest-first list scheduling.
+
+    Args:
+        costs: Task costs, sorted in descending order.
+        workers: Number of parallel workers.
+
+    Returns:
+        Estimated wall time in seconds.
+    """
+    loads = [0.0] * workers
+    for cost in costs:
+        i = loads.index(min(loads))
+        loads[i] += cost
+    return max(loads)
+
+
+def plan_schedule(
+    specs: List["CollectorSpec"],
+    config: Dict[str, Any],
+    target_seconds: float,
+) -> Schedule:
+    """Order and parallelize collectors to meet a target duration.
+
+    Collectors are started longest-first, and the worker count is the
+    smallest that meets the target (fewer threads means less contention
+    on a machine that is already struggling). If the target cannot be met
+    even with full parallelism, every collector gets its own worker.
+
+    Args:
+        specs: Registry specs of the collectors to run.
+        config: Configuration dict (with profile overrides applied).
+        target_seconds: Desired total wall time.
+
+    Returns:
+        Schedule for run_collectors.
+    """
+    costed = sorted(
+        ((spec.estimate_cost(config), spec) for spec in specs),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+    costs = [cost for cost, _ in costed]
+    tasks = [
+        CollectorTask(
+            name=spec.name,
+            filename=spec.filename,
+            func=spec.load(),
+            kwargs=spec.kwargs(config),
+            timeout=spec.effective_timeout(config),
+        )
+        for _, spec in costed
+    ]
+
+    workers = max(len(tasks), 1)
+    for candidate in range(1, len(tasks) + 1):
+        if _makespan(costs, candidate) <= target_seconds:
+            workers = candidate
+            break
+
+    return Schedule(
+        tasks=tasks,
+        max_workers=workers,
+        estimated_seconds=_makespan(costs, workers) if costs else 0.0,
+        target_seconds=target_seconds,
+    )
@@ -0,0 +1,692 @@
+"""Local metrics exporter serving cached collector results.
+
+``big-red-button exporter`` serves the metrics produced by the snapshot
+collectors in the Prometheus text format, over HTTP on a local address
+or on a Unix socket, so a local scraper can follow a workstation between
+snapshots.
+
+Collector results are cached for a per-collector TTL, so frequent
+scrapes never re-run expensive work such as the GPU probe or installed
+application detection. A scrape that finds a result expired starts one
+refresh; scrapes arriving while it runs wait for that same run instead
+of starting their own. Collectors whose estimated cost is at least
+BACKGROUND_COST_SECONDS are refreshed by a background thread shortly
+before they expire, and scrapes always get their latest cached result
+immediately.
+"""
+
+import contextlib
+import os
+import platform
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .collectors import registry
+from .engine import CollectorResult, CollectorTask, run_task_with_timeout
+
+DEFAULT_COLLECTORS = (
+    "system_info",
+    "cpu_memory",
+    "disks",
+    "network",
+    "processes",
+    "gpu",
+    "temperatures",
+    "foreground_app",
+    "installed_apps",
+)
+# Collectors at least this expensive are refreshed in the background
+BACKGROUND_COST_SECONDS = 0.5
+# Seconds between background scheduler checks
+_POLL_SECONDS = 0.5
+# Processes exported per ranking (labels are per process, so keep the
+# number of series bounded)
+TOP_PROCESS_SERIES = 10
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class CacheEntry:
+    """Cached result of one collector.
+
+    Attributes:
+        result: Latest finished run, or None before the first one.
+        fetched: time.monotonic() when ``result`` was stored.
+        refreshing: Future of the run in progress, if any.
+        runs: Number of runs so far.
+    """
+
+    result: Optional[CollectorResult] = None
+    fetched: Optional[float] = None
+    refreshing: Optional["Future[None]"] = None
+    runs: int = 0
+
+
+class ResultCache:
+    """Collector results cached with per-collector TTLs.
+
+    Args:
+        specs: Registry specs of the collectors to serve.
+        config: Configuration dict (with profile overrides applied).
+        ttls: Seconds each collector's result stays fresh, by name.
+        background: Names of collectors refreshed in the background.
+        clock: Monotonic clock (replaced in tests).
+    """
+
+    def __init__(
+        self,
+        specs: Iterable["registry.CollectorSpec"],
+        config: Dict[str, Any],
+        ttls: Dict[str, float],
+        background: Iterable[str] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.specs = {spec.name: spec for spec in specs}
+        self.ttls = ttls
+        self.background: Set[str] = set(background)
+        self.clock = clock
+        self._costs = {
+            name: spec.estimate_cost(config)
+            for name, spec in self.specs.items()
+        }
+        self._tasks = {
+            name: CollectorTask(
+                name=name,
+                filename=spec.filename,
+                func=spec.load(),
+                kwargs=spec.kwargs(config),
+                timeout=spec.effective_timeout(config),
+            )
+            for name, spec in self.specs.items()
+        }
+        self._entries = {name: CacheEntry() for name in self.specs}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(len(self.specs), 1),
+            thread_name_prefix="exporter",
+        )
+        self._scheduler = threading.Thread(
+            target=self._schedule, name="exporter-refresh", daemon=True
+        )
+
+    def _age(self, name: str) -> Optional[float]:
+        fetched = self._entries[name].fetched
+        return None if fetched is None else self.clock() - fetched
+
+    def _refresh(self, name: str) -> "Future[None]":
+        """Start a run unless one is in flight (call with the lock held)."""
+        entry = self._entries[name]
+        if entry.refreshing is None:
+            entry.refreshing = self._pool.submit(self._run, name)
+        return entry.refreshing
+
+    def _run(self, name: str) -> None:
+        # A hung collector is abandoned after its timeout and cached as
+        # timed out, so the next refresh can start a new run
+        result = run_task_with_timeout(self._tasks[name])
+        with self._lock:
+            entry = self._entries[name]
+            entry.result = result
+            entry.fetched = self.clock()
+            entry.refreshing = None
+            entry.runs += 1
+
+    def _schedule(self) -> None:
+        """Refresh background collectors just before they expire."""
+        while not self._stop.is_set():
+            with self._lock:
+                for name in self.background:
+                    age = self._age(name)
+                    # Start early by the run's cost so the new result
+                    # lands about when the old one expires
+                    if age is None or age >= self.ttls[name] - min(
+                        self._costs[name], self.ttls[name] / 2
+                    ):
+                        self._refresh(name)
+            self._stop.wait(_POLL_SECONDS)
+
+    def start(self) -> None:
+        """Start refreshing background collectors."""
+        self._scheduler.start()
+
+    def stop(self) -> None:
+        """Stop refreshing; runs in progress are abandoned."""
+        self._stop.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> Dict[str, CacheEntry]:
+        """Return every collector's cached result, refreshing expired ones.
+
+        Expired foreground collectors are refreshed concurrently before
+        returning, joining any run already in flight rather than starting
+        another. Background collectors return their latest result at
+        once.
+
+        Returns:
+            Dict of collector name to a copy of its cache entry.
+        """
+        with self._lock:
+            pending = {}
+            for name in self.specs:
+                age = self._age(name)
+                if age is None or age >= self.ttls[name]:
+                    future = self._refresh(name)
+                    if name not in self.background:
+                        pending[name] = future
+        if pending:
+            # Runs end by their timeout; the slack lets a timed-out run
+            # store its result before this scrape reads the cache
+            wait_futures(
+                list(pending.values()),
+                timeout=max(self._tasks[n].timeout or 0 for n in pending)
+                + _POLL_SECONDS,
+            )
+        with self._lock:
+            return {
+                name: replace(entry) for name, entry in self._entries.items()
+            }
+
+
+class MetricSet:
+    """Prometheus gauges collected for one scrape."""
+
+    def __init__(self) -> None:
+        self._families: Dict[str, Tuple[str, List[Tuple[Labels, float]]]] = {}
+
+    def add(
+        self,
+        metric: str,
+        help_text: str,
+        value: Any,
+        **labels: Any,
+    ) -> None:
+        """Add a sample; None and non-numeric values are skipped.
+
+        Args:
+            metric: Metric name without the ``brb_`` prefix.
+            help_text: HELP line for the metric family.
+            value: Sample value (bools become 0 or 1).
+            **labels: Label values.
+        """
+        if isinstance(value, bool):
+            value = int(value)
+        if not isinstance(value, (int, float)):
+            return
+        family = self._families.setdefault(f"brb_{metric}", (help_text, []))
+        family[1].append(
+            (tuple((k, str(v)) for k, v in labels.items()), float(value))
+        )
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, (help_text, samples) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{name}{suffix} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _weighted_mean(samples: List[Dict[str, Any]], key: str) -> Any:
+    pairs = [
+        (s[key], float(s.get("interval_seconds") or 1.0))
+        for s in samples
+        if isinstance(s.get(key), (int, float))
+    ]
+    total = sum(w for _, w in pairs)
+    if not total:
+        return None
+    return round(sum(v * w for v, w in pairs) / total, 2)
+
+
+def _system_info(m: MetricSet, data: Dict[str, Any]) -> None:
+    m.add("uptime_seconds", "Seconds since boot", data.get("uptime_seconds"))
+    m.add(
+        "host_info",
+        "Host name and platform (always 1)",
+        1,
+        hostname=data.get("hostname", ""),
+        platform=data.get("platform", ""),
+        release=data.get("platform_release", ""),
+    )
+
+
+def _cpu_memory(m: MetricSet, data: Dict[str, Any]) -> None:
+    samples = data.get("cpu_samples") or []
+    m.add(
+        "cpu_percent",
+        "Mean CPU utilization over the sampling window",
+        _weighted_mean(samples, "cpu_percent_overall"),
+    )
+    cores = [
+        s["cpu_percent_per_cpu"]
+        for s in samples
+        if s.get("cpu_percent_per_cpu")
+    ]
+    for core, values in enumerate(zip(*cores)):
+        m.add(
+            "cpu_core_percent",
+            "Mean per-core CPU utilization over the sampling window",
+            round(sum(values) / len(values), 2),
+            core=core,
+        )
+    m.add("cpu_count", "Logical CPUs", data.get("cpu_count_logical"))
+    vm = data.get("virtual_memory") or {}
+    m.add("memory_percent", "RAM in use", vm.get("percent"))
+    m.add("memory_used_bytes", "RAM in use", vm.get("used"))
+    m.add("memory_available_bytes", "RAM available", vm.get("available"))
+    m.add("memory_total_bytes", "Installed RAM", vm.get("total"))
+    swap = data.get("swap_memory") or {}
+    m.add("swap_percent", "Swap in use", swap.get("percent"))
+    m.add("swap_used_bytes", "Swap in use", swap.get("used"))
+    if not samples:
+        return
+    last = samples[-1]
+    m.add(
+        "swap_in_bytes_per_second",
+        "Swap-in rate over the sampling window",
+        _weighted_mean(samples, "swap_in_bytes_per_sec"),
+    )
+    m.add(
+        "load1", "One-minute load average", (last.get("load_avg") or [None])[0]
+    )
+    m.add("run_queue", "Runnable tasks", last.get("run_queue"))
+    m.add(
+        "context_switches_per_second",
+        "Context switch rate over the sampling window",
+        _weighted_mean(samples, "ctx_switches_per_sec"),
+    )
+    for key, value in (last.get("pressure") or {}).items():
+        resource, kind, _ = key.split("_")
+        m.add(
+            "pressure_percent",
+            "Share of the last interval tasks stalled on a resource (PSI)",
+            value,
+            resource=resource,
+            kind=kind,
+        )
+
+
+def _disks(m: MetricSet, data: Dict[str, Any]) -> None:
+    for part in data.get("partitions") or []:
+        usage = part.get("usage") or {}
+        if not usage.get("total"):
+            continue
+        labels = {
+            "mountpoint": part.get("mountpoint", ""),
+            "device": part.get("device", ""),
+        }
+        m.add(
+            "volume_used_percent",
+            "Volume space used",
+            usage.get("percent"),
+            **labels,
+        )
+        m.add(
+            "volume_free_bytes",
+            "Volume space free",
+            usage.get("free"),
+            **labels,
+        )
+    summary = (data.get("io_rates") or {}).get("summary") or {}
+    for disk, stats in summary.items():
+        for field, value in (stats.get("mean") or {}).items():
+            m.add(
+                f"disk_{field}",
+                f"Mean disk {field.replace('_', ' ')} over the window",
+                value,
+                disk=disk,
+            )
+        m.add(
+            "disk_saturated",
+            "Disk was saturated in the window",
+            stats.get("saturated"),
+            disk=disk,
+        )
+
+
+def _network(m: MetricSet, data: Dict[str, Any]) -> None:
+    for nic, stats in (data.get("stats") or {}).items():
+        m.add(
+            "network_up", "Interface is up", stats.get("isup"), interface=nic
+        )
+    summary = (data.get("io_rates") or {}).get("summary") or {}
+    for nic, stats in summary.items():
+        for field in ("mean_rx_mbps", "mean_tx_mbps", "peak_percent_of_link"):
+            m.add(
+                f"network_{field}",
+                f"Interface {field.replace('_', ' ')} over the window",
+                stats.get(field),
+                interface=nic,
+            )
+        m.add(
+            "network_errors_or_drops",
+            "Interface had errors or drops in the window",
+            stats.get("errors_or_drops"),
+            interface=nic,
+        )
+    for check in data.get("storage_host_checks") or []:
+        host = check.get("host", "")
+        m.add(
+            "storage_reachable",
+            "Storage host answered a probe",
+            check.get("reachable"),
+            host=host,
+        )
+        for port, probe in (check.get("tcp") or {}).items():
+            m.add(
+                "storage_connect_ms",
+                "Mean TCP connect latency to a storage service",
+                probe.get("avg_ms"),
+                host=host,
+                port=port,
+            )
+            m.add(
+                "storage_loss_percent",
+                "Failed TCP connects to a storage service",
+                probe.get("loss_percent"),
+                host=host,
+                port=port,
+            )
+
+
+def _processes(m: MetricSet, data: Dict[str, Any]) -> None:
+    m.add("process_count", "Running processes", data.get("process_count"))
+    for key, metric, field, help_text in (
+        (
+            "top_processes_by_cpu",
+            "process_cpu_percent",
+            "cpu_percent",
+            "CPU use of a top process",
+        ),
+        (
+            "top_processes_by_memory",
+            "process_rss_bytes",
+            "rss",
+            "Resident memory of a top process",
+        ),
+    ):
+        for proc in (data.get(key) or [])[:TOP_PROCESS_SERIES]:
+            m.add(
+                metric,
+                help_text,
+                proc.get(field),
+                pid=proc.get("pid"),
+                name=proc.get("name") or "",
+            )
+
+
+def _gpu(m: MetricSet, data: Dict[str, Any]) -> None:
+    for dev in data.get("nvidia_devices") or []:
+        labels = {"gpu": dev.get("index"), "name": dev.get("name") or ""}
+        m.add(
+            "gpu_utilization_percent",
+            "GPU utilization",
+            dev.get("gpu_utilization"),
+            **labels,
+        )
+        m.add(
+            "gpu_memory_used_bytes",
+            "VRAM in use",
+            dev.get("memory_used"),
+            **labels,
+        )
+        m.add(
+            "gpu_memory_total_bytes",
+            "Installed VRAM",
+            dev.get("memory_total"),
+            **labels,
+        )
+        m.add(
+            "gpu_temperature_celsius",
+            "GPU temperature",
+            dev.get("temperature"),
+            **labels,
+        )
+
+
+def _temperatures(m: MetricSet, data: Dict[str, Any]) -> None:
+    for chip, entries in (data.get("sensors") or {}).items():
+        for i, entry in enumerate(entries):
+            m.add(
+                "temperature_celsius",
+                "Temperature sensor reading",
+                entry.get("current"),
+                chip=chip,
+                sensor=entry.get("label") or str(i),
+            )
+
+
+def _foreground_app(m: MetricSet, data: Dict[str, Any]) -> None:
+    app = data.get("app_name") or data.get("process_name")
+    if app:
+        m.add(
+            "foreground_app_info",
+            "Application in the foreground (always 1)",
+            1,
+            app=app,
+        )
+
+
+def _installed_apps(m: MetricSet, data: Dict[str, Any]) -> None:
+    for app, info in data.items():
+        if isinstance(info, dict):
+            m.add(
+                "installed_app_info",
+                "Detected creative application (always 1)",
+                1,
+                app=app,
+                version=info.get("version") or "",
+            )
+
+
+# Collector name -> function adding its metrics
+CONVERTERS: Dict[str, Callable[[MetricSet, Dict[str, Any]], None]] = {
+    "system_info": _system_info,
+    "cpu_memory": _cpu_memory,
+    "disks": _disks,
+    "network": _network,
+    "processes": _processes,
+    "gpu": _gpu,
+    "temperatures": _temperatures,
+    "foreground_app": _foreground_app,
+    "installed_apps": _installed_apps,
+}
+
+
+def render_metrics(
+    entries: Dict[str, CacheEntry], now: Optional[float] = None
+) -> str:
+    """Turn cached collector results into Prometheus metrics.
+
+    Every collector also gets ``brb_collector_up`` (1 if its latest run
+    succeeded, 0 if it failed or has not finished a first run),
+    ``brb_collector_duration_seconds`` and ``brb_collector_age_seconds``.
+
+    Args:
+        entries: Cache entries by collector name.
+        now: time.monotonic() to compute result ages from.
+
+    Returns:
+        Metrics in the Prometheus text exposition format.
+    """
+    now = time.monotonic() if now is None else now
+    m = MetricSet()
+    for name, entry in entries.items():
+        result = entry.result
+        m.add(
+            "collector_up",
+            "Latest collector run succeeded",
+            result is not None and result.status == "ok",
+            collector=name,
+        )
+        if result is None:
+            continue
+        m.add(
+            "collector_duration_seconds",
+            "Duration of the latest collector run",
+            round(result.duration_seconds, 3),
+            collector=name,
+        )
+        if entry.fetched is not None:
+            m.add(
+                "collector_age_seconds",
+                "Seconds since the cached result was collected",
+                round(now - entry.fetched, 3),
+                collector=name,
+            )
+    for name, entry in entries.items():
+        converter = CONVERTERS.get(name)
+        result = entry.result
+        if converter and result is not None and isinstance(result.data, dict):
+            converter(m, result.data)
+    return m.render()
+
+
+def cache_from_config(config: Dict[str, Any]) -> ResultCache:
+    """Build the result cache from the ``exporter_*`` configuration keys.
+
+    Args:
+        config: Configuration dict.
+
+    Returns:
+        Result cache for the exporter's collectors on this platform.
+
+    Raises:
+        ValueError: If the profile or a collector name is unknown.
+    """
+    profile = registry.get_profile(
+        config.get("exporter_profile", "quick"), config
+    )
+    run_config = profile.apply(config)
+    names = config.get("exporter_collectors") or DEFAULT_COLLECTORS
+    unknown = [n for n in names if n not in CONVERTERS]
+    if unknown:
+        raise ValueError(
+            f"Unknown exporter collectors: {', '.join(unknown)} "
+            f"(choose from: {', '.join(CONVERTERS)})"
+        )
+    system = platform.system()
+    specs = [
+        registry.REGISTRY[n]
+        for n in names
+        if registry.REGISTRY[n].supports(system)
+    ]
+    default_ttl = float(config.get("exporter_ttl_seconds", 30.0))
+    overrides = config.get("exporter_ttl") or {}
+    ttls = {
+        spec.name: float(overrides.get(spec.name, default_ttl))
+        for spec in specs
+    }
+    background = [
+        spec.name
+        for spec in specs
+        if spec.estimate_cost(run_config) >= BACKGROUND_COST_SECONDS
+    ]
+    return ResultCache(specs, run_config, ttls, background)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves /metrics from the server's result cache."""
+
+    server: Any
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404, "Metrics are served at /metrics")
+            return
+        body = render_metrics(self.server.cache.snapshot()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else "-"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _UnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        # Replace a socket left behind by an exporter that did not exit
+        # cleanly
+        if stat.S_ISSOCK(_mode(str(self.server_address))):
+            os.unlink(str(self.server_address))
+        super().server_bind()
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(str(self.server_address))
+
+
+def _mode(path: str) -> int:
+    try:
+        return os.lstat(path).st_mode
+    except OSError:
+        return 0
+
+
+def make_server(listen: str, cache: ResultCache) -> socketserver.BaseServer:
+    """Create the HTTP server for a listen address.
+
+    Args:
+        listen: ``host:port`` for TCP, or ``unix:<path>`` for a Unix
+                socket.
+        cache: Result cache the server reads from.
+
+    Returns:
+        Server ready for serve_forever().
+
+    Raises:
+        ValueError: If the address is malformed.
+    """
+    server: Any
+    if listen.startswith("unix:"):
+        server = _UnixHTTPServer(listen[len("unix:") :], _Handler)
+    else:
+        host, sep, port = listen.rpartition(":")
+        if not sep or not port.isdigit():
+            raise ValueError(
+                f"Invalid exporter address {listen!r}; use host:port or "
+                "unix:<path>"
+            )
+        server = ThreadingHTTPServer(
+            (host or "127.0.0.1", int(port)), _Handler
+        )
+    server.cache = cache
+    return server
@@ -0,0 +1,536 @@
+"""Fleet index: key metrics from many snapshots in one SQLite database.
+
+``index`` scans a snapshot_root for snapshot archives and extracts a
+row of key metrics (plus the analyze findings) from each new or changed
+archive. Archives already indexed are recognized by path, mtime and size
+and are not reopened, so re-indexing a large shared root is cheap when
+only a few snapshots have arrived. ``query`` filters and aggregates the
+rows across hosts and time.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .analyze import (
+    CPU_SATURATED_PERCENT,
+    IGNORED_FSTYPES,
+    load_snapshot,
+    run_checks,
+    series_stats,
+)
+
+SNAPSHOT_GLOB = "support_snapshot_*.zip"
+
+# Metric columns extracted from every snapshot (name -> SQL type); these
+# are the columns query filters, groupings and aggregates may use.
+COLUMNS: Dict[str, str] = {
+    "host": "TEXT",
+    "platform": "TEXT",
+    "created": "TEXT",
+    "profile": "TEXT",
+    "app_name": "TEXT",
+    "severity": "TEXT",
+    "foreground_app": "TEXT",
+    "cpu_count": "INTEGER",
+    "cpu_mean": "REAL",
+    "cpu_max": "REAL",
+    "cpu_max_core": "REAL",
+    "memory_total": "INTEGER",
+    "memory_percent": "REAL",
+    "memory_max_percent": "REAL",
+    "swap_percent": "REAL",
+    "process_count": "INTEGER",
+    "top_process": "TEXT",
+    "top_process_cpu": "REAL",
+    "vram_percent": "REAL",
+    "gpu_temperature": "REAL",
+    "max_volume_percent": "REAL",
+    "storage_failed": "INTEGER",
+    "storage_degraded": "INTEGER",
+    "critical_findings": "INTEGER",
+    "warning_findings": "INTEGER",
+}
+
+DEFAULT_QUERY_COLUMNS = (
+    "created",
+    "host",
+    "app_name",
+    "cpu_mean",
+    "memory_percent",
+    "swap_percent",
+    "critical_findings",
+)
+
+# Pseudo-columns available for --group-by
+_GROUPINGS = {
+    "day": "substr(created, 1, 10)",
+    "month": "substr(created, 1, 7)",
+}
+_AGGREGATES = ("count", "avg", "min", "max", "sum")
+_FILTER_RE = re.compile(r"^\s*(\w+)\s*(>=|<=|!=|=|>|<|~)\s*(.*?)\s*$")
+
+# Below this many archives to extract, worker process start-up costs
+# more than it saves
+_POOL_THRESHOLD = 4
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    indexed TEXT NOT NULL,
+    error TEXT,
+    {", ".join(f"{name} {kind}" for name, kind in COLUMNS.items())}
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_created ON snapshots(created);
+CREATE INDEX IF NOT EXISTS idx_snapshots_host_created
+    ON snapshots(host, created);
+CREATE INDEX IF NOT EXISTS idx_snapshots_app ON snapshots(app_name);
+CREATE TABLE IF NOT EXISTS findings (
+    snapshot_id INTEGER NOT NULL
+        REFERENCES snapshots(id) ON DELETE CASCADE,
+    check_name TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_findings_snapshot ON findings(snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_findings_title ON findings(title, severity);
+"""
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) a fleet index database.
+
+    Args:
+        db_path: SQLite database path.
+
+    Returns:
+        Open connection with the schema in place.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _created_from_name(name: str) -> Optional[str]:
+    """Parse the capture time from a support_snapshot_<stamp> name."""
+    match = re.search(r"(\d{8}_\d{6})", name)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").isoformat()
+    except ValueError:
+        return None
+
+
+def _number(value: Any) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def extract_metrics(files: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the index columns from loaded snapshot files.
+
+    Args:
+        files: Snapshot files from analyze.load_snapshot().
+
+    Returns:
+        Dict with a value (possibly None) for every column in COLUMNS.
+    """
+    row: Dict[str, Any] = dict.fromkeys(COLUMNS)
+    system = files.get("system_info.json") or {}
+    row["host"] = system.get("hostname")
+    row["platform"] = system.get("platform")
+    row["created"] = system.get("timestamp_local")
+    row["profile"] = (files.get("collection_meta.json") or {}).get("profile")
+
+    context = files.get("user_context.json") or {}
+    row["app_name"] = context.get("app_name") or None
+    row["severity"] = context.get("severity")
+    foreground = files.get("foreground_app.json") or {}
+    row["foreground_app"] = foreground.get("app_name") or foreground.get(
+        "process_name"
+    )
+
+    cpu_memory = files.get("cpu_memory.json") or {}
+    samples = cpu_memory.get("cpu_samples") or []
+    timed = [
+        s for s in samples if _number(s.get("cpu_percent_overall")) is not None
+    ]
+    # Weighted by interval: adaptive captures sample faster during spikes
+    cpu = series_stats(
+        [s["cpu_percent_overall"] for s in timed],
+        CPU_SATURATED_PERCENT,
+        [float(s.get("interval_seconds") or 1.0) for s in timed],
+    )
+    row["cpu_count"] = cpu_memory.get("cpu_count_logical")
+    row["cpu_mean"] = cpu["mean"]
+    row["cpu_max"] = cpu["max"]
+    cores = [
+        max(s["cpu_percent_per_cpu"])
+        for s in samples
+        if s.get("cpu_percent_per_cpu")
+    ]
+    row["cpu_max_core"] = max(cores) if cores else None
+    memory = cpu_memory.get("virtual_memory") or {}
+    row["memory_total"] = memory.get("total")
+    row["memory_percent"] = _number(memory.get("percent"))
+    peaks = [
+        s["memory_percent"]
+        for s in samples
+        if _number(s.get("memory_percent")) is not None
+    ]
+    row["memory_max_percent"] = max(peaks) if peaks else row["memory_percent"]
+    row["swap_percent"] = _number(
+        (cpu_memory.get("swap_memory") or {}).get("percent")
+    )
+
+    processes = files.get("processes.json") or {}
+    row["process_count"] = processes.get("process_count")
+    top = (processes.get("top_processes_by_cpu") or [None])[0]
+    if top:
+        row["top_process"] = top.get("name")
+        row["top_process_cpu"] = _number(top.get("cpu_percent"))
+
+    for dev in (files.get("gpu_info.json") or {}).get("nvidia_devices") or []:
+        total, used = dev.get("memory_total"), dev.get("memory_used")
+        if total and used is not None:
+            percent = round(100.0 * used / total, 1)
+            row["vram_percent"] = max(row["vram_percent"] or 0.0, percent)
+        temp = _number(dev.get("temperature"))
+        if temp is not None:
+            row["gpu_temperature"] = max(row["gpu_temperature"] or 0.0, temp)
+
+    volumes = [
+        p["usage"]["percent"]
+        for p in (files.get("disks.json") or {}).get("partitions") or []
+        if p.get("usage")
+        and p["usage"].get("total")
+        and p.get("fstype") not in IGNORED_FSTYPES
+    ]
+    row["max_volume_percent"] = max(volumes) if volumes else None
+
+    checks = (files.get("network.json") or {}).get("storage_host_checks")
+    if isinstance(checks, list):
+        statuses = [c.get("status") for c in checks]
+        row["storage_failed"] = statuses.count("FAILED")
+        row["storage_degraded"] = statuses.count("DEGRADED")
+    return row
+
+
+def extract_snapshot(path: str) -> Dict[str, Any]:
+    """Extract the index row and findings for one snapshot archive.
+
+    Runs in a worker process, so it takes and returns plain data.
+
+    Args:
+        path: Snapshot archive path.
+
+    Returns:
+        Dict with "metrics", "findings" (check, severity, title tuples)
+        and "error" (None on success).
+    """
+    try:
+        files = load_snapshot(Path(path))
+        metrics = extract_metrics(files)
+        findings, _ = run_checks(files)
+    except Exception as e:
+        return {"metrics": {}, "findings": [], "error": str(e)}
+    metrics["critical_findings"] = sum(
+        1 for f in findings if f.severity == "critical"
+    )
+    metrics["warning_findings"] = sum(
+        1 for f in findings if f.severity == "warning"
+    )
+    if metrics["created"] is None:
+        metrics["created"] = _created_from_name(Path(path).name)
+    return {
+        "metrics": metrics,
+        "findings": [(f.check, f.severity, f.title) for f in findings],
+        "error": None,
+    }
+
+
+def _scan(root: Path) -> Dict[str, Tuple[Path, float, int]]:
+    """Find snapshot archives under root, keyed by relative path."""
+    found: Dict[str, Tuple[Path, float, int]] = {}
+    for path in root.rglob(SNAPSHOT_GLOB):
+        try:
+            st = path.stat()
+        except OSError:
+            continue  # deleted while scanning
+        found[path.relative_to(root).as_posix()] = (
+            path,
+            st.st_mtime,
+            st.st_size,
+        )
+    return found
+
+
+def _extract_all(
+    paths: Sequence[Path], workers: Optional[int]
+) -> Iterable[Dict[str, Any]]:
+    """Extract rows, in worker processes when there are enough archives."""
+    workers = workers or os.cpu_count() or 1
+    names = [str(p) for p in paths]
+    if workers > 1 and len(names) >= _POOL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(
+                extract_snapshot,
+                names,
+                chunksize=max(1, len(names) // (workers * 4)),
+            )
+    else:
+        yield from map(extract_snapshot, names)
+
+
+def index_snapshots(
+    root: Path,
+    db_path: Path,
+    workers: Optional[int] = None,
+    prune: bool = True,
+) -> Dict[str, Any]:
+    """Incrementally index the snapshot archives under root.
+
+    Args:
+        root: Directory to scan (usually snapshot_root).
+        db_path: SQLite database path.
+        workers: Extraction worker processes (default: CPU count).
+        prune: Remove rows for archives that no longer exist.
+
+    Returns:
+        Dict with counts of scanned, added, updated, unchanged, removed
+        and failed archives, and the elapsed time.
+    """
+    t0 = time.perf_counter()
+    found = _scan(root)
+    conn = connect(db_path)
+    try:
+        known = {
+            path: (mtime, size, row_id)
+            for row_id, path, mtime, size in conn.execute(
+                "SELECT id, path, mtime, size FROM snapshots"
+            )
+        }
+        todo = [
+            key
+            for key, (_, mtime, size) in found.items()
+            if known.get(key, (None, None))[:2] != (mtime, size)
+        ]
+        stats: Dict[str, Any] = {
+            "scanned": len(found),
+            "added": sum(1 for key in todo if key not in known),
+            "updated": sum(1 for key in todo if key in known),
+            "unchanged": len(found) - len(todo),
+            "removed": 0,
+            "errors": 0,
+        }
+
+        columns = ["path", "mtime", "size", "indexed", "error", *COLUMNS]
+        insert = (
+            f"INSERT INTO snapshots ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        now = datetime.now().isoformat()
+        with conn:
+            for key, result in zip(
+                todo, _extract_all([found[key][0] for key in todo], workers)
+            ):
+                _, mtime, size = found[key]
+                if key in known:
+                    conn.execute(
+                        "DELETE FROM snapshots WHERE id = ?", (known[key][2],)
+                    )
+                if result["error"]:
+                    stats["errors"] += 1
+                metrics = result["metrics"]
+                cursor = conn.execute(
+                    insert,
+                    [key, mtime, size, now, result["error"]]
+                    + [metrics.get(name) for name in COLUMNS],
+                )
+                conn.executemany(
+                    "INSERT INTO findings VALUES (?, ?, ?, ?)",
+                    [(cursor.lastrowid, *f) for f in result["findings"]],
+                )
+            if prune:
+                gone = [
+                    (row_id,)
+                    for key, (_, _, row_id) in known.items()
+                    if key not in found
+                ]
+                conn.executemany("DELETE FROM snapshots WHERE id = ?", gone)
+                stats["removed"] = len(gone)
+    finally:
+        conn.close()
+    stats["seconds"] = round(time.perf_counter() - t0, 3)
+    return stats
+
+
+def _parse_filter(expr: str) -> Tuple[str, List[Any]]:
+    """Turn ``column<op>value`` into a SQL condition and parameters."""
+    match = _FILTER_RE.match(expr)
+    if not match or match.group(1) not in COLUMNS:
+        raise ValueError(
+            f"Invalid filter {expr!r}; use <column><op><value> with op one "
+            "of = != > >= < <= ~ (glob) and a column from: "
+            + ", ".join(COLUMNS)
+        )
+    column, op, raw = match.groups()
+    if op == "~":
+        return f"{column} LIKE ?", [raw.replace("*", "%")]
+    value: Any
+    try:
+        value = float(raw)
+    except ValueError:
+        value = raw
+    return f"{column} {op} ?", [value]
+
+
+def _parse_aggregate(spec: str) -> str:
+    """Turn ``count`` or ``<func>:<column>`` into a SQL expression."""
+    if spec == "count":
+        return "COUNT(*) AS count"
+    func, _, column = spec.partition(":")
+    if func not in _AGGREGATES or column not in COLUMNS:
+        raise ValueError(
+            f"Invalid aggregate {spec!r}; use count or "
+            f"<{'|'.join(_AGGREGATES[1:])}>:<column>"
+        )
+    return f"ROUND({func.upper()}({column}), 2) AS {func}_{column}"
+
+
+def query_snapshots(
+    db_path: Path,
+    where: Sequence[str] = (),
+    host: Optional[str] = None,
+    app: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    finding: Optional[str] = None,
+    group_by: Optional[str] = None,
+    aggregates: Sequence[str] = (),
+    columns: Sequence[str] = DEFAULT_QUERY_COLUMNS,
+    limit: Optional[int] = 50,
+) -> List[Dict[str, Any]]:
+    """Filter (and optionally aggregate) indexed snapshots.
+
+    Args:
+        db_path: SQLite database path.
+        where: Filters such as ``swap_percent>50`` or ``host~edit-*``.
+        host: Host name glob (``*`` wildcard).
+        app: Substring of the application the user reported.
+        since: Earliest capture time (ISO date or date-time).
+        until: Latest capture time (ISO date or date-time, inclusive).
+        finding: Substring of an analyze finding title that must be
+                 present, e.g. "Storage host unreachable".
+        group_by: Column, "day" or "month" to aggregate by.
+        aggregates: ``count`` or ``<avg|min|max|sum>:<column>`` (with
+                    group_by; default count).
+        columns: Columns to return when not grouping.
+        limit: Maximum number of rows (None for all).
+
+    Returns:
+        List of result rows as dicts.
+
+    Raises:
+        ValueError: If a filter, column, grouping or aggregate is invalid.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+    for expr in where:
+        condition, values = _parse_filter(expr)
+        conditions.append(condition)
+        params.extend(values)
+    if host:
+        conditions.append("host LIKE ?")
+        params.append(host.replace("*", "%"))
+    if app:
+        conditions.append("app_name LIKE ?")
+        params.append(f"%{app}%")
+    if since:
+        conditions.append("created >= ?")
+        params.append(since)
+    if until:
+        # A bare date includes the whole day
+        conditions.append(
+            "created <= ?" if "T" in until else "created < date(?, '+1 day')"
+        )
+        params.append(until)
+    if finding:
+        conditions.append(
+            "EXISTS (SELECT 1 FROM findings f WHERE f.snapshot_id = "
+            "snapshots.id AND f.title LIKE ?)"
+        )
+        params.append(f"%{finding}%")
+    conditions.append("error IS NULL")
+    clause = " WHERE " + " AND ".join(conditions)
+
+    if group_by:
+        key = _GROUPINGS.get(group_by, group_by)
+        if key == group_by and group_by not in COLUMNS:
+            raise ValueError(f"Cannot group by {group_by!r}")
+        select = [f"{key} AS {group_by}"] + [
+            _parse_aggregate(spec) for spec in aggregates or ("count",)
+        ]
+        sql = (
+            f"SELECT {', '.join(select)} FROM snapshots{clause} "
+            f"GROUP BY 1 ORDER BY 1"
+        )
+    else:
+        unknown = [c for c in columns if c not in COLUMNS and c != "path"]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        sql = (
+            f"SELECT {', '.join(columns)} FROM snapshots{clause} "
+            "ORDER BY created DESC"
+        )
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    conn = connect(db_path)
+    try:
+        cursor = conn.execute(sql, params)  # nosec B608 - names validated
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+    finally:
+        conn.close()
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """Render query results as an aligned text table.
+
+    Args:
+        rows: Rows from query_snapshots().
+
+    Returns:
+        Table text (or a note when there are no rows).
+    """
+    if not rows:
+        return "No matching snapshots.\n"
+    headers = list(rows[0])
+    cells = [
+        ["" if row[h] is None else str(row[h]) for h in headers]
+        for row in rows
+    ]
+    widths = [
+        max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)
+    ]
+    lines = [
+        "  ".join(h.ljust(w) for h, w in zip(headers, widths)),
+        "  ".join("-" * w for w in widths),
+    ]
+    lines.extend(
+        "  ".join(c.ljust(w) for c, w in zip(row, widths)) for row in cells
+    )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,85 @@
+"""Low-impact mode: keep the snapshot tool out of the workload's way.
+
+On a workstation that is already starved, the diagnostic competes with
+Pro Tools or Resolve for CPU and disk. Low-impact mode lowers the tool's
+CPU and I/O priority, optionally pins it to one core and limits how many
+external commands run at once.
+
+On Linux, priority and affinity are per thread and inherited by new
+threads and child processes, so apply_low_impact() must run before the
+collector threads are started.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+from .utils import set_subprocess_limit
+
+# Niceness on POSIX; Windows uses BELOW_NORMAL_PRIORITY_CLASS. Moderate
+# rather than idle so the snapshot still finishes on a saturated machine.
+LOW_NICE = 10
+# Lowest best-effort I/O priority level on Linux (0-7)
+LOW_IONICE_LEVEL = 7
+
+
+def _lower_cpu_priority(proc: psutil.Process) -> Any:
+    if psutil.WINDOWS:
+        proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+        return "below_normal"
+    proc.nice(max(proc.nice(), LOW_NICE))
+    return proc.nice()
+
+
+def _lower_io_priority(proc: psutil.Process) -> Any:
+    if psutil.LINUX:
+        proc.ionice(psutil.IOPRIO_CLASS_BE, value=LOW_IONICE_LEVEL)
+        return f"best-effort/{LOW_IONICE_LEVEL}"
+    if psutil.WINDOWS:
+        proc.ionice(psutil.IOPRIO_LOW)
+        return "low"
+    raise NotImplementedError("I/O priority is not supported here")
+
+
+def _pin(proc: psutil.Process, core: int) -> Any:
+    if not hasattr(proc, "cpu_affinity"):
+        raise NotImplementedError("CPU affinity is not supported here")
+    cores = proc.cpu_affinity()
+    if core not in cores:
+        raise ValueError(f"core {core} is not available (have {cores})")
+    proc.cpu_affinity([core])
+    return [core]
+
+
+def apply_low_impact(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Lower this process's priority as configured for low-impact mode.
+
+    Each step is best effort; failures are reported rather than raised.
+
+    Args:
+        config: Configuration dict (``low_impact_core`` and
+                ``low_impact_max_subprocesses``).
+
+    Returns:
+        Dict describing what was applied (or why a step failed), for
+        collection_meta.json.
+    """
+    proc = psutil.Process()
+    report: Dict[str, Any] = {}
+    core: Optional[int] = config.get("low_impact_core")
+    steps: List[Tuple[str, Callable[[psutil.Process], Any]]] = [
+        ("cpu_priority", _lower_cpu_priority),
+        ("io_priority", _lower_io_priority),
+    ]
+    if core is not None:
+        steps.append(("cpu_affinity", lambda p: _pin(p, int(core))))
+    for name, step in steps:
+        try:
+            report[name] = step(proc)
+        except (psutil.Error, OSError, NotImplementedError, ValueError) as e:
+            report[name] = {"error": str(e) or type(e).__name__}
+
+    limit = int(config.get("low_impact_max_subprocesses", 1))
+    set_subprocess_limit(limit)
+    report["max_subprocesses"] = limit
+    return report
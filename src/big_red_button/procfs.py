@@ -0,0 +1,391 @@
+"""High-frequency counter backend for Linux that reads /proc directly.
+
+psutil opens, reads and fully parses a /proc file for every metric on
+every call. ProcfsReader instead keeps the files it needs open, re-reads
+them with ``preadv`` at offset 0 into buffers that are allocated once,
+and extracts only the fields the sampler uses with precompiled regular
+expressions. The results have the same shape and field names as the
+psutil tuples, so the sampler's rate and percentage code is shared.
+"""
+
+import contextlib
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .sampler import Reading
+
+PROCFS = "/proc"
+SYS_BLOCK = "/sys/block"
+# /proc/diskstats counts 512-byte sectors whatever the device's block size
+SECTOR_SIZE = 512
+# /proc/vmstat pswpin/pswpout count 4 KiB pages (as psutil assumes)
+SWAP_PAGE_SIZE = 4096
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+
+# Leading newline: each buffer starts with b"\n" (see _ProcFile), so every
+# field name, including the first line's, can be anchored on it
+_CPU_RE = re.compile(rb"\ncpu\d+ +([\d ]+)")
+_STAT_RE = re.compile(
+    rb"\n(ctxt|intr|softirq|procs_running|procs_blocked) (\d+)"
+)
+_MEMINFO_RE = re.compile(
+    rb"\n(MemTotal|MemFree|MemAvailable|SwapTotal|SwapFree): +(\d+)"
+)
+_VMSTAT_RE = re.compile(rb"\n(pswpin|pswpout) (\d+)")
+_DISKSTATS_RE = re.compile(
+    rb"\n *\d+ +\d+ (\S+) (\d+) (\d+) (\d+) (\d+) (\d+) (\d+) (\d+) (\d+)"
+    rb" \d+ (\d+)"
+)
+_NET_DEV_RE = re.compile(
+    rb"\n *([^\s:]+): *(\d+) +(\d+) +(\d+) +(\d+) +\d+ +\d+ +\d+ +\d+"
+    rb" +(\d+) +(\d+) +(\d+) +(\d+)"
+)
+_PRESSURE_RE = re.compile(rb"\n(some|full) [^\n]*total=(\d+)")
+
+
+class CpuTimes(NamedTuple):
+    """Per-CPU times in seconds (psutil.cpu_times fields on Linux)."""
+
+    user: float
+    nice: float
+    system: float
+    idle: float
+    iowait: float
+    irq: float
+    softirq: float
+    steal: float
+    guest: float
+    guest_nice: float
+
+
+class CpuStats(NamedTuple):
+    """Cumulative scheduler counters (psutil.cpu_stats fields)."""
+
+    ctx_switches: int
+    interrupts: int
+    soft_interrupts: int
+    syscalls: int
+
+
+class RunQueue(NamedTuple):
+    """Tasks runnable (including running) and blocked on I/O right now."""
+
+    running: int
+    blocked: int
+
+
+class VirtualMemory(NamedTuple):
+    """The psutil.virtual_memory fields the sampler uses."""
+
+    total: int
+    available: int
+    percent: float
+    used: int
+    free: int
+
+
+class SwapMemory(NamedTuple):
+    """psutil.swap_memory fields."""
+
+    total: int
+    used: int
+    free: int
+    percent: float
+    sin: int
+    sout: int
+
+
+class DiskIO(NamedTuple):
+    """psutil.disk_io_counters fields on Linux."""
+
+    read_count: int
+    write_count: int
+    read_bytes: int
+    write_bytes: int
+    read_time: int
+    write_time: int
+    read_merged_count: int
+    write_merged_count: int
+    busy_time: int
+
+
+class NetIO(NamedTuple):
+    """psutil.net_io_counters fields."""
+
+    bytes_sent: int
+    bytes_recv: int
+    packets_sent: int
+    packets_recv: int
+    errin: int
+    errout: int
+    dropin: int
+    dropout: int
+
+
+class _ProcFile:
+    """An open /proc file re-read in place into a reusable buffer.
+
+    The buffer's first byte is a newline and the file is read after it,
+    so field regexes can anchor every line on ``\\n``. The buffer doubles
+    whenever a read fills it, then stays at that size.
+
+    Args:
+        path: File to open.
+        size: Initial buffer size in bytes.
+    """
+
+    def __init__(self, path: str, size: int = 4096):
+        self.fd = os.open(path, os.O_RDONLY)
+        self._allocate(size)
+
+    def _allocate(self, size: int) -> None:
+        self.buf = bytearray(size)
+        self.buf[0] = 0x0A
+        self._target = [memoryview(self.buf)[1:]]
+
+    def read(self) -> int:
+        """Read the file's current contents into the buffer.
+
+        Returns:
+            End offset of the data in ``buf``.
+        """
+        while True:
+            n = os.preadv(self.fd, self._target, 0)
+            if n < len(self.buf) - 1:
+                return n + 1
+            self._allocate(len(self.buf) * 2)
+
+    def close(self) -> None:
+        """Close the file descriptor."""
+        os.close(self.fd)
+
+
+def _disk_io(v: List[int]) -> DiskIO:
+    """DiskIO from /proc/diskstats values in file order."""
+    return DiskIO(
+        v[0],
+        v[4],
+        v[2] * SECTOR_SIZE,
+        v[6] * SECTOR_SIZE,
+        v[3],
+        v[7],
+        v[1],
+        v[5],
+        v[8],
+    )
+
+
+def _net_io(v: List[int]) -> NetIO:
+    """NetIO from /proc/net/dev values in file order."""
+    return NetIO(v[4], v[0], v[5], v[1], v[2], v[6], v[3], v[7])
+
+
+def _percent(used: int, total: int) -> float:
+    return round(100.0 * used / total, 1) if total > 0 else 0.0
+
+
+class ProcfsReader:
+    """Read sampler counters from /proc with persistent file handles.
+
+    Args:
+        channels: Channels to read (sampler.CHANNELS).
+        perdisk: Read disk counters per device rather than in total.
+        pernic: Read network counters per interface rather than in total.
+        root: procfs mount point (tests point this at a fake tree).
+        sys_block: Directory listing whole block devices; disks not in
+                   it (partitions) are left out of the totals.
+
+    Raises:
+        OSError: If a file required for the channels cannot be opened.
+    """
+
+    def __init__(
+        self,
+        channels: Iterable[str],
+        perdisk: bool = False,
+        pernic: bool = False,
+        root: str = PROCFS,
+        sys_block: str = SYS_BLOCK,
+    ):
+        self.channels = frozenset(channels)
+        self.perdisk = perdisk
+        self.pernic = pernic
+        self.sys_block = sys_block
+        self.clock_ticks = float(os.sysconf("SC_CLK_TCK"))
+        self._whole_disk: Dict[bytes, bool] = {}
+        self._files: Dict[str, _ProcFile] = {}
+        needed = {
+            "stat": bool(self.channels & {"cpu", "ctx", "runqueue"}),
+            "meminfo": bool(self.channels & {"memory", "swap"}),
+            "vmstat": "swap" in self.channels,
+            "diskstats": "disk" in self.channels,
+            "net/dev": "net" in self.channels,
+        }
+        try:
+            for name, wanted in needed.items():
+                if wanted:
+                    self._files[name] = _ProcFile(f"{root}/{name}")
+        except OSError:
+            self.close()
+            raise
+        if "pressure" in self.channels:
+            # Kernels without PSI (or with it disabled) have no
+            # /proc/pressure; the channel is then simply absent
+            for resource in PRESSURE_RESOURCES:
+                with contextlib.suppress(OSError):
+                    self._files[f"pressure/{resource}"] = _ProcFile(
+                        f"{root}/pressure/{resource}", size=256
+                    )
+
+    def close(self) -> None:
+        """Close every open file."""
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def _scan(self, name: str, pattern: "re.Pattern[bytes]") -> List[Any]:
+        f = self._files[name]
+        return pattern.findall(f.buf, 0, f.read())
+
+    def _cpu(
+        self,
+    ) -> Tuple[List[CpuTimes], Optional[CpuStats], Optional[RunQueue]]:
+        f = self._files["stat"]
+        end = f.read()
+        ticks = self.clock_ticks
+        cpus = []
+        if "cpu" in self.channels:
+            for times in _CPU_RE.findall(f.buf, 0, end):
+                values = [int(v) / ticks for v in times.split()[:10]]
+                values += [0.0] * (10 - len(values))
+                cpus.append(CpuTimes(*values))
+        stats = queue = None
+        if self.channels & {"ctx", "runqueue"}:
+            fields = {k: int(v) for k, v in _STAT_RE.findall(f.buf, 0, end)}
+            stats = CpuStats(
+                fields.get(b"ctxt", 0),
+                fields.get(b"intr", 0),
+                fields.get(b"softirq", 0),
+                0,
+            )
+            queue = RunQueue(
+                fields.get(b"procs_running", 0),
+                fields.get(b"procs_blocked", 0),
+            )
+        return cpus, stats, queue
+
+    def _memory(self) -> Tuple[VirtualMemory, SwapMemory]:
+        kb = {k: int(v) * 1024 for k, v in self._scan("meminfo", _MEMINFO_RE)}
+        total = kb.get(b"MemTotal", 0)
+        free = kb.get(b"MemFree", 0)
+        available = kb.get(b"MemAvailable", free)
+        if available > total:
+            # Containers can report host values (as psutil handles it)
+            available = free
+        vm = VirtualMemory(
+            total,
+            available,
+            _percent(total - available, total),
+            total - available,
+            free,
+        )
+        swap_total = kb.get(b"SwapTotal", 0)
+        swap_free = kb.get(b"SwapFree", 0)
+        pages = {}
+        if "vmstat" in self._files:
+            pages = {k: int(v) for k, v in self._scan("vmstat", _VMSTAT_RE)}
+        sm = SwapMemory(
+            swap_total,
+            swap_total - swap_free,
+            swap_free,
+            _percent(swap_total - swap_free, swap_total),
+            pages.get(b"pswpin", 0) * SWAP_PAGE_SIZE,
+            pages.get(b"pswpout", 0) * SWAP_PAGE_SIZE,
+        )
+        return vm, sm
+
+    def _is_whole_disk(self, name: bytes) -> bool:
+        whole = self._whole_disk.get(name)
+        if whole is None:
+            path = os.path.join(
+                self.sys_block, name.decode().replace("/", "!")
+            )
+            whole = self._whole_disk[name] = os.path.exists(path)
+        return whole
+
+    def _disks(self) -> Any:
+        rows = self._scan("diskstats", _DISKSTATS_RE)
+        if self.perdisk:
+            return {
+                row[0].decode(): _disk_io(list(map(int, row[1:])))
+                for row in rows
+            }
+        # Partitions are already counted in their disk's totals
+        whole = [row[1:] for row in rows if self._is_whole_disk(row[0])]
+        if not whole:
+            return None
+        return _disk_io([sum(map(int, column)) for column in zip(*whole)])
+
+    def _net(self) -> Any:
+        rows = self._scan("net/dev", _NET_DEV_RE)
+        if self.pernic:
+            return {
+                row[0].decode(): _net_io(list(map(int, row[1:])))
+                for row in rows
+            }
+        if not rows:
+            return None
+        columns = zip(*(row[1:] for row in rows))
+        return _net_io([sum(map(int, column)) for column in columns])
+
+    def _pressure(self) -> Dict[str, int]:
+        stalls = {}
+        for resource in PRESSURE_RESOURCES:
+            name = f"pressure/{resource}"
+            if name in self._files:
+                for kind, total in self._scan(name, _PRESSURE_RE):
+                    stalls[f"{resource}_{kind.decode()}"] = int(total)
+        return stalls
+
+    def read(self) -> Reading:
+        """Read the configured channels once.
+
+        Returns:
+            Reading whose counters match sampler.read_counters(), plus
+            ``pressure`` (cumulative stall microseconds, when available)
+            and ``runqueue``.
+        """
+        counters: Dict[str, Any] = {}
+        channels = self.channels
+        if "stat" in self._files:
+            cpus, stats, queue = self._cpu()
+            if "cpu" in channels:
+                counters["cpu"] = cpus
+            if "runqueue" in channels:
+                counters["runqueue"] = queue
+            if "ctx" in channels:
+                counters["ctx"] = stats
+        if "meminfo" in self._files:
+            vm, sm = self._memory()
+            if "memory" in channels:
+                counters["memory"] = vm
+            if "swap" in channels:
+                counters["swap"] = sm
+        if "disk" in channels:
+            counters["disk"] = self._disks()
+        if "net" in channels:
+            counters["net"] = self._net()
+        if "load" in channels:
+            counters["load"] = os.getloadavg()
+        if "pressure" in channels:
+            pressure = self._pressure()
+            if pressure:
+                counters["pressure"] = pressure
+        return Reading(
+            monotonic=time.monotonic(),
+            timestamp=datetime.now().isoformat(),
+            counters=counters,
+        )
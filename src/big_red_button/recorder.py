@@ -0,0 +1,227 @@
+"""Always-on flight recorder backed by a memory-mapped ring buffer.
+
+The ``agent`` command samples core metrics into a fixed-size file so the
+snapshot can include the minutes *before* the button was pressed. The
+file never grows: records are fixed-width binary structs written into a
+ring of ``capacity`` slots, so the agent's memory and CPU cost is small
+and constant.
+
+File layout (little-endian)::
+
+    header: magic(8s) version(I) record_size(I) capacity(I)
+            interval(d) write_count(Q)
+    records: capacity x RECORD
+"""
+
+import mmap
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .sampler import TickSampler
+
+MAGIC = b"BRBFLREC"
+VERSION = 1
+
+HEADER = struct.Struct("<8sIIIdQ")
+# Offset of write_count inside the header (updated after every record)
+_COUNT_OFFSET = HEADER.size - 8
+
+FIELDS: Tuple[str, ...] = (
+    "timestamp",
+    "cpu_percent",
+    "cpu_max_core_percent",
+    "memory_percent",
+    "swap_percent",
+    "load_1m",
+    "disk_read_bytes_per_sec",
+    "disk_write_bytes_per_sec",
+    "net_recv_bytes_per_sec",
+    "net_sent_bytes_per_sec",
+)
+RECORD = struct.Struct("<d9f")
+
+
+def file_size(capacity: int) -> int:
+    """Return the size in bytes of a recorder file.
+
+    Args:
+        capacity: Number of record slots.
+
+    Returns:
+        File size in bytes.
+    """
+    return HEADER.size + capacity * RECORD.size
+
+
+class FlightRecorder:
+    """Writer side of the flight recorder ring buffer.
+
+    Args:
+        path: Recorder file path. Created (or resized) if needed.
+        capacity: Number of record slots in the ring.
+        interval: Sampling interval in seconds, stored in the header.
+    """
+
+    def __init__(self, path: Path, capacity: int, interval: float):
+        self.path = path
+        self.capacity = capacity
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        size = file_size(capacity)
+        header = HEADER.pack(
+            MAGIC, VERSION, RECORD.size, capacity, interval, 0
+        )
+        # Start fresh if the file is missing or from another layout
+        if not path.exists() or path.stat().st_size != size:
+            with open(path, "wb") as f:
+                f.write(header)
+                f.truncate(size)
+
+        self._file = open(path, "r+b")  # noqa: SIM115
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        existing = HEADER.unpack_from(self._mm, 0)
+        if existing[:4] != (MAGIC, VERSION, RECORD.size, capacity):
+            self._mm[: HEADER.size] = header
+        else:
+            # Keep history from a previous agent run; record new interval
+            self._mm[: HEADER.size] = HEADER.pack(
+                MAGIC, VERSION, RECORD.size, capacity, interval, existing[5]
+            )
+        self._count = HEADER.unpack_from(self._mm, 0)[5]
+
+    def append(self, values: Tuple[float, ...]) -> None:
+        """Write one record, overwriting the oldest once the ring is full.
+
+        Args:
+            values: Record values in FIELDS order.
+        """
+        slot = self._count % self.capacity
+        RECORD.pack_into(self._mm, HEADER.size + slot * RECORD.size, *values)
+        # Publish the record only after it is fully written
+        self._count += 1
+        struct.pack_into("<Q", self._mm, _COUNT_OFFSET, self._count)
+
+    def close(self) -> None:
+        """Flush and close the recorder file."""
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+
+def read_recent(path: Path, seconds: float) -> Dict[str, Any]:
+    """Read the most recent records from a recorder file.
+
+    Records are decoded straight from the read-only memory map, newest
+    first, stopping at the first record older than the window, so only
+    the requested slice of the ring is touched.
+
+    Args:
+        path: Recorder file path.
+        seconds: How far back to read, in seconds.
+
+    Returns:
+        Dict with the recorder interval, capacity, the timestamp of the
+        newest record (``None`` if nothing was recorded) and the samples
+        in the window (oldest first).
+
+    Raises:
+        ValueError: If the file is not a flight recorder file, or is
+            empty, truncated or has a corrupt header.
+    """
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        if len(mm) < HEADER.size:
+            raise ValueError(f"{path} is not a flight recorder file")
+        magic, version, record_size, capacity, interval, count = (
+            HEADER.unpack_from(mm, 0)
+        )
+        if (magic, version, record_size) != (MAGIC, VERSION, RECORD.size):
+            raise ValueError(f"{path} is not a flight recorder file")
+        if capacity <= 0 or len(mm) < file_size(capacity):
+            raise ValueError(
+                f"{path} is truncated or corrupt (capacity {capacity}, "
+                f"{len(mm)} bytes)"
+            )
+
+        # Skip the oldest slot once the ring has wrapped: the agent may
+        # be overwriting it right now.
+        available = min(count, capacity - 1)
+        cutoff = time.time() - seconds
+        view = memoryview(mm)
+        samples: List[Dict[str, float]] = []
+        newest: Optional[float] = None
+        try:
+            for i in range(1, available + 1):
+                slot = (count - i) % capacity
+                values = RECORD.unpack_from(
+                    view, HEADER.size + slot * RECORD.size
+                )
+                if newest is None:
+                    newest = values[0]
+                if values[0] < cutoff:
+                    break
+                samples.append(dict(zip(FIELDS, values)))
+        finally:
+            view.release()
+
+    samples.reverse()
+    return {
+        "interval_seconds": interval,
+        "capacity": capacity,
+        "records_written": count,
+        "newest_timestamp": newest,
+        "samples": samples,
+    }
+
+
+def _record(sample: Dict[str, Any]) -> Tuple[float, ...]:
+    """Pack a TickSampler sample into record values (FIELDS order)."""
+    per_cpu = sample["cpu_percent_per_cpu"] or [0.0]
+    disk = sample["disk_io"] or {}
+    net = sample["net_io"] or {}
+    load = sample["load_avg"] or [0.0]
+    return (
+        time.time(),
+        sample["cpu_percent_overall"],
+        max(per_cpu),
+        sample["memory_percent"],
+        sample["swap_percent"],
+        load[0],
+        disk.get("read_bytes_per_sec", 0.0),
+        disk.get("write_bytes_per_sec", 0.0),
+        net.get("bytes_recv_per_sec", 0.0),
+        net.get("bytes_sent_per_sec", 0.0),
+    )
+
+
+def run_agent(
+    path: Path,
+    interval: float = 1.0,
+    capacity: int = 3600,
+    max_samples: Optional[int] = None,
+) -> None:
+    """Continuously sample core metrics into the recorder file.
+
+    Runs until interrupted, or for ``max_samples`` samples.
+
+    Args:
+        path: Recorder file path.
+        interval: Seconds between samples.
+        capacity: Number of record slots in the ring.
+        max_samples: Stop after this many samples (for testing).
+    """
+    recorder = FlightRecorder(path, capacity, interval)
+    sampler = TickSampler(
+        interval=interval,
+        channels=("cpu", "memory", "swap", "disk", "net", "load"),
+    )
+    try:
+        sampler.run(
+            max_samples,
+            on_tick=lambda _, sample: recorder.append(_record(sample)),
+        )
+    finally:
+        recorder.close()
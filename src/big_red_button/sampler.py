@@ -0,0 +1,563 @@
+"""Unified tick sampler for time-varying system counters.
+
+One loop, scheduled against a monotonic clock, reads every requested
+counter once per tick and turns cumulative counters (CPU times, disk and
+network I/O, context switches, swap-ins) into per-interval rates.
+
+Counters come from psutil or, on Linux, from the procfs backend
+(big_red_button.procfs), which keeps /proc files open and is cheap
+enough for sampling at 50-100 Hz.
+"""
+
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+import psutil
+
+CHANNELS: FrozenSet[str] = frozenset(
+    {
+        "cpu",
+        "memory",
+        "swap",
+        "disk",
+        "net",
+        "ctx",
+        "load",
+        "pressure",
+        "runqueue",
+    }
+)
+
+# Counter backends: "auto" uses procfs on Linux and psutil elsewhere
+BACKENDS = ("auto", "psutil", "procfs")
+
+# Adaptive sampling (see AdaptiveController): a sample is part of a spike
+# when overall CPU, any single core or swap-in traffic is this high...
+SPIKE_CPU_PERCENT = 80.0
+SPIKE_CORE_PERCENT = 95.0
+SPIKE_SWAP_IN_BYTES_PER_SEC = 1024 * 1024
+# ...and the machine is clearly idle when everything stays below these
+IDLE_CPU_PERCENT = 10.0
+IDLE_CORE_PERCENT = 50.0
+
+
+@dataclass
+class Reading:
+    """Raw counter values read at a single instant.
+
+    Attributes:
+        monotonic: time.monotonic() when the reading was taken.
+        timestamp: Wall-clock time as an ISO string.
+        counters: Raw psutil results keyed by channel name.
+    """
+
+    monotonic: float
+    timestamp: str
+    counters: Dict[str, Any] = field(default_factory=dict)
+
+
+def _safe(func: Callable[[], Any]) -> Any:
+    """Call a psutil function, returning None if it is unsupported."""
+    try:
+        return func()
+    except (AttributeError, NotImplementedError, OSError, RuntimeError):
+        return None
+
+
+def read_counters(
+    channels: Iterable[str] = CHANNELS,
+    perdisk: bool = False,
+    pernic: bool = False,
+) -> Reading:
+    """Read the requested counters once with psutil.
+
+    The ``pressure`` (Linux PSI stall times) and ``runqueue`` (runnable
+    and blocked task counts) channels are only read by the procfs backend
+    and are ignored here.
+
+    Args:
+        channels: Channels to read (see CHANNELS).
+        perdisk: Read disk I/O counters per disk rather than in total.
+        pernic: Read network counters per interface rather than in total.
+
+    Returns:
+        Reading with the raw counter values.
+    """
+    channels = set(channels)
+    counters: Dict[str, Any] = {}
+    if "cpu" in channels:
+        counters["cpu"] = psutil.cpu_times(percpu=True)
+    if "memory" in channels:
+        counters["memory"] = psutil.virtual_memory()
+    if "swap" in channels:
+        counters["swap"] = psutil.swap_memory()
+    if "disk" in channels:
+        counters["disk"] = _safe(
+            lambda: psutil.disk_io_counters(perdisk=perdisk)
+        )
+    if "net" in channels:
+        counters["net"] = _safe(lambda: psutil.net_io_counters(pernic=pernic))
+    if "ctx" in channels:
+        counters["ctx"] = psutil.cpu_stats()
+    if "load" in channels:
+        counters["load"] = _safe(psutil.getloadavg)
+    return Reading(
+        monotonic=time.monotonic(),
+        timestamp=datetime.now().isoformat(),
+        counters=counters,
+    )
+
+
+def _busy_and_total(times: Any) -> tuple:
+    """Split a cpu_times tuple into busy and total time.
+
+    Mirrors psutil.cpu_percent: guest time is already counted in user
+    time on Linux, and idle/iowait count as not busy.
+    """
+    total = sum(times)
+    total -= getattr(times, "guest", 0.0) + getattr(times, "guest_nice", 0.0)
+    idle = times.idle + getattr(times, "iowait", 0.0)
+    return total - idle, total
+
+
+def cpu_percents(old: List[Any], new: List[Any]) -> tuple:
+    """Compute per-CPU and overall utilization between two readings.
+
+    Args:
+        old: Earlier psutil.cpu_times(percpu=True) result.
+        new: Later psutil.cpu_times(percpu=True) result.
+
+    Returns:
+        Tuple of (per-CPU percentages, overall percentage).
+    """
+    per_cpu = []
+    busy_sum = 0.0
+    total_sum = 0.0
+    for t_old, t_new in zip(old, new):
+        busy_old, total_old = _busy_and_total(t_old)
+        busy_new, total_new = _busy_and_total(t_new)
+        busy = max(busy_new - busy_old, 0.0)
+        total = total_new - total_old
+        per_cpu.append(
+            round(min(100.0 * busy / total, 100.0), 1) if total > 0 else 0.0
+        )
+        busy_sum += busy
+        total_sum += max(total, 0.0)
+    overall = (
+        round(min(100.0 * busy_sum / total_sum, 100.0), 1)
+        if total_sum > 0
+        else 0.0
+    )
+    return per_cpu, overall
+
+
+def counter_deltas(old: Any, new: Any) -> Dict[str, float]:
+    """Return field-by-field increases between two counter tuples.
+
+    Counters that went backwards (wrapped or reset) count as zero.
+
+    Args:
+        old: Earlier psutil namedtuple.
+        new: Later psutil namedtuple of the same type.
+
+    Returns:
+        Dict mapping field name to increase.
+    """
+    return {
+        name: max(getattr(new, name) - getattr(old, name), 0)
+        for name in new._fields
+    }
+
+
+def counter_rates(old: Any, new: Any, dt: float) -> Dict[str, float]:
+    """Return per-second rates for every field of a counter tuple.
+
+    Args:
+        old: Earlier psutil namedtuple.
+        new: Later psutil namedtuple of the same type.
+        dt: Seconds between the two readings.
+
+    Returns:
+        Dict mapping ``<field>_per_sec`` to rate.
+    """
+    if dt <= 0:
+        return {f"{name}_per_sec": 0.0 for name in new._fields}
+    return {
+        f"{name}_per_sec": round(delta / dt, 3)
+        for name, delta in counter_deltas(old, new).items()
+    }
+
+
+def _keyed_rates(old: Any, new: Any, dt: float) -> Any:
+    """Rates for a counter tuple or a dict of them (perdisk/pernic)."""
+    if old is None or new is None:
+        return None
+    if isinstance(new, dict):
+        return {
+            key: counter_rates(old[key], value, dt)
+            for key, value in new.items()
+            if key in old
+        }
+    return counter_rates(old, new, dt)
+
+
+def compute_tick(prev: Reading, cur: Reading) -> Dict[str, Any]:
+    """Turn two consecutive readings into one sample.
+
+    Args:
+        prev: Reading at the start of the interval.
+        cur: Reading at the end of the interval.
+
+    Returns:
+        Dict with the interval length, gauges (memory, swap, load) at the
+        end of the interval and rates for cumulative counters.
+    """
+    dt = cur.monotonic - prev.monotonic
+    old, new = prev.counters, cur.counters
+    sample: Dict[str, Any] = {
+        "timestamp": cur.timestamp,
+        "interval_seconds": round(dt, 4),
+    }
+
+    if "cpu" in new:
+        per_cpu, overall = cpu_percents(old["cpu"], new["cpu"])
+        sample["cpu_percent_per_cpu"] = per_cpu
+        sample["cpu_percent_overall"] = overall
+    if "memory" in new:
+        vm = new["memory"]
+        sample["memory_percent"] = vm.percent
+        sample["memory_used"] = vm.used
+        sample["memory_available"] = vm.available
+    if "swap" in new:
+        sm = new["swap"]
+        sample["swap_percent"] = sm.percent
+        sample["swap_used"] = sm.used
+        if dt > 0:
+            sample["swap_in_bytes_per_sec"] = round(
+                max(sm.sin - old["swap"].sin, 0) / dt, 3
+            )
+            sample["swap_out_bytes_per_sec"] = round(
+                max(sm.sout - old["swap"].sout, 0) / dt, 3
+            )
+    if "disk" in new:
+        sample["disk_io"] = _keyed_rates(old["disk"], new["disk"], dt)
+    if "net" in new:
+        sample["net_io"] = _keyed_rates(old["net"], new["net"], dt)
+    if "ctx" in new:
+        rates = counter_rates(old["ctx"], new["ctx"], dt)
+        sample["ctx_switches_per_sec"] = rates["ctx_switches_per_sec"]
+        sample["interrupts_per_sec"] = rates["interrupts_per_sec"]
+    if "load" in new:
+        sample["load_avg"] = list(new["load"]) if new["load"] else None
+    if "runqueue" in new:
+        sample["run_queue"] = new["runqueue"].running
+        sample["blocked_tasks"] = new["runqueue"].blocked
+    if "pressure" in new and "pressure" in old and dt > 0:
+        # Cumulative stall microseconds -> percent of the interval
+        sample["pressure"] = {
+            f"{name}_percent": round(
+                max(total - old["pressure"].get(name, total), 0) / (dt * 1e4),
+                2,
+            )
+            for name, total in new["pressure"].items()
+        }
+    return sample
+
+
+def ticks(
+    interval: float,
+    count: Optional[int] = None,
+    start: Optional[float] = None,
+) -> Iterator[int]:
+    """Yield tick numbers on a drift-free schedule.
+
+    Tick ``i`` (1-based) is yielded at ``start + i * interval`` on the
+    monotonic clock, however long the caller spends on each tick.
+
+    Args:
+        interval: Seconds between ticks.
+        count: Number of ticks, or None to tick forever.
+        start: time.monotonic() the schedule starts from (default: now).
+
+    Yields:
+        Tick number, starting at 1.
+    """
+    start = time.monotonic() if start is None else start
+    i = 0
+    while count is None or i < count:
+        i += 1
+        delay = start + i * interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        yield i
+
+
+class AdaptiveController:
+    """Decide how long and how fast to sample.
+
+    Sampling normally covers the nominal window (``count`` samples of
+    ``interval`` seconds). It stops after ``min_samples`` consecutive
+    idle samples, samples ``spike_divisor`` times faster while a spike is
+    in progress, and carries on past the nominal window until a spike
+    has been calm for ``settle_seconds``. It never runs longer than
+    ``max_seconds``.
+
+    Args:
+        interval: Normal seconds between samples.
+        count: Number of samples in the nominal window.
+        max_seconds: Hard limit on sampling time (at least the nominal
+                     window).
+        min_samples: Samples taken before an idle machine stops early.
+        spike_divisor: Interval divisor while a spike is in progress.
+        settle_seconds: Calm time that ends a spike (default: two normal
+                        intervals).
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        count: int,
+        max_seconds: float,
+        min_samples: int = 3,
+        spike_divisor: float = 4.0,
+        settle_seconds: Optional[float] = None,
+    ):
+        self.interval = interval
+        self.nominal_seconds = count * interval
+        self.max_seconds = max(max_seconds, self.nominal_seconds)
+        self.min_samples = min_samples
+        self.spike_interval = interval / spike_divisor
+        self.settle_seconds = (
+            2 * interval if settle_seconds is None else settle_seconds
+        )
+        self.elapsed = 0.0
+        self.samples = 0
+        self.spike_seconds = 0.0
+        self.stop_reason: Optional[str] = None
+        self._calm = 0.0
+        self._idle_run = 0
+        self._spiked = False
+
+    @staticmethod
+    def is_spike(sample: Dict[str, Any]) -> bool:
+        """Check whether a sample is part of a spike."""
+        return (
+            sample.get("cpu_percent_overall", 0.0) >= SPIKE_CPU_PERCENT
+            or max(sample.get("cpu_percent_per_cpu") or [0.0])
+            >= SPIKE_CORE_PERCENT
+            or sample.get("swap_in_bytes_per_sec", 0.0)
+            >= SPIKE_SWAP_IN_BYTES_PER_SEC
+        )
+
+    @staticmethod
+    def is_idle(sample: Dict[str, Any]) -> bool:
+        """Check whether a sample shows a clearly idle machine."""
+        return (
+            sample.get("cpu_percent_overall", 100.0) < IDLE_CPU_PERCENT
+            and max(sample.get("cpu_percent_per_cpu") or [0.0])
+            < IDLE_CORE_PERCENT
+            and not sample.get("swap_in_bytes_per_sec")
+        )
+
+    def next_interval(self, sample: Dict[str, Any]) -> Optional[float]:
+        """Account for a sample and choose the next interval.
+
+        Args:
+            sample: The sample just taken (from compute_tick()).
+
+        Returns:
+            Seconds until the next sample, or None to stop (the reason is
+            left in ``stop_reason``).
+        """
+        dt = sample.get("interval_seconds", self.interval)
+        self.elapsed += dt
+        self.samples += 1
+        if self.is_spike(sample):
+            self._spiked = True
+            self.spike_seconds += dt
+            self._calm = 0.0
+        else:
+            self._calm += dt
+        self._idle_run = self._idle_run + 1 if self.is_idle(sample) else 0
+        in_spike = self._spiked and self._calm < self.settle_seconds
+
+        if self.elapsed >= self.max_seconds - 1e-6:
+            self.stop_reason = "max_seconds"
+        elif self._idle_run >= self.min_samples:
+            self.stop_reason = "idle"
+        elif in_spike:
+            return self.spike_interval
+        elif self.elapsed >= self.nominal_seconds - 1e-6:
+            self.stop_reason = (
+                "settled"
+                if self._spiked and self.elapsed > self.nominal_seconds
+                else "count"
+            )
+        else:
+            return self.interval
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        """Describe how sampling went, for the collector output."""
+        return {
+            "stop_reason": self.stop_reason,
+            "samples": self.samples,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "nominal_seconds": round(self.nominal_seconds, 3),
+            "max_seconds": round(self.max_seconds, 3),
+            "spike_seconds": round(self.spike_seconds, 3),
+        }
+
+
+class TickSampler:
+    """Sample counters at a fixed interval without drift.
+
+    Tick ``i`` is scheduled at ``start + i * interval`` on the monotonic
+    clock, so time spent reading and processing counters does not push
+    later ticks back.
+
+    Args:
+        interval: Seconds between ticks.
+        channels: Channels to read on every tick (see CHANNELS).
+        perdisk: Read disk I/O counters per disk.
+        pernic: Read network counters per interface.
+        backend: Counter backend (see BACKENDS). "auto" falls back to
+                 psutil when /proc cannot be read.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        channels: Iterable[str] = CHANNELS,
+        perdisk: bool = False,
+        pernic: bool = False,
+        backend: str = "auto",
+    ):
+        unknown = set(channels) - CHANNELS
+        if unknown:
+            raise ValueError(f"Unknown channels: {', '.join(sorted(unknown))}")
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown sampler backend {backend!r} "
+                f"(expected one of: {', '.join(BACKENDS)})"
+            )
+        self.interval = interval
+        self.channels = frozenset(channels)
+        self.perdisk = perdisk
+        self.pernic = pernic
+        self.backend = backend
+        self._reader: Any = None
+
+    def _open(self) -> Any:
+        """Open the procfs reader, or return None to use psutil."""
+        if self.backend == "psutil" or (
+            self.backend == "auto" and not sys.platform.startswith("linux")
+        ):
+            return None
+        from .procfs import ProcfsReader
+
+        try:
+            return ProcfsReader(self.channels, self.perdisk, self.pernic)
+        except OSError:
+            if self.backend == "procfs":
+                raise
+            return None
+
+    def read(self) -> Reading:
+        """Read this sampler's channels once.
+
+        Returns:
+            Reading with the raw counter values.
+        """
+        if self._reader is None:
+            self._reader = self._open() or False
+        if self._reader:
+            return self._reader.read()
+        return read_counters(self.channels, self.perdisk, self.pernic)
+
+    def close(self) -> None:
+        """Release the backend's open files (read() reopens them)."""
+        if self._reader:
+            self._reader.close()
+        self._reader = None
+
+    def run(
+        self,
+        count: Optional[int] = None,
+        on_tick: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Sample ``count`` intervals (forever if None).
+
+        Args:
+            count: Number of ticks to sample, or None to run until
+                   interrupted (samples are then not accumulated).
+            on_tick: Optional callback receiving (tick index, sample).
+
+        Returns:
+            List of samples (empty when count is None).
+        """
+        samples: List[Dict[str, Any]] = []
+        try:
+            prev = self.read()
+            for i in ticks(self.interval, count, start=prev.monotonic):
+                cur = self.read()
+                sample = compute_tick(prev, cur)
+                prev = cur
+                if count is not None:
+                    samples.append(sample)
+                if on_tick is not None:
+                    on_tick(i - 1, sample)
+        finally:
+            self.close()
+        return samples
+
+    def run_adaptive(
+        self,
+        controller: AdaptiveController,
+        on_tick: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Sample until the controller says to stop.
+
+        Each sample is scheduled one controller-chosen interval after
+        the previous one's scheduled time, so the schedule does not drift
+        when the interval changes.
+
+        Args:
+            controller: Chooses each interval and when to stop.
+            on_tick: Optional callback receiving (tick index, sample).
+
+        Returns:
+            List of samples (``interval_seconds`` varies).
+        """
+        samples: List[Dict[str, Any]] = []
+        try:
+            prev = self.read()
+            due = prev.monotonic
+            interval: Optional[float] = controller.interval
+            while interval is not None:
+                due += interval
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                cur = self.read()
+                sample = compute_tick(prev, cur)
+                prev = cur
+                samples.append(sample)
+                if on_tick is not None:
+                    on_tick(len(samples) - 1, sample)
+                interval = controller.next_interval(sample)
+        finally:
+            self.close()
+        return samples
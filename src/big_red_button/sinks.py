@@ -0,0 +1,154 @@
+"""Snapshot sinks: where collector output is written.
+
+A sink receives each file of a snapshot as soon as it is produced.
+ZipSink serializes JSON straight into the archive's compressor, so there
+is no write-read-compress round trip through a directory (which doubles
+the I/O on a network ``snapshot_root``) and no uncompressed copy of a
+collector's output is ever built. DirectorySink keeps the plain
+directory layout for debugging.
+"""
+
+from pathlib import Path
+from typing import Any, Optional
+
+from .archive import ArchiveCodec, ArchiveWriter
+from .utils import write_json, write_text
+
+
+class SnapshotSink:
+    """Base class for snapshot destinations.
+
+    Args:
+        root: Directory the snapshot is created in.
+        name: Snapshot name (directory name / archive base name).
+    """
+
+    def __init__(self, root: Path, name: str):
+        self.root = root
+        self.name = name
+        self.path = root / name
+
+    def write_json(self, filename: str, data: Any) -> None:
+        """Serialize data as JSON into the snapshot.
+
+        Args:
+            filename: File name inside the snapshot.
+            data: Data to serialize to JSON.
+        """
+        raise NotImplementedError
+
+    def write_text(self, filename: str, text: str) -> None:
+        """Write a text file into the snapshot.
+
+        Args:
+            filename: File name inside the snapshot.
+            text: Text content to write.
+        """
+        raise NotImplementedError
+
+    def close(self) -> Path:
+        """Finish the snapshot.
+
+        Returns:
+            Path to the finished snapshot (directory or archive).
+        """
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        """Discard a partially written snapshot."""
+
+
+class DirectorySink(SnapshotSink):
+    """Write snapshot files into a plain directory (debug mode)."""
+
+    def __init__(self, root: Path, name: str):
+        super().__init__(root, name)
+        self.path.mkdir(parents=True, exist_ok=False)
+
+    def write_json(self, filename: str, data: Any) -> None:
+        write_json(self.path / filename, data)
+
+    def write_text(self, filename: str, text: str) -> None:
+        write_text(self.path / filename, text)
+
+    def close(self) -> Path:
+        return self.path
+
+
+class ZipSink(SnapshotSink):
+    """Stream snapshot files directly into a ZIP archive.
+
+    Members are compressed in the background as they arrive (see
+    archive.ArchiveWriter) and the archive is written under a
+    ``.partial`` name and renamed when closed, so a shared snapshot_root
+    never contains a truncated ZIP. Members keep the directory layout
+    (``<name>/<file>``) of zip_snapshot().
+
+    Args:
+        root: Directory the snapshot is created in.
+        name: Snapshot name (archive base name).
+        codec: Compression codec for the archive members.
+    """
+
+    def __init__(
+        self, root: Path, name: str, codec: Optional[ArchiveCodec] = None
+    ):
+        super().__init__(root, name)
+        root.mkdir(parents=True, exist_ok=True)
+        self.path = root / f"{name}.zip"
+        if self.path.exists():
+            raise FileExistsError(self.path)
+        self._partial = root / f"{name}.zip.partial"
+        self._writer = ArchiveWriter(self._partial, codec)
+
+    def _arcname(self, filename: str) -> str:
+        return f"{self.name}/{filename}"
+
+    def write_json(self, filename: str, data: Any) -> None:
+        self._writer.add_json(self._arcname(filename), data)
+
+    def write_text(self, filename: str, text: str) -> None:
+        self._writer.add_text(self._arcname(filename), text)
+
+    def close(self) -> Path:
+        try:
+            self._writer.close()
+        except BaseException:
+            self._partial.unlink(missing_ok=True)
+            raise
+        self._partial.replace(self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._writer.abort()
+        self._partial.unlink(missing_ok=True)
+
+
+def open_sink(
+    root: Path,
+    name: str,
+    fmt: str = "zip",
+    codec: Optional[ArchiveCodec] = None,
+) -> SnapshotSink:
+    """Create a sink for a new snapshot.
+
+    Args:
+        root: Directory the snapshot is created in.
+        name: Snapshot name.
+        fmt: "zip" to stream into an archive, or "directory" to write a
+             plain directory (zipped afterwards by the CLI).
+        codec: Compression codec for ZIP archives.
+
+    Returns:
+        The sink.
+
+    Raises:
+        ValueError: If fmt is not a known format.
+    """
+    if fmt == "zip":
+        return ZipSink(root, name, codec)
+    if fmt == "directory":
+        return DirectorySink(root, name)
+    raise ValueError(
+        f"Unknown snapshot_format {fmt!r}; use 'zip' or 'directory'"
+    )
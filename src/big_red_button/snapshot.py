@@ -2,16 +2,24 @@
 
 import platform
 import subprocess  # nosec B404
-import textwrap
-import webbrowser
-import zipfile
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote
 
-from . import collectors
-from .utils import write_json, write_text
+from . import capabilities
+from .archive import ArchiveCodec, ArchiveWriter, codec_from_config
+from .collectors import registry
+from .engine import (
+    CollectorResult,
+    plan_schedule,
+    process_usage,
+    run_collectors,
+)
+from .priority import apply_low_impact
+from .sinks import SnapshotSink, open_sink
+from .utils import set_subprocess_limit
 
 
 def prompt_user_context() -> Dict[str, Any]:
@@ -91,133 +99,243 @@ def prompt_user_context() -> Dict[str, Any]:
     }
 
 
-def create_snapshot(config: Dict[str, Any]) -> Path:
+def create_snapshot(
+    config: Dict[str, Any], user_context: Optional[Dict[str, Any]] = None
+) -> Path:
     """Create a complete performance snapshot.
 
+    The collectors run are chosen by the configured profile (see
+    collectors.registry) and scheduled to meet its target duration.
+    Output is streamed straight into a ZIP archive, or written to a
+    plain directory when ``snapshot_format`` is "directory".
+
     Args:
         config: Configuration dict.
+        user_context: Context to record instead of prompting the user
+                      (for unattended snapshots, e.g. from watch mode).
 
     Returns:
-        Path to the snapshot directory.
+        Path to the snapshot ZIP archive, or to the snapshot directory
+        in directory mode.
     """
+    caps = capabilities.configure(config, reprobe=config.get("reprobe", False))
     snapshot_root = Path(config["snapshot_root"])
-    snapshot_root.mkdir(parents=True, exist_ok=True)
-
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    snap_dir = snapshot_root / f"support_snapshot_{timestamp}"
-    snap_dir.mkdir(parents=True, exist_ok=False)
+    sink = open_sink(
+        snapshot_root,
+        f"support_snapshot_{timestamp}",
+        config.get("snapshot_format", "zip"),
+        codec_from_config(config),
+    )
 
     print()
-    print(f"Creating snapshot in: {snap_dir}")
+    print(f"Creating snapshot in: {sink.path}")
     print()
 
-    # Collect all data
-    print("Collecting system info...")
-    write_json(snap_dir / "system_info.json", collectors.collect_system_info())
+    try:
+        _collect_into(sink, config, user_context)
+    except BaseException:
+        sink.abort()
+        raise
+    finally:
+        caps.save()
 
-    print("Collecting CPU and memory info...")
-    write_json(
-        snap_dir / "cpu_memory.json",
-        collectors.collect_cpu_memory(
-            config["cpu_sample_count"], config["cpu_sample_interval"]
-        ),
-    )
+    print()
+    print("Snapshot collection complete!")
+    return sink.close()
 
-    print("Collecting disk info...")
-    write_json(snap_dir / "disks.json", collectors.collect_disks())
 
-    print("Collecting network info...")
-    write_json(
-        snap_dir / "network.json",
-        collectors.collect_network(config.get("storage_hosts", [])),
-    )
+def _tool_usage(
+    before: Dict[str, Any], duration: float, results: List[CollectorResult]
+) -> Dict[str, Any]:
+    """Summarize what the snapshot tool itself cost the machine.
 
-    print("Collecting process info...")
-    write_json(
-        snap_dir / "processes.json",
-        collectors.collect_processes(config["max_processes"]),
+    Args:
+        before: process_usage() taken when collection started.
+        duration: Collection wall time in seconds.
+        results: Collector results.
+
+    Returns:
+        Dict with the CPU time used during collection (also as a
+        percentage of one core), memory, thread and subprocess counts.
+    """
+    after = process_usage()
+    cpu = (after["cpu_user_seconds"] - before["cpu_user_seconds"]) + (
+        after["cpu_system_seconds"] - before["cpu_system_seconds"]
     )
+    return {
+        "cpu_seconds": round(cpu, 3),
+        "cpu_percent_of_one_core": (
+            round(100.0 * cpu / duration, 1) if duration > 0 else None
+        ),
+        "rss_bytes": after["rss_bytes"],
+        "peak_rss_bytes": after["peak_rss_bytes"],
+        "threads": after["threads"],
+        "subprocesses": sum(r.subprocesses or 0 for r in results),
+    }
 
-    print("Collecting GPU info...")
-    write_json(snap_dir / "gpu_info.json", collectors.collect_gpu_info())
 
-    print("Collecting temperature info...")
-    write_json(
-        snap_dir / "temperatures.json", collectors.collect_temperatures()
-    )
+def _collect_into(
+    sink: SnapshotSink,
+    config: Dict[str, Any],
+    user_context: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Run the collectors and write every snapshot file into a sink.
 
-    print("Detecting foreground app...")
-    write_json(
-        snap_dir / "foreground_app.json", collectors.collect_foreground_app()
-    )
+    Args:
+        sink: Destination for the snapshot files.
+        config: Configuration dict.
+        user_context: Context to record; the user is prompted if None.
+    """
 
-    print("Detecting installed applications...")
-    write_json(
-        snap_dir / "installed_apps.json", collectors.detect_installed_apps()
+    # Collect all data concurrently; each collector's output is written
+    # as soon as it finishes.
+    profile = registry.get_profile(
+        config.get("profile", registry.DEFAULT_PROFILE), config
     )
-
-    # User context
-    user_context = prompt_user_context()
-    write_json(snap_dir / "user_context.json", user_context)
-
-    # Create README
-    readme = (
-        textwrap.dedent(f"""
-        Performance Snapshot
-        ====================
-
-        Studio: {config['studio_name']}
-        Created: {datetime.now().isoformat()}
-        Host: {platform.node()}
-        Platform: {platform.system()} {platform.release()}
-
-        Files:
-          - system_info.json        : OS, hardware, timestamps, boot time
-          - cpu_memory.json         : CPU samples, per-core usage, RAM, swap
-          - disks.json              : Mounted volumes, usage, I/O counters
-          - network.json            : NICs, throughput, storage host checks
-          - processes.json          : Top processes by CPU and memory
-          - gpu_info.json           : GPU utilization, VRAM, temperature
-          - temperatures.json       : System temperature sensors
-          - foreground_app.json     : Active application at capture time
-          - installed_apps.json     : Detected creative applications
-          - user_context.json       : User description of issue
-
-        Triage Steps:
-          1. Check user_context.json for user's description and app
-          2. Review cpu_memory.json for CPU/RAM saturation or spikes
-          3. Check processes.json for runaway processes
-          4. Review gpu_info.json for GPU throttling or VRAM issues
-          5. Check temperatures.json for thermal throttling
-          6. Review disks.json for storage capacity or I/O bottlenecks
-          7. Check network.json for storage connectivity issues
-
-    """).strip()
-        + "\n"
+    run_config = profile.apply(config)
+    specs, skipped = registry.select_collectors(profile, platform.system())
+    schedule = plan_schedule(specs, run_config, profile.target_seconds)
+
+    print(
+        f"Collecting system info ({profile.name} profile, "
+        f"{len(schedule.tasks)} collectors, "
+        f"~{schedule.estimated_seconds:.0f}s)..."
+    )
+    # Priorities are inherited by threads started afterwards, so lower
+    # them before the collector pool exists
+    low_impact = apply_low_impact(config) if config.get("low_impact") else None
+    collection_started = datetime.now().isoformat()
+    usage_before = process_usage()
+    t0 = time.perf_counter()
+    try:
+        results = run_collectors(
+            schedule.tasks,
+            max_workers=schedule.max_workers,
+            on_result=lambda r: sink.write_json(r.filename, r.data),
+        )
+    finally:
+        set_subprocess_limit(None)
+    duration = time.perf_counter() - t0
+    sink.write_json(
+        "collection_meta.json",
+        {
+            "profile": profile.name,
+            "target_seconds": schedule.target_seconds,
+            "estimated_seconds": round(schedule.estimated_seconds, 3),
+            "max_workers": schedule.max_workers,
+            "started": collection_started,
+            "finished": datetime.now().isoformat(),
+            "duration_seconds": round(duration, 3),
+            "collectors": {r.name: r.timing() for r in results},
+            "tool_usage": _tool_usage(usage_before, duration, results),
+            "low_impact": low_impact,
+            "skipped_unsupported": skipped,
+            "capabilities": capabilities.get_cache().entries(),
+        },
     )
-    write_text(snap_dir / "README.txt", readme)
 
-    print()
-    print("Snapshot collection complete!")
-    return snap_dir
+    # User context
+    if user_context is None:
+        user_context = prompt_user_context()
+    sink.write_json("user_context.json", user_context)
+
+    # Create README listing the files this profile actually wrote
+    written = {r.filename for r in results}
+    files = [
+        (spec.filename, spec.description)
+        for spec in specs
+        if spec.filename in written
+    ]
+    files += [
+        ("user_context.json", "User description of issue"),
+        ("collection_meta.json", "Per-collector timings and tool overhead"),
+    ]
+    readme = _readme_text(config["studio_name"], files)
+    sink.write_text("README.txt", readme)
+
+
+# Triage steps, shown only when the snapshot contains their file
+_TRIAGE_STEPS = [
+    (
+        "user_context.json",
+        "Check user_context.json for user's description and app",
+    ),
+    (
+        "cpu_memory.json",
+        "Review cpu_memory.json for CPU/RAM saturation or spikes",
+    ),
+    (
+        "flight_recorder.json",
+        "Check flight_recorder.json for load before the button was pressed",
+    ),
+    (
+        "burst.json",
+        "Check burst.json for micro-stutters (stalls under 100 ms)",
+    ),
+    ("processes.json", "Check processes.json for runaway processes"),
+    (
+        "gpu_info.json",
+        "Review gpu_info.json for GPU throttling or VRAM issues",
+    ),
+    ("temperatures.json", "Check temperatures.json for thermal throttling"),
+    (
+        "disks.json",
+        "Review disks.json for storage capacity or I/O bottlenecks",
+    ),
+    ("network.json", "Check network.json for storage connectivity issues"),
+]
+
+
+def _readme_text(studio_name: str, files: List[Tuple[str, str]]) -> str:
+    """Build the snapshot README.
 
+    Args:
+        studio_name: Studio name from the configuration.
+        files: (file name, description) of every file in the snapshot.
 
-def zip_snapshot(snap_dir: Path) -> Path:
-    """Create a ZIP archive of the snapshot directory.
+    Returns:
+        README text listing the files and the triage steps that apply.
+    """
+    names = {name for name, _ in files}
+    steps = [text for name, text in _TRIAGE_STEPS if name in names]
+    lines = [
+        "Performance Snapshot",
+        "====================",
+        "",
+        f"Studio: {studio_name}",
+        f"Created: {datetime.now().isoformat()}",
+        f"Host: {platform.node()}",
+        f"Platform: {platform.system()} {platform.release()}",
+        "",
+        "Files:",
+        *(f"  - {name:<24}: {description}" for name, description in files),
+        "",
+        'Triage Steps (automated by "big-red-button analyze <snapshot>"):',
+        *(f"  {i}. {text}" for i, text in enumerate(steps, 1)),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def zip_snapshot(snap_dir: Path, codec: Optional[ArchiveCodec] = None) -> Path:
+    """Create a ZIP archive of a snapshot directory (directory mode).
+
+    Files are compressed in parallel (see archive.ArchiveWriter).
 
     Args:
         snap_dir: Path to snapshot directory.
+        codec: Compression codec (default: deflate at its default level).
 
     Returns:
         Path to created ZIP file.
     """
     print("Creating ZIP archive...")
     zip_path = snap_dir.parent / f"{snap_dir.name}.zip"
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        for path in snap_dir.rglob("*"):
-            if path.is_file():
-                zf.write(path, arcname=path.relative_to(snap_dir.parent))
-    return zip_path
+    writer = ArchiveWriter(zip_path, codec)
+    for path in sorted(snap_dir.rglob("*")):
+        if path.is_file():
+            writer.add_file(path.relative_to(snap_dir.parent).as_posix(), path)
+    return writer.close()
 
 
 def reveal_in_file_manager(path: Path) -> None:
@@ -235,6 +353,13 @@ def reveal_in_file_manager(path: Path) -> None:
         print(f"Please locate this file manually: {path}")
 
 
+def _open_in_browser(url: str) -> None:
+    # webbrowser is slow to import and only needed as a fallback
+    import webbrowser
+
+    webbrowser.open(url)
+
+
 def open_email_draft(zip_path: Path, config: Dict[str, Any]) -> None:
     """Open default email client with pre-filled support email.
 
@@ -267,17 +392,17 @@ def open_email_draft(zip_path: Path, config: Dict[str, Any]) -> None:
             subprocess.run(["xdg-open", mailto_link], check=True)  # nosec B603, B607
         else:
             # Fallback for other systems or if specific commands fail
-            webbrowser.open(mailto_link)
+            _open_in_browser(mailto_link)
     except subprocess.CalledProcessError as e:
         print(f"Error opening mail client: {e}")
         print("Attempting fallback with webbrowser module...")
-        webbrowser.open(mailto_link)
+        _open_in_browser(mailto_link)
     except FileNotFoundError:
         print(
             "Mail client command not found. Attempting fallback with webbrowser module..."
         )
-        webbrowser.open(mailto_link)
+        _open_in_browser(mailto_link)
     except Exception as e:
         print(f"An unexpected error occurred while opening mail client: {e}")
         print("Attempting fallback with webbrowser module...")
-        webbrowser.open(mailto_link)
+        _open_in_browser(mailto_link)
@@ -0,0 +1,149 @@
+"""Startup profiling for ``big-red-button --profile-startup``.
+
+A fresh interpreter is started with ``-X importtime`` and walks the
+snapshot command's startup path: import the CLI, print the first line,
+then import the snapshot modules and the profile's collectors. The
+parent times the first and last line of output and parses the per-module
+import times from the child's stderr.
+"""
+
+import os
+import re
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Child side of the probe; kept self-contained so the profiler's own
+# imports do not show up in the measurements
+_PROBE = """
+import platform
+import sys
+
+from big_red_button import cli
+
+print("first output", flush=True)
+
+from big_red_button import archive, snapshot
+from big_red_button.collectors import registry
+
+profile = registry.PROFILES.get(sys.argv[1]) or registry.PROFILES[
+    registry.DEFAULT_PROFILE
+]
+for spec in registry.select_collectors(profile, platform.system())[0]:
+    spec.load()
+print("ready", flush=True)
+"""
+
+_IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Parse ``python -X importtime`` output.
+
+    Args:
+        output: The interpreter's stderr.
+
+    Returns:
+        One dict per imported module, in import order, with name,
+        self_ms, cumulative_ms and depth (0 for top-level imports).
+    """
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORT_TIME_RE.match(line)
+        if match:
+            modules.append(
+                {
+                    "name": match.group(4),
+                    "self_ms": int(match.group(1)) / 1000.0,
+                    "cumulative_ms": int(match.group(2)) / 1000.0,
+                    "depth": (len(match.group(3)) - 1) // 2,
+                }
+            )
+    return modules
+
+
+def profile_startup(
+    profile: Optional[str] = None, top: int = 15
+) -> Dict[str, Any]:
+    """Measure how quickly the snapshot command starts.
+
+    Args:
+        profile: Collection profile whose collectors are loaded (default:
+                 the default profile).
+        top: Number of slowest modules to report.
+
+    Returns:
+        Dict with first_output_ms (process start to the CLI's first
+        line), ready_ms (until the profile's collectors are imported),
+        import_ms (total import time), module_count and the slowest
+        modules by self time.
+
+    Raises:
+        RuntimeError: If the probe process fails.
+    """
+    env = dict(os.environ)
+    src = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (src, env.get("PYTHONPATH")) if p
+    )
+    cmd = [sys.executable, "-X", "importtime", "-c", _PROBE, profile or ""]
+
+    # stderr goes to a file: importtime output can fill a pipe before the
+    # child writes its first line
+    with tempfile.TemporaryFile(mode="w+") as err:
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(  # nosec B603
+            cmd, stdout=subprocess.PIPE, stderr=err, text=True, env=env
+        )
+        out = proc.stdout
+        if out is None:
+            raise RuntimeError("Startup probe has no stdout")
+        out.readline()
+        first = time.perf_counter() - t0
+        out.readline()
+        ready = time.perf_counter() - t0
+        out.read()
+        returncode = proc.wait()
+        err.seek(0)
+        stderr = err.read()
+
+    if returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{stderr[-2000:]}")
+
+    modules = parse_importtime(stderr)
+    return {
+        "first_output_ms": round(first * 1000, 1),
+        "ready_ms": round(ready * 1000, 1),
+        "import_ms": round(sum(m["self_ms"] for m in modules), 1),
+        "module_count": len(modules),
+        "slowest_modules": sorted(
+            modules, key=lambda m: m["self_ms"], reverse=True
+        )[:top],
+    }
+
+
+def format_startup(report: Dict[str, Any]) -> str:
+    """Render a startup profile as plain text.
+
+    Args:
+        report: Result of profile_startup().
+
+    Returns:
+        Human-readable report.
+    """
+    lines = [
+        f"Time to first output: {report['first_output_ms']:.0f} ms",
+        f"Time to collectors loaded: {report['ready_ms']:.0f} ms",
+        f"Imports: {report['module_count']} modules, "
+        f"{report['import_ms']:.0f} ms",
+        "",
+        f"{'self ms':>8} {'cumul. ms':>9}  module",
+    ]
+    for m in report["slowest_modules"]:
+        lines.append(
+            f"{m['self_ms']:8.1f} {m['cumulative_ms']:9.1f}  {m['name']}"
+        )
+    return "\n".join(lines) + "\n"
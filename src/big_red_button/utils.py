@@ -1,14 +1,68 @@
 """Utility functions for the Big Red Button tool."""
 
+import contextlib
 import json
 import subprocess  # nosec B404
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import capabilities
+
+# Per-thread count of spawned subprocesses (collectors run one per thread)
+_spawns = threading.local()
+
+
+def note_subprocess() -> None:
+    """Count a subprocess spawned by the current thread."""
+    _spawns.count = getattr(_spawns, "count", 0) + 1
+
+
+# Limits concurrent subprocesses in low-impact mode (None: unlimited)
+_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def set_subprocess_limit(limit: Optional[int]) -> None:
+    """Limit how many subprocesses the tool runs at once.
+
+    Args:
+        limit: Maximum concurrent subprocesses, or None for no limit.
+    """
+    global _slots
+    _slots = threading.BoundedSemaphore(limit) if limit else None
+
+
+def subprocess_slots() -> Optional[threading.BoundedSemaphore]:
+    """Return the subprocess limit semaphore, or None if unlimited."""
+    return _slots
+
+
+@contextlib.contextmanager
+def subprocess_slot() -> Iterator[None]:
+    """Hold one subprocess slot (a no-op when there is no limit)."""
+    slots = _slots
+    if slots is None:
+        yield
+        return
+    with slots:
+        yield
+
+
+def subprocess_count() -> int:
+    """Return how many subprocesses the current thread has spawned.
+
+    Returns:
+        Running total for this thread; callers take differences.
+    """
+    count: int = getattr(_spawns, "count", 0)
+    return count
 
 
 def safe_run(cmd: List[str], timeout: int = 5) -> Dict[str, Any]:
     """Run a command and capture stdout/stderr without raising exceptions.
 
+    Commands the capability cache knows to be missing are not spawned.
+
     Args:
         cmd: Command and arguments as a list.
         timeout: Maximum time in seconds to wait for command.
@@ -16,13 +70,23 @@ def safe_run(cmd: List[str], timeout: int = 5) -> Dict[str, Any]:
     Returns:
         Dict with keys: cmd, returncode, stdout, stderr.
     """
+    if not capabilities.available(cmd[0]):
+        return {
+            "cmd": cmd,
+            "returncode": None,
+            "stdout": "",
+            "stderr": f"ERROR running {cmd!r}: {cmd[0]} is not available "
+            "(capability cache)",
+        }
+    note_subprocess()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )  # nosec B603
+        with subprocess_slot():
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )  # nosec B603
         return {
             "cmd": cmd,
             "returncode": result.returncode,
@@ -41,14 +105,15 @@ def safe_run(cmd: List[str], timeout: int = 5) -> Dict[str, Any]:
 def write_json(path: Path, data: Any) -> None:
     """Write data to a JSON file.
 
+    The JSON is encoded incrementally into the file rather than built as
+    one string in memory.
+
     Args:
         path: Destination file path.
         data: Data to serialize to JSON.
     """
-    path.write_text(
-        json.dumps(data, indent=2, sort_keys=True, default=str),
-        encoding="utf-8",
-    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True, default=str)
 
 
 def write_text(path: Path, data: str) -> None:
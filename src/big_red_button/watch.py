@@ -0,0 +1,429 @@
+"""Watch mode: take snapshots automatically when thresholds are crossed.
+
+Incidents during unattended renders happen when nobody is there to press
+the button. The watcher samples a few cheap counters once per interval,
+evaluates rules such as ``core_max_percent > 95 for 10s`` against them
+and runs the snapshot pipeline when a rule has held long enough.
+
+Cost does not grow with the number of rules: one sampler reading per
+tick serves every rule, only the channels the rules use are read, each
+metric is extracted once per tick however many rules refer to it, and
+storage hosts are probed on a slower cadence in a background thread.
+Evaluating a rule is then a single comparison.
+"""
+
+import re
+import threading
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .sampler import TickSampler, compute_tick
+
+
+def _core_max(sample: Dict[str, Any]) -> Optional[float]:
+    per_cpu = sample.get("cpu_percent_per_cpu")
+    return max(per_cpu) if per_cpu else None
+
+
+def _load_1(sample: Dict[str, Any]) -> Optional[float]:
+    load = sample.get("load_avg")
+    return load[0] if load else None
+
+
+def _nested(key: str, field: str) -> Callable[[Dict[str, Any]], Any]:
+    return lambda sample: (sample.get(key) or {}).get(field)
+
+
+def _flat(key: str) -> Callable[[Dict[str, Any]], Any]:
+    return lambda sample: sample.get(key)
+
+
+# Metric name -> (sampler channel, extractor from a compute_tick sample)
+METRICS: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Any]]] = {
+    "cpu_percent": ("cpu", _flat("cpu_percent_overall")),
+    "core_max_percent": ("cpu", _core_max),
+    "memory_percent": ("memory", _flat("memory_percent")),
+    "swap_percent": ("swap", _flat("swap_percent")),
+    "swap_in_bytes_per_sec": ("swap", _flat("swap_in_bytes_per_sec")),
+    "load_1": ("load", _load_1),
+    "run_queue": ("runqueue", _flat("run_queue")),
+    "disk_read_bytes_per_sec": (
+        "disk",
+        _nested("disk_io", "read_bytes_per_sec"),
+    ),
+    "disk_write_bytes_per_sec": (
+        "disk",
+        _nested("disk_io", "write_bytes_per_sec"),
+    ),
+    "net_recv_bytes_per_sec": ("net", _nested("net_io", "bytes_recv_per_sec")),
+    "net_sent_bytes_per_sec": ("net", _nested("net_io", "bytes_sent_per_sec")),
+    "cpu_pressure_percent": (
+        "pressure",
+        _nested("pressure", "cpu_some_percent"),
+    ),
+    "memory_pressure_percent": (
+        "pressure",
+        _nested("pressure", "memory_some_percent"),
+    ),
+    "io_pressure_percent": (
+        "pressure",
+        _nested("pressure", "io_some_percent"),
+    ),
+}
+# Number of configured storage hosts failing their last probe; updated by
+# the storage monitor rather than the sampler
+STORAGE_METRIC = "storage_unreachable"
+
+_OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+}
+_RULE_RE = re.compile(
+    r"^\s*(\w+)\s*(>=|<=|>|<)\s*(-?[\d.]+)"
+    r"(?:\s+for\s+([\d.]+)\s*s?)?\s*$"
+)
+
+
+class Rule(NamedTuple):
+    """A threshold on one metric that must hold for a number of seconds.
+
+    Attributes:
+        text: The rule as written in the configuration.
+        metric: Metric name (see METRICS and STORAGE_METRIC).
+        op: Comparison operator (> >= < <=).
+        threshold: Value the metric is compared against.
+        seconds: How long the condition must hold before the rule fires.
+    """
+
+    text: str
+    metric: str
+    op: str
+    threshold: float
+    seconds: float
+
+
+def parse_rule(text: str, default_seconds: float = 0.0) -> Rule:
+    """Parse a rule like ``core_max_percent > 95 for 10s``.
+
+    Args:
+        text: Rule expression: ``<metric> <op> <value> [for <seconds>]``.
+        default_seconds: Hold time when the rule has no ``for`` clause.
+
+    Returns:
+        The parsed rule.
+
+    Raises:
+        ValueError: If the expression or metric name is invalid.
+    """
+    match = _RULE_RE.match(text)
+    names = list(METRICS) + [STORAGE_METRIC]
+    if not match or match.group(1) not in names:
+        raise ValueError(
+            f"Invalid watch rule {text!r}; use '<metric> <op> <value> "
+            "[for <seconds>]' with op one of > >= < <= and a metric from: "
+            + ", ".join(names)
+        )
+    metric, op, value, seconds = match.groups()
+    return Rule(
+        text=text.strip(),
+        metric=metric,
+        op=op,
+        threshold=float(value),
+        seconds=float(seconds) if seconds else default_seconds,
+    )
+
+
+class StorageMonitor:
+    """Probe storage hosts periodically in a background thread.
+
+    Args:
+        hosts: Host names to probe.
+        ports: TCP service ports; ICMP is only used when there are none.
+        interval: Seconds between probe rounds.
+        deadline: Time budget per round, in seconds.
+    """
+
+    def __init__(
+        self,
+        hosts: Sequence[str],
+        ports: Sequence[int] = (),
+        interval: float = 30.0,
+        deadline: float = 5.0,
+    ):
+        self.hosts = list(hosts)
+        self.ports = list(ports)
+        self.interval = interval
+        self.deadline = deadline
+        # None until a round completes, and after a round fails
+        self.unreachable: Optional[List[str]] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="watch-storage", daemon=True
+        )
+
+    def _probe(self) -> None:
+        from .collectors.storage_probes import probe_storage_hosts
+
+        results = probe_storage_hosts(
+            self.hosts,
+            ports=self.ports,
+            count=1,
+            timeout=min(2.0, self.deadline),
+            deadline=self.deadline,
+            icmp=not self.ports,
+        )
+        self.unreachable = [r["host"] for r in results if not r["reachable"]]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._probe()
+            except Exception as e:
+                # Keep probing; the metric is unknown until a round succeeds
+                print(f"ERROR probing storage hosts: {e}")
+                self.unreachable = None
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start probing."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop probing (a round in progress finishes in the background)."""
+        self._stop.set()
+
+
+class Watcher:
+    """Evaluate watch rules on a rolling sampler and fire a callback.
+
+    A rule fires once its condition has held on every sample for its
+    ``seconds`` (the debounce); any sample where it does not hold starts
+    the wait again. After a rule fires no rule fires again until
+    ``cooldown`` seconds after the callback returned.
+
+    Args:
+        rules: Rules to evaluate.
+        on_trigger: Called with a trigger description dict when a rule
+                    fires (typically to take a snapshot).
+        interval: Seconds between samples.
+        cooldown: Seconds after a trigger during which nothing fires.
+        backend: Sampler counter backend (see sampler.BACKENDS).
+        storage: Monitor providing the ``storage_unreachable`` metric.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Rule],
+        on_trigger: Callable[[Dict[str, Any]], Any],
+        interval: float = 1.0,
+        cooldown: float = 900.0,
+        backend: str = "auto",
+        storage: Optional[StorageMonitor] = None,
+    ):
+        if not rules:
+            raise ValueError("No watch rules configured")
+        self.rules = list(rules)
+        self.on_trigger = on_trigger
+        self.interval = interval
+        self.cooldown = cooldown
+        self.storage = storage
+        self.metrics = sorted(
+            {r.metric for r in self.rules} - {STORAGE_METRIC}
+        )
+        self.sampler = TickSampler(
+            interval=interval,
+            channels={METRICS[m][0] for m in self.metrics},
+            backend=backend,
+        )
+        self.triggers = 0
+        self._checks = [(r, _OPERATORS[r.op]) for r in self.rules]
+        # monotonic time each rule's condition started holding
+        self._since: List[Optional[float]] = [None] * len(self.rules)
+        self._quiet_until = float("-inf")
+
+    def extract(self, sample: Dict[str, Any]) -> Dict[str, Any]:
+        """Pull the metrics the rules use out of a sampler tick.
+
+        Args:
+            sample: compute_tick() result.
+
+        Returns:
+            Dict of metric name to value (None where unavailable).
+        """
+        values = {m: METRICS[m][1](sample) for m in self.metrics}
+        if self.storage is not None:
+            down = self.storage.unreachable
+            values[STORAGE_METRIC] = None if down is None else len(down)
+        return values
+
+    def evaluate(
+        self,
+        values: Dict[str, Any],
+        now: float,
+        start: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Update rule state with one tick's values.
+
+        Args:
+            values: Metric values from extract().
+            now: time.monotonic() of the tick.
+            start: time.monotonic() the tick's interval began (default:
+                   one interval before ``now``).
+
+        Returns:
+            Trigger description if a rule fired, otherwise None.
+        """
+        fired = None
+        for i, (rule, check) in enumerate(self._checks):
+            value = values.get(rule.metric)
+            if value is None or not check(value, rule.threshold):
+                self._since[i] = None
+                continue
+            since = self._since[i]
+            if since is None:
+                # Holding from the start of this tick's interval
+                since = self._since[i] = (
+                    now - self.interval if start is None else start
+                )
+            if (
+                fired is None
+                and now >= self._quiet_until
+                and now - since >= rule.seconds - 1e-9
+            ):
+                fired = {
+                    "rule": rule.text,
+                    "metric": rule.metric,
+                    "value": value,
+                    "threshold": rule.threshold,
+                    "held_seconds": round(now - since, 1),
+                }
+        if fired is not None:
+            fired["fired_at"] = datetime.now().isoformat()
+            fired["metrics"] = values
+            if self.storage is not None and self.storage.unreachable:
+                fired["unreachable_hosts"] = self.storage.unreachable
+        return fired
+
+    def _fire(self, trigger: Dict[str, Any]) -> None:
+        self.triggers += 1
+        try:
+            self.on_trigger(trigger)
+        finally:
+            self._since = [None] * len(self.rules)
+            self._quiet_until = time.monotonic() + self.cooldown
+
+    def run(self, max_ticks: Optional[int] = None) -> None:
+        """Sample and evaluate until interrupted.
+
+        Sampling pauses while the trigger callback runs and restarts
+        afterwards, so the first tick after a snapshot does not average
+        over the snapshot's own activity.
+
+        Args:
+            max_ticks: Stop after this many ticks (for testing).
+        """
+        if self.storage is not None:
+            self.storage.start()
+        tick = 0
+        try:
+            prev = self.sampler.read()
+            deadline = prev.monotonic
+            while max_ticks is None or tick < max_ticks:
+                deadline += self.interval
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                cur = self.sampler.read()
+                tick += 1
+                values = self.extract(compute_tick(prev, cur))
+                trigger = self.evaluate(values, cur.monotonic, prev.monotonic)
+                prev = cur
+                if trigger is not None:
+                    self._fire(trigger)
+                    prev = self.sampler.read()
+                    deadline = prev.monotonic
+        finally:
+            self.sampler.close()
+            if self.storage is not None:
+                self.storage.stop()
+
+
+def trigger_context(trigger: Dict[str, Any]) -> Dict[str, Any]:
+    """Build user_context.json for a snapshot taken by a watch rule.
+
+    Args:
+        trigger: Trigger description from Watcher.evaluate().
+
+    Returns:
+        Dict with the fields prompt_user_context() returns, describing
+        the rule that fired, plus the trigger itself.
+    """
+    return {
+        "app_name": "",
+        "description": (
+            f"Automatic snapshot: watch rule '{trigger['rule']}' fired "
+            f"({trigger['metric']} = {trigger['value']})"
+        ),
+        "duration_hint": f"{trigger['held_seconds']}s",
+        "severity": None,
+        "trigger": trigger,
+    }
+
+
+def watcher_from_config(
+    config: Dict[str, Any],
+    on_trigger: Callable[[Dict[str, Any]], Any],
+    rules: Optional[Sequence[str]] = None,
+) -> Watcher:
+    """Build a Watcher from the ``watch_*`` configuration keys.
+
+    Args:
+        config: Configuration dict.
+        on_trigger: Callback run when a rule fires.
+        rules: Rule expressions overriding ``watch_rules``.
+
+    Returns:
+        Configured watcher.
+
+    Raises:
+        ValueError: If a rule is invalid, none are configured, or a
+            storage rule has no storage hosts to probe.
+    """
+    debounce = float(config.get("watch_debounce_seconds", 10.0))
+    parsed = [
+        parse_rule(text, debounce)
+        for text in (rules or config.get("watch_rules", []))
+    ]
+    storage = None
+    hosts = config.get("storage_hosts", [])
+    if any(r.metric == STORAGE_METRIC for r in parsed):
+        if not hosts:
+            raise ValueError(
+                f"Watch rules on {STORAGE_METRIC} need storage_hosts"
+            )
+        storage = StorageMonitor(
+            hosts,
+            ports=config.get("storage_probe_ports", []),
+            interval=float(config.get("watch_storage_interval", 30.0)),
+            deadline=float(config.get("storage_probe_deadline", 5.0)),
+        )
+    return Watcher(
+        parsed,
+        on_trigger,
+        interval=float(config.get("watch_interval", 1.0)),
+        cooldown=float(config.get("watch_cooldown_seconds", 900.0)),
+        backend=config.get("sampler_backend", "auto"),
+        storage=storage,
+    )
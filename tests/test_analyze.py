@@ -0,0 +1,222 @@
+"""Tests for snapshot analysis."""
+
+import json
+
+import pytest
+
+from big_red_button import analyze
+from big_red_button.analyze import (
+    analyze_snapshot,
+    format_text,
+    per_core_fractions,
+    series_stats,
+)
+from big_red_button.sinks import open_sink
+
+GB = 1024**3
+
+
+def _cpu_memory(overall, per_cpu, memory=50.0, swap_rate=0.0):
+    return {
+        "cpu_samples": [
+            {
+                "cpu_percent_overall": o,
+                "cpu_percent_per_cpu": cores,
+                "memory_percent": memory,
+                "swap_in_bytes_per_sec": swap_rate,
+                "swap_out_bytes_per_sec": 0.0,
+            }
+            for o, cores in zip(overall, per_cpu)
+        ],
+        "virtual_memory": {"total": 32 * GB, "percent": memory},
+        "swap_memory": {"percent": 10.0},
+    }
+
+
+def _write(snap_dir, files):
+    snap_dir.mkdir()
+    for name, data in files.items():
+        (snap_dir / name).write_text(json.dumps(data), encoding="utf-8")
+    return snap_dir
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run each test with and without NumPy."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(analyze, "np", None)
+    return request.param
+
+
+def test_series_helpers(backend):
+    stats = series_stats([10.0, 95.0, 100.0, 50.0], 90.0)
+    assert stats["count"] == 4
+    assert stats["above"] == 2
+    assert stats["fraction"] == 0.5
+    assert stats["max"] == 100.0
+    assert series_stats([], 90.0)["mean"] is None
+    # Short (spike) intervals count for less time than long ones
+    weighted = series_stats([100.0, 0.0], 90.0, weights=[0.25, 0.75])
+    assert weighted["fraction"] == 0.25
+    assert weighted["mean"] == 25.0
+
+    rows = [[100.0, 5.0, 10.0], [99.0, 0.0, 96.0], [98.0, 1.0]]
+    # Rows are truncated to the smallest core count
+    assert per_core_fractions(rows, 95.0) == [1.0, 0.0]
+
+
+def test_healthy_snapshot_has_no_findings(tmp_path, backend):
+    snap = _write(
+        tmp_path / "snap",
+        {
+            "cpu_memory.json": _cpu_memory([20.0] * 5, [[20.0, 20.0]] * 5),
+            "processes.json": {
+                "top_processes_by_cpu": [],
+                "top_processes_by_memory": [],
+            },
+            "disks.json": {"partitions": []},
+            "network.json": {"storage_host_checks": []},
+        },
+    )
+    report = analyze_snapshot(snap)
+    assert report["findings"] == []
+    assert report["checks"]["cpu"] == "ok"
+    assert report["checks"]["gpu"] == "no data"
+    assert "No problems found." in format_text(report)
+
+
+def test_findings_are_detected_and_ranked(tmp_path, backend):
+    files = {
+        # One core pegged, overall moderate: single-threaded bottleneck
+        "cpu_memory.json": _cpu_memory(
+            [30.0] * 10,
+            [[100.0, 5.0, 10.0, 5.0]] * 10,
+            memory=96.0,
+            swap_rate=30 * 1024 * 1024,
+        ),
+        "processes.json": {
+            "top_processes_by_cpu": [
+                {"pid": 1, "name": "Resolve", "cpu_percent": 100.0}
+            ],
+            "top_processes_by_memory": [
+                {"pid": 1, "name": "Resolve", "rss": 20 * GB}
+            ],
+        },
+        "gpu_info.json": {
+            "nvidia_devices": [
+                {
+                    "name": "RTX",
+                    "memory_total": 100,
+                    "memory_used": 99,
+                    "temperature": 92,
+                }
+            ]
+        },
+        "temperatures.json": {
+            "sensors": {
+                "coretemp": [
+                    {
+                        "label": "Package",
+                        "current": 101.0,
+                        "high": 90.0,
+                        "critical": 100.0,
+                    }
+                ]
+            }
+        },
+        "disks.json": {
+            "partitions": [
+                {
+                    "device": "/dev/sda1",
+                    "mountpoint": "/",
+                    "fstype": "ext4",
+                    "usage": {
+                        "total": 100 * GB,
+                        "free": 2 * GB,
+                        "percent": 98.0,
+                    },
+                },
+                {
+                    "device": "/dev/loop0",
+                    "mountpoint": "/snap/core",
+                    "fstype": "squashfs",
+                    "usage": {"total": GB, "free": 0, "percent": 100.0},
+                },
+            ]
+        },
+        "network.json": {
+            "storage_host_checks": [
+                {
+                    "host": "nexis1",
+                    "status": "FAILED",
+                    "error": "DNS resolution failed",
+                },
+                {"host": "netapp1", "status": "OK"},
+            ]
+        },
+        "user_context.json": {"app_name": "Resolve", "description": "Laggy"},
+    }
+    report = analyze_snapshot(_write(tmp_path / "snap", files))
+
+    titles = [f["title"] for f in report["findings"]]
+    assert "Single core pegged" in titles
+    assert "RAM nearly exhausted" in titles
+    assert "System is paging to swap" in titles
+    assert "Processes using a full CPU core or more" in titles
+    assert "Process holding most of RAM" in titles
+    assert "GPU memory (VRAM) nearly exhausted" in titles
+    assert "GPU running hot" in titles
+    assert "Temperature at critical limit" in titles
+    assert "Storage host unreachable" in titles
+    # The squashfs mount is ignored, the root volume is flagged
+    assert titles.count("Volume nearly full") == 1
+
+    severities = [f["severity"] for f in report["findings"]]
+    assert severities == sorted(severities, key=analyze.SEVERITIES.index)
+    assert [f["rank"] for f in report["findings"]] == list(
+        range(1, len(titles) + 1)
+    )
+    assert report["summary"]["critical"] == severities.count("critical")
+
+    text = format_text(report)
+    assert text.splitlines()[3] == "User reported: Resolve"
+    assert "[CRITICAL]" in text
+    json.dumps(report)
+
+
+def test_cpu_saturation_from_zip(tmp_path, backend):
+    """Analysis reads streamed snapshot archives directly."""
+    sink = open_sink(tmp_path, "support_snapshot_x")
+    sink.write_json(
+        "cpu_memory.json", _cpu_memory([99.0] * 8, [[99.0, 99.0]] * 8)
+    )
+    zip_path = sink.close()
+
+    report = analyze_snapshot(zip_path)
+    assert report["findings"][0]["title"] == "CPU saturated"
+    assert report["findings"][0]["severity"] == "critical"
+    # Saturation supersedes the per-core finding
+    assert len(report["findings"]) == 1
+
+
+def test_stale_flight_recorder_is_reported(tmp_path, backend):
+    """A stopped recorder is not read as a history with no problems."""
+    snap = _write(
+        tmp_path / "snap",
+        {
+            "flight_recorder.json": {
+                "available": False,
+                "stale": True,
+                "window_minutes": 10.0,
+                "newest_sample_age_seconds": 7200.0,
+            },
+        },
+    )
+    report = analyze_snapshot(snap)
+    assert report["checks"]["history"] == "flagged"
+    finding = report["findings"][0]
+    assert finding["severity"] == "info"
+    assert finding["title"] == "Flight recorder not running"
+    assert "7200s old" in finding["detail"]
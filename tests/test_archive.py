@@ -0,0 +1,116 @@
+"""Tests for the parallel archive writer and codecs."""
+
+import json
+import time
+import zipfile
+
+import pytest
+
+from big_red_button.archive import (
+    CODECS,
+    ArchiveWriter,
+    codec_from_config,
+    get_codec,
+)
+
+
+@pytest.mark.parametrize("name", sorted(CODECS))
+def test_archive_roundtrip_every_codec(tmp_path, name):
+    """Assembled archives are valid ZIPs for every available codec."""
+    src = tmp_path / "notes.log"
+    src.write_text("log line\n" * 100, encoding="utf-8")
+    payload = {"samples": [{"cpu": i % 100} for i in range(500)]}
+
+    writer = ArchiveWriter(
+        tmp_path / "out.zip", get_codec(name), max_workers=3
+    )
+    writer.add_json("snap/data.json", payload)
+    writer.add_text("snap/README.txt", "hello\n")
+    writer.add_file("snap/logs/notes.log", src)
+    zip_path = writer.close()
+
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.testzip() is None
+        # Submission order is preserved
+        assert zf.namelist() == [
+            "snap/data.json",
+            "snap/README.txt",
+            "snap/logs/notes.log",
+        ]
+        assert {i.compress_type for i in zf.infolist()} == {CODECS[name]}
+        # Generated members are dated now, not 1980-01-01
+        today = time.localtime()[:3]
+        assert all(i.date_time[:3] == today for i in zf.infolist())
+        assert json.loads(zf.read("snap/data.json")) == payload
+        assert zf.read("snap/README.txt") == b"hello\n"
+        assert zf.read("snap/logs/notes.log") == src.read_bytes()
+
+
+def test_archive_level_affects_size(tmp_path):
+    text = json.dumps([{"i": i, "v": str(i) * 3} for i in range(5000)])
+    sizes = []
+    for level in (0, 9):
+        writer = ArchiveWriter(
+            tmp_path / f"{level}.zip", get_codec("deflate", level)
+        )
+        writer.add_text("a.json", text)
+        sizes.append(writer.close().stat().st_size)
+    assert sizes[1] < sizes[0]
+
+
+def test_members_are_written_before_close(tmp_path):
+    """Finished members reach the file at once, in submission order."""
+    path = tmp_path / "out.zip"
+    writer = ArchiveWriter(path, get_codec("stored"), max_workers=4)
+    writer.add_text("a.txt", "first member\n")
+    writer.add_text("b.txt", "second member\n")
+
+    deadline = time.monotonic() + 5.0
+    while b"second member" not in path.read_bytes():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    on_disk = path.read_bytes()
+    assert on_disk.index(b"first member") < on_disk.index(b"second member")
+    # Nothing is held once written
+    assert not writer._pending
+
+    writer.close()
+    with zipfile.ZipFile(path) as zf:
+        assert zf.namelist() == ["a.txt", "b.txt"]
+
+
+def test_failed_member_is_reported_on_close(tmp_path):
+    """A member that cannot be compressed fails close()."""
+    writer = ArchiveWriter(tmp_path / "out.zip")
+    writer.add_text("a.txt", "ok\n")
+    writer.add_file("missing.log", tmp_path / "missing.log")
+    writer.add_text("b.txt", "ok\n")
+
+    with pytest.raises(FileNotFoundError):
+        writer.close()
+
+
+def test_failed_member_refuses_later_members(tmp_path):
+    """Members added after a failure raise instead of queueing."""
+    writer = ArchiveWriter(tmp_path / "out.zip")
+    writer.add_file("missing.log", tmp_path / "missing.log")
+
+    deadline = time.monotonic() + 5.0
+    with pytest.raises(FileNotFoundError):
+        while time.monotonic() < deadline:
+            writer.add_text("late.txt", "x")
+            time.sleep(0.01)
+    writer.abort()
+
+
+def test_get_codec_validation():
+    with pytest.raises(ValueError):
+        get_codec("rar")
+    with pytest.raises(ValueError):
+        get_codec("deflate", 12)
+    # Levels are dropped for codecs that do not use them
+    assert get_codec("lzma", 5).level is None
+    assert codec_from_config({}).name == "deflate"
+    assert codec_from_config(
+        {"archive_codec": "bzip2", "archive_level": 3}
+    ) == (get_codec("bzip2", 3))
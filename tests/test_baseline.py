@@ -0,0 +1,152 @@
+"""Tests for baselines and snapshot diffs."""
+
+import json
+
+from big_red_button.baseline import (
+    baseline_path,
+    diff_summaries,
+    format_diff,
+    load_summary,
+    record_baseline,
+    summarize,
+)
+
+GB = 1024**3
+
+
+def _files(procs, root_percent, mtu, resolve, total=64 * GB):
+    return {
+        "system_info.json": {"hostname": "edit-01", "timestamp_local": "t"},
+        "cpu_memory.json": {
+            "virtual_memory": {"total": total, "percent": 50.0},
+            "swap_memory": {"percent": 5.0},
+        },
+        "processes.json": {
+            "top_processes_by_cpu": procs,
+            "top_processes_by_memory": procs,
+        },
+        "disks.json": {
+            "partitions": [
+                {
+                    "device": "/dev/disk1",
+                    "mountpoint": "/",
+                    "fstype": "apfs",
+                    "usage": {
+                        "total": 1000 * GB,
+                        "used": root_percent * 10 * GB,
+                        "percent": root_percent,
+                    },
+                }
+            ]
+        },
+        "network.json": {
+            "stats": {
+                "en0": {"isup": True, "speed": 10000, "mtu": mtu},
+            }
+        },
+        "installed_apps.json": {
+            "DaVinci Resolve": {"path": "/Applications", "version": resolve}
+        },
+    }
+
+
+def _proc(pid, name, cpu, rss):
+    return {"pid": pid, "name": name, "cpu_percent": cpu, "rss": rss}
+
+
+def test_summarize_groups_processes_by_name():
+    procs = [_proc(1, "Helper", 5.0, GB), _proc(2, "Helper", 5.0, GB)]
+    summary = summarize(_files(procs, 50.0, 9000, "19.0"))
+    # Both lists contain the same pids; they are counted once
+    assert summary["processes"]["Helper"] == {
+        "count": 2,
+        "cpu_percent": 10.0,
+        "rss": 2 * GB,
+    }
+    assert summary["nics"]["en0"]["mtu"] == 9000
+    assert summary["apps"] == {"DaVinci Resolve": "19.0"}
+
+
+def test_diff_reports_keyed_changes():
+    before = summarize(
+        _files(
+            [_proc(1, "Resolve", 50.0, 8 * GB), _proc(2, "Finder", 1.0, GB)],
+            50.0,
+            9000,
+            "19.0",
+        )
+    )
+    after = summarize(
+        _files(
+            [
+                _proc(10, "Resolve", 180.0, 20 * GB),
+                _proc(11, "mds_stores", 90.0, GB),
+            ],
+            92.0,
+            1500,
+            "19.1",
+            total=32 * GB,
+        )
+    )
+    diff = diff_summaries(before, after)
+
+    assert [p["name"] for p in diff["processes"]["new"]] == ["mds_stores"]
+    assert diff["processes"]["gone"] == ["Finder"]
+    assert diff["processes"]["heavier"][0]["name"] == "Resolve"
+    assert diff["memory"] == {"total": [64 * GB, 32 * GB]}
+    assert diff["volumes"]["changed"][0]["percent"] == [50.0, 92.0]
+    assert diff["nics"]["changed"] == [
+        {"interface": "en0", "field": "mtu", "before": 9000, "after": 1500}
+    ]
+    assert diff["apps"]["changed"] == {"DaVinci Resolve": ["19.0", "19.1"]}
+
+    text = format_diff(diff)
+    assert "+ process mds_stores" in text
+    assert "~ NIC en0 mtu: 9000 -> 1500" in text
+    assert "~ app DaVinci Resolve: 19.0 -> 19.1" in text
+
+
+def test_identical_snapshots_have_no_changes():
+    files = _files([_proc(1, "Resolve", 50.0, 8 * GB)], 50.0, 9000, "19.0")
+    diff = diff_summaries(summarize(files), summarize(files))
+    assert "No significant changes" in format_diff(diff)
+
+
+def test_diff_large_process_tables():
+    before = {
+        "processes": {
+            f"proc{i}": {"count": 1, "cpu_percent": 1.0, "rss": GB}
+            for i in range(50000)
+        }
+    }
+    after = {
+        "processes": {
+            f"proc{i}": {"count": 1, "cpu_percent": 1.0, "rss": GB}
+            for i in range(1, 50001)
+        }
+    }
+    diff = diff_summaries(before, after)
+    assert diff["processes"]["gone"] == ["proc0"]
+    assert [p["name"] for p in diff["processes"]["new"]] == ["proc50000"]
+
+
+def test_record_baseline_roundtrip(tmp_path):
+    snap = tmp_path / "support_snapshot_x"
+    snap.mkdir()
+    for name, data in _files([], 50.0, 9000, "19.0").items():
+        (snap / name).write_text(json.dumps(data), encoding="utf-8")
+
+    key, path = record_baseline(snap, tmp_path / "baselines")
+    assert key == "edit-01"
+    assert path == baseline_path(tmp_path / "baselines", "edit-01")
+
+    _, class_path = record_baseline(
+        snap, tmp_path / "baselines", key="edit suite/A"
+    )
+    assert class_path.name == "edit_suite_A.json"
+
+    baseline = load_summary(path)
+    assert baseline["meta"]["snapshot"] == str(snap)
+    assert (
+        diff_summaries(baseline, load_summary(snap))["apps"]["changed"] == {}
+    )
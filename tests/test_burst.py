@@ -0,0 +1,70 @@
+"""Tests for burst micro-stutter capture."""
+
+from big_red_button.analyze import check_stutter
+from big_red_button.collectors.burst import collect_burst, detect_stalls
+
+
+def test_detect_stalls_finds_each_kind():
+    """Late ticks, saturated cores and run-queue overload are reported."""
+    interval = 0.01
+    offsets = [0.01, 0.02, 0.03, 0.09, 0.10, 0.11, 0.12, 0.13]
+    per_core = [
+        # Core 0: saturated for four samples, one of them with no tick
+        [0.0, 100.0, None, 100.0, 100.0, 0.0, 0.0, 0.0],
+        # Core 1: a single hot sample is too short to count
+        [0.0, 0.0, 0.0, 0.0, 0.0, 100.0, 0.0, 0.0],
+    ]
+    run_queue = [1, 1, 1, 3, 3, 3, 1, 1]
+
+    summary = detect_stalls(offsets, per_core, run_queue, 2, interval)
+
+    assert summary["stall_counts"] == {
+        "late_tick": 1,
+        "core_saturated": 1,
+        "run_queue": 1,
+    }
+    by_kind = {e["kind"]: e for e in summary["stalls"]}
+    assert by_kind["late_tick"]["late_ms"] == 50.0
+    assert by_kind["late_tick"]["start_ms"] == 30.0
+    assert by_kind["core_saturated"]["core"] == 0
+    assert by_kind["core_saturated"]["start_ms"] == 10.0
+    assert by_kind["run_queue"]["peak"] == 3
+    assert summary["max_tick_gap_ms"] == 60.0
+    assert summary["max_run_queue"] == 3
+
+
+def test_collect_burst_fills_buffer():
+    """Every series has one value per sample (one list per core)."""
+    data = collect_burst(duration=0.1, interval=0.02)
+    buffer = data["buffer"]
+
+    assert data["summary"]["samples"] == 5
+    assert len(buffer["offset_seconds"]) == 5
+    assert len(buffer["cpu_percent_per_core"]) == data["cpu_count"]
+    assert all(len(s) == 5 for s in buffer["cpu_percent_per_core"])
+    assert len(buffer["run_queue"]) == len(buffer["memory_percent"]) == 5
+    assert buffer["offset_seconds"] == sorted(buffer["offset_seconds"])
+
+
+def test_check_stutter():
+    """Long late ticks are critical; short bursts are ignored."""
+    burst = {
+        "interval_seconds": 0.01,
+        "duration_seconds": 2.0,
+        "cpu_count": 8,
+        "summary": {
+            "max_tick_gap_ms": 130.0,
+            "max_run_queue": 12,
+            "stalls": [
+                {"kind": "late_tick", "late_ms": 120.0, "duration_ms": 130},
+                {"kind": "late_tick", "late_ms": 15.0, "duration_ms": 25},
+                {"kind": "run_queue", "duration_ms": 400.0, "peak": 12},
+            ],
+        },
+    }
+
+    findings = check_stutter({"burst.json": burst})
+
+    assert [f.severity for f in findings] == ["critical", "warning"]
+    assert findings[0].evidence["late_ticks"] == 2
+    assert check_stutter({"burst.json": {"summary": {"stalls": []}}}) == []
@@ -0,0 +1,80 @@
+"""Tests for the capability cache."""
+
+import json
+import time
+
+from big_red_button import capabilities
+from big_red_button.capabilities import CapabilityCache
+from big_red_button.utils import safe_run
+
+
+def test_available_probes_path_and_backends():
+    """Tools are looked up on PATH and backends by import spec."""
+    cache = CapabilityCache()
+
+    assert cache.available("python3") or cache.available("python")
+    assert not cache.available("nonexistent_command_xyz")
+    assert (
+        not cache.available("win32gui")
+        or cache.entries()["win32gui"]["detail"]
+    )
+
+
+def test_cache_round_trip(tmp_path):
+    """Entries are saved and reused by later runs within the TTL."""
+    path = tmp_path / "caps" / "capabilities.json"
+    cache = CapabilityCache(path)
+    cache.available("nonexistent_command_xyz")
+    cache.record("powermetrics", False, "must be invoked as the superuser")
+    cache.save()
+
+    reloaded = CapabilityCache(path)
+    assert reloaded.entries().keys() == {
+        "nonexistent_command_xyz",
+        "powermetrics",
+    }
+    # A recorded failure is trusted even if the tool is on PATH
+    assert not reloaded.available("powermetrics")
+
+
+def test_expired_and_reprobe(tmp_path):
+    """Expired entries and --reprobe trigger a fresh probe."""
+    path = tmp_path / "capabilities.json"
+    path.write_text(
+        json.dumps(
+            {
+                "version": capabilities.CACHE_VERSION,
+                "entries": {
+                    "ls": {"available": False, "checked": time.time() - 7200},
+                    "echo": {"available": False, "checked": time.time()},
+                },
+            }
+        )
+    )
+
+    cache = CapabilityCache(path, ttl=3600)
+    assert cache.available("ls")
+    assert not cache.available("echo")
+
+    assert CapabilityCache(path, reprobe=True).available("echo")
+
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    """A damaged cache file is treated as empty."""
+    path = tmp_path / "capabilities.json"
+    path.write_text("{not json")
+
+    assert CapabilityCache(path).entries() == {}
+
+
+def test_safe_run_skips_unavailable_tools(monkeypatch, tmp_path):
+    """safe_run does not spawn tools the cache marks as missing."""
+    monkeypatch.setattr(capabilities, "_cache", CapabilityCache())
+    cache = capabilities.configure(
+        {"capability_cache": str(tmp_path / "capabilities.json")}
+    )
+    cache.record("echo", False, "test")
+    result = safe_run(["echo", "hello"])
+
+    assert result["returncode"] is None
+    assert "capability cache" in result["stderr"]
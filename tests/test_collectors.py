@@ -1,6 +1,14 @@
 """Tests for collectors modules."""
 
 from big_red_button import collectors
+from big_red_button.collectors.disks import (
+    disk_interval_metrics,
+    summarize_disk_rates,
+)
+from big_red_button.collectors.network import (
+    nic_interval_metrics,
+    summarize_nic_rates,
+)
 
 
 def test_collect_system_info():
@@ -24,32 +32,39 @@ def test_collect_cpu_memory():
     assert "cpu_count_physical" in info
     assert "cpu_samples" in info
     assert len(info["cpu_samples"]) == 2
+    sample = info["cpu_samples"][0]
+    assert "cpu_percent_per_cpu" in sample
+    assert "cpu_percent_overall" in sample
+    assert "memory_percent" in sample
+    assert "ctx_switches_per_sec" in sample
     assert "virtual_memory" in info
     assert "swap_memory" in info
 
 
 def test_collect_disks():
     """Test disk collection returns required fields."""
-    info = collectors.collect_disks()
+    info = collectors.collect_disks(sample_count=2, sample_interval=0.1)
 
     assert "partitions" in info
     assert "io_counters" in info
+    assert "io_rates" in info
     assert isinstance(info["partitions"], list)
 
 
 def test_collect_network():
     """Test network collection returns required fields."""
-    info = collectors.collect_network([])
+    info = collectors.collect_network([], sample_count=2, sample_interval=0.1)
 
     assert "interfaces" in info
     assert "stats" in info
     assert "counters" in info
+    assert "io_rates" in info
     assert "storage_host_checks" in info
 
 
 def test_collect_processes():
     """Test process collection returns required fields."""
-    info = collectors.collect_processes(max_processes=5)
+    info = collectors.collect_processes(max_processes=5, sample_window=0.1)
 
     assert "top_processes_by_cpu" in info
     assert "top_processes_by_memory" in info
@@ -57,6 +72,96 @@ def test_collect_processes():
     assert len(info["top_processes_by_memory"]) <= 5
 
 
+def test_collect_processes_ranks_by_windowed_cpu():
+    """Test that a busy process tops the CPU ranking with real CPU%."""
+    import os
+    import threading
+
+    stop = threading.Event()
+
+    def _spin():
+        while not stop.is_set():
+            pass
+
+    thread = threading.Thread(target=_spin, daemon=True)
+    thread.start()
+    try:
+        info = collectors.collect_processes(
+            max_processes=3, sample_window=0.3, own_processes="include"
+        )
+    finally:
+        stop.set()
+        thread.join()
+
+    top = info["top_processes_by_cpu"][0]
+    assert top["pid"] == os.getpid()
+    assert top["cpu_percent"] > 10.0
+    assert "io_read_bytes_per_sec" in top
+    assert "ctx_switches_per_sec" in top
+    assert "page_faults_per_sec" in top
+
+
+def test_collect_processes_reads_counters_for_selected_only(monkeypatch):
+    """Test that rate counters are read only for the top processes."""
+    from big_red_button.collectors import processes
+
+    calls = []
+    read_counters = processes._read_counters
+
+    def _counting(proc):
+        calls.append(proc.pid)
+        return read_counters(proc)
+
+    monkeypatch.setattr(processes, "_read_counters", _counting)
+    info = collectors.collect_processes(max_processes=2, sample_window=0.05)
+
+    selected = {
+        p["pid"]
+        for p in info["top_processes_by_cpu"] + info["top_processes_by_memory"]
+    }
+    # Once when the rate window starts and once when it ends
+    assert len(calls) <= 2 * 4
+    assert selected <= set(calls)
+
+
+def test_collect_processes_excludes_own_tree():
+    """Test that the tool and its children stay out of the rankings."""
+    import os
+    import subprocess
+    import sys
+
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(5)"]
+    )
+    try:
+        excluded = collectors.collect_processes(
+            max_processes=500, sample_window=0.05
+        )
+        tagged = collectors.collect_processes(
+            max_processes=500, sample_window=0.05, own_processes="tag"
+        )
+    finally:
+        child.kill()
+        child.wait()
+
+    assert {os.getpid(), child.pid} <= set(excluded["own_pids"])
+    ranked = (
+        excluded["top_processes_by_cpu"]
+        + (excluded["top_processes_by_memory"])
+    )
+    assert not {p["pid"] for p in ranked} & set(excluded["own_pids"])
+    mine = [p for p in tagged["top_processes_by_memory"] if p["self"]]
+    assert os.getpid() in {p["pid"] for p in mine}
+
+
+def test_collect_processes_rejects_unknown_own_mode():
+    """Test that a misspelled own_processes mode is an error."""
+    import pytest
+
+    with pytest.raises(ValueError):
+        collectors.collect_processes(own_processes="hide")
+
+
 def test_collect_gpu_info():
     """Test GPU collection returns dict."""
     info = collectors.collect_gpu_info()
@@ -72,6 +177,40 @@ def test_collect_temperatures():
     assert isinstance(info, dict)
 
 
+def test_powermetrics_timeout_is_not_cached(monkeypatch):
+    """Test that only a nonzero exit marks powermetrics unavailable."""
+    from big_red_button.collectors import temperatures
+
+    recorded = []
+    monkeypatch.setattr(temperatures.platform, "system", lambda: "Darwin")
+    monkeypatch.setattr(
+        temperatures.capabilities, "available", lambda name: True
+    )
+    monkeypatch.setattr(
+        temperatures.capabilities,
+        "record",
+        lambda name, ok, detail=None: recorded.append((name, ok)),
+    )
+
+    def _run_with(returncode):
+        recorded.clear()
+        monkeypatch.setattr(
+            temperatures,
+            "safe_run",
+            lambda cmd, timeout: {
+                "returncode": returncode,
+                "stdout": "",
+                "stderr": "must be invoked as the superuser",
+            },
+        )
+        temperatures.collect_temperatures()
+        return list(recorded)
+
+    # Timed out on a loaded machine: try again next time
+    assert _run_with(None) == []
+    assert _run_with(1) == [("powermetrics", False)]
+
+
 def test_collect_foreground_app():
     """Test foreground app detection returns dict."""
     info = collectors.collect_foreground_app()
@@ -85,3 +224,125 @@ def test_detect_installed_apps():
     info = collectors.detect_installed_apps()
 
     assert isinstance(info, dict)
+
+
+def test_disk_interval_metrics():
+    """Test throughput, IOPS, latency and utilization derivation."""
+    metrics = disk_interval_metrics(
+        {
+            "read_count_per_sec": 100.0,
+            "write_count_per_sec": 100.0,
+            "read_bytes_per_sec": 50e6,
+            "write_bytes_per_sec": 10e6,
+            "read_time_per_sec": 600.0,
+            "write_time_per_sec": 400.0,
+            "busy_time_per_sec": 950.0,
+        }
+    )
+
+    assert metrics["read_mb_per_sec"] == 50.0
+    assert metrics["write_mb_per_sec"] == 10.0
+    assert metrics["read_iops"] == 100.0
+    assert metrics["avg_service_time_ms"] == 5.0
+    assert metrics["avg_queue_depth"] == 1.0
+    assert metrics["utilization_percent"] == 95.0
+
+
+def test_summarize_disk_rates_flags_saturated_peak():
+    """Test that the peak interval and saturation are reported per disk."""
+    quiet = disk_interval_metrics(
+        {
+            "read_count_per_sec": 1.0,
+            "write_count_per_sec": 0.0,
+            "read_bytes_per_sec": 4096.0,
+            "write_bytes_per_sec": 0.0,
+            "read_time_per_sec": 1.0,
+            "write_time_per_sec": 0.0,
+            "busy_time_per_sec": 10.0,
+        }
+    )
+    busy = dict(quiet, utilization_percent=99.0, read_mb_per_sec=400.0)
+    samples = [
+        {"timestamp": "t0", "disks": {"scratch": quiet}},
+        {"timestamp": "t1", "disks": {"scratch": busy}},
+    ]
+
+    summary = summarize_disk_rates(samples)["scratch"]
+
+    assert summary["saturated"] is True
+    assert summary["peak_interval"]["timestamp"] == "t1"
+    assert summary["mean"]["utilization_percent"] == 50.0
+
+
+def test_nic_interval_metrics_percent_of_link():
+    """Test NIC throughput as a share of link speed plus error deltas."""
+    rates = {
+        "bytes_recv_per_sec": 1.125e9,  # 9 Gbit/s
+        "bytes_sent_per_sec": 12.5e6,  # 100 Mbit/s
+        "packets_recv_per_sec": 750000.0,
+        "packets_sent_per_sec": 9000.0,
+        "errin_per_sec": 2.0,
+        "errout_per_sec": 0.0,
+        "dropin_per_sec": 0.5,
+        "dropout_per_sec": 0.0,
+    }
+
+    metrics = nic_interval_metrics(rates, interval=2.0, speed_mbps=10000)
+
+    assert metrics["rx_mbps"] == 9000.0
+    assert metrics["tx_mbps"] == 100.0
+    assert metrics["rx_percent_of_link"] == 90.0
+    assert metrics["tx_percent_of_link"] == 1.0
+    assert metrics["errin"] == 4
+    assert metrics["dropin"] == 1
+
+    summary = summarize_nic_rates([{"interfaces": {"en0": metrics}}])["en0"]
+    assert summary["saturated"] is True
+    assert summary["errors_or_drops"] is True
+    assert summary["peak_percent_of_link"] == 90.0
+
+
+def test_nic_interval_metrics_unknown_speed():
+    """Test that an unknown link speed leaves utilization unset."""
+    rates = dict.fromkeys(
+        [
+            "bytes_recv_per_sec",
+            "bytes_sent_per_sec",
+            "packets_recv_per_sec",
+            "packets_sent_per_sec",
+            "errin_per_sec",
+            "errout_per_sec",
+            "dropin_per_sec",
+            "dropout_per_sec",
+        ],
+        0.0,
+    )
+
+    metrics = nic_interval_metrics(rates, interval=1.0, speed_mbps=0)
+
+    assert metrics["rx_percent_of_link"] is None
+    summary = summarize_nic_rates([{"interfaces": {"lo": metrics}}])["lo"]
+    assert summary["saturated"] is False
+
+
+def test_collect_processes_fetches_details_for_selected_only(monkeypatch):
+    """Test that cmdline/username are only read for the top processes."""
+    import psutil
+
+    calls = {"cmdline": 0}
+    original = psutil.Process.cmdline
+
+    def _counting_cmdline(self):
+        calls["cmdline"] += 1
+        return original(self)
+
+    monkeypatch.setattr(psutil.Process, "cmdline", _counting_cmdline)
+
+    info = collectors.collect_processes(max_processes=2, sample_window=0.05)
+
+    assert calls["cmdline"] <= 4
+    assert info["process_count"] >= 1
+    assert "total_excluding_window" in info["collection_seconds"]
+    for proc in info["top_processes_by_cpu"]:
+        assert "username" in proc
+        assert "cmdline" in proc
@@ -125,3 +125,39 @@ def test_zip_creation_integrity(tmp_path):
         for name in file_list:
             assert not os.path.isabs(name)
             assert ".." not in name
+
+
+# 4. Snapshot README lists only the files written
+def test_readme_lists_collected_files(tmp_path, monkeypatch):
+    """Test that README.txt describes the profile's files, not a fixed list."""
+    from big_red_button.collectors.registry import CollectorSpec
+    from big_red_button.snapshot import create_snapshot
+
+    specs = [
+        CollectorSpec(
+            name=name,
+            filename=f"{name}.json",
+            func=dict,
+            description=f"{name} data",
+        )
+        for name in ("cpu_memory", "flight_recorder")
+    ]
+    monkeypatch.setattr(
+        "big_red_button.snapshot.registry.select_collectors",
+        lambda profile, system: (specs, []),
+    )
+    config = {
+        "snapshot_root": str(tmp_path),
+        "snapshot_format": "directory",
+        "capability_cache": str(tmp_path / "caps.json"),
+        "studio_name": "Test",
+    }
+    path = create_snapshot(config, {"app_name": "Nuke"})
+    readme = (path / "README.txt").read_text(encoding="utf-8")
+
+    assert "flight_recorder.json" in readme
+    assert "cpu_memory.json" in readme
+    assert "collection_meta.json" in readme
+    assert "burst.json" not in readme
+    assert "temperatures.json" not in readme
+    assert "3. Check flight_recorder.json" in readme
@@ -0,0 +1,142 @@
+"""Tests for the concurrent collector engine."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from big_red_button.engine import (
+    CollectorTask,
+    process_usage,
+    run_collectors,
+)
+from big_red_button.utils import safe_run
+
+
+def _sleepy(seconds: float, value: str) -> dict:
+    time.sleep(seconds)
+    return {"value": value}
+
+
+def _broken() -> dict:
+    raise RuntimeError("boom")
+
+
+def _busy() -> dict:
+    total = sum(i * i for i in range(300_000))
+    safe_run(["echo", "spawned"])
+    return {"total": total}
+
+
+def test_run_collectors_runs_in_parallel():
+    """Test that total wall time is close to the slowest collector."""
+    tasks = [
+        CollectorTask(
+            f"task{i}", f"task{i}.json", _sleepy, {"seconds": 0.3, "value": i}
+        )
+        for i in range(4)
+    ]
+
+    t0 = time.perf_counter()
+    results = run_collectors(tasks)
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 1.0
+    assert [r.name for r in results] == [t.name for t in tasks]
+    assert [r.data["value"] for r in results] == [0, 1, 2, 3]
+    for r in results:
+        assert r.duration_seconds >= 0.25
+        assert r.started <= r.finished
+
+
+def test_run_collectors_isolates_failures():
+    """Test that a failing collector is recorded without aborting others."""
+    seen = []
+    results = run_collectors(
+        [
+            CollectorTask("bad", "bad.json", _broken),
+            CollectorTask(
+                "good", "good.json", _sleepy, {"seconds": 0, "value": "ok"}
+            ),
+        ],
+        on_result=seen.append,
+    )
+
+    bad, good = results
+    assert bad.error == "RuntimeError: boom"
+    assert bad.data == {"error": "RuntimeError: boom"}
+    assert good.error is None
+    assert good.data == {"value": "ok"}
+    assert {r.name for r in seen} == {"bad", "good"}
+    assert bad.timing()["error"] == "RuntimeError: boom"
+
+
+def test_run_collectors_abandons_timed_out_collector():
+    """Test that a collector exceeding its timeout is abandoned."""
+    t0 = time.perf_counter()
+    results = run_collectors(
+        [
+            CollectorTask(
+                "slow",
+                "slow.json",
+                _sleepy,
+                {"seconds": 2.0, "value": "late"},
+                timeout=0.2,
+            ),
+            CollectorTask(
+                "fast", "fast.json", _sleepy, {"seconds": 0, "value": "ok"}
+            ),
+        ]
+    )
+
+    assert time.perf_counter() - t0 < 1.5
+    slow, fast = results
+    assert slow.status == "timeout"
+    assert "Timed out" in slow.data["error"]
+    assert fast.status == "ok"
+    assert slow.timing()["cpu_seconds"] is None
+    assert fast.subprocesses == 0
+
+
+def test_hung_collector_does_not_delay_exit():
+    """An abandoned collector does not keep the process alive."""
+    code = (
+        "import time\n"
+        "from big_red_button.engine import CollectorTask, run_collectors\n"
+        "(r,) = run_collectors([CollectorTask('hung', 'hung.json',"
+        " lambda: time.sleep(60), timeout=0.2)])\n"
+        "print(r.status)\n"
+    )
+    src = str(Path(__file__).resolve().parent.parent / "src")
+    t0 = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=src),
+        timeout=30,
+        check=True,
+    )
+
+    assert result.stdout.splitlines()[-1] == "timeout"
+    assert time.perf_counter() - t0 < 10
+
+
+def test_run_collectors_records_overhead():
+    """Test per-collector CPU time, subprocess count and peak RSS."""
+    (busy,) = run_collectors([CollectorTask("busy", "busy.json", _busy)])
+    meta = busy.timing()
+
+    assert meta["cpu_seconds"] > 0
+    assert meta["subprocesses"] == 1
+    assert meta["peak_rss_bytes"] > 0
+
+
+def test_process_usage():
+    """Test the tool's own CPU and memory usage report."""
+    usage = process_usage()
+
+    assert usage["cpu_user_seconds"] > 0
+    assert usage["peak_rss_bytes"] >= usage["rss_bytes"] > 0
+    assert usage["threads"] >= 1
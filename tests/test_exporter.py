@@ -0,0 +1,287 @@
+"""Tests for the metrics exporter and its result cache."""
+
+import socket
+import sys
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from big_red_button.collectors.registry import CollectorSpec
+from big_red_button.engine import CollectorResult
+from big_red_button.exporter import (
+    CacheEntry,
+    MetricSet,
+    ResultCache,
+    cache_from_config,
+    make_server,
+    render_metrics,
+)
+
+
+class _Counter:
+    """Collector stand-in that counts its runs."""
+
+    def __init__(self, delay=0.0, data=None):
+        self.calls = 0
+        self.delay = delay
+        self.data = data or {"uptime_seconds": 5.0}
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.data
+
+
+def _cache(collectors, ttl=30.0, background=(), clock=time.monotonic):
+    specs = [
+        CollectorSpec(
+            name=name, filename=f"{name}.json", func=func, description=""
+        )
+        for name, func in collectors.items()
+    ]
+    return ResultCache(
+        specs, {}, dict.fromkeys(collectors, ttl), background, clock=clock
+    )
+
+
+def test_results_are_cached_for_their_ttl():
+    """Scrapes within the TTL reuse the result; later ones re-run it."""
+    now = [100.0]
+    collector = _Counter()
+    cache = _cache({"system_info": collector}, ttl=10.0, clock=lambda: now[0])
+
+    cache.snapshot()
+    now[0] += 9.0
+    cache.snapshot()
+    assert collector.calls == 1
+
+    now[0] += 1.0
+    entries = cache.snapshot()
+    cache.stop()
+
+    assert collector.calls == 2
+    assert entries["system_info"].result.data == {"uptime_seconds": 5.0}
+
+
+def test_concurrent_scrapes_share_one_run():
+    """Scrapes arriving while a collector runs wait for that run."""
+    collector = _Counter(delay=0.2)
+    cache = _cache({"system_info": collector})
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.snapshot()))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    cache.stop()
+
+    assert collector.calls == 1
+    assert all(r["system_info"].result is not None for r in results)
+
+
+def test_background_collectors_never_block_scrapes():
+    """Scrapes return at once; the scheduler keeps the result fresh."""
+    slow = _Counter(delay=0.3)
+    cache = _cache({"gpu": slow}, background=["gpu"])
+
+    t0 = time.monotonic()
+    first = cache.snapshot()
+    assert time.monotonic() - t0 < 0.2
+    assert first["gpu"].result is None
+
+    cache.start()
+    time.sleep(0.5)
+    later = cache.snapshot()
+    cache.stop()
+
+    assert later["gpu"].result is not None
+    assert slow.calls == 1
+
+
+def test_collector_errors_are_reported_not_raised():
+    """A failing collector is served as down."""
+
+    def broken():
+        raise RuntimeError("no sensors")
+
+    cache = _cache({"temperatures": broken})
+    text = render_metrics(cache.snapshot())
+    cache.stop()
+
+    assert 'brb_collector_up{collector="temperatures"} 0' in text
+
+
+def test_hung_collector_times_out_and_is_retried():
+    """A run past its timeout is cached as timed out, not left pending."""
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        release.wait(5)
+        return {"uptime_seconds": 1.0}
+
+    spec = CollectorSpec(
+        name="system_info",
+        filename="system_info.json",
+        func=hung,
+        description="",
+        cost=0.0,
+        timeout=0.2,
+    )
+    now = [100.0]
+    cache = ResultCache(
+        [spec], {}, {"system_info": 10.0}, clock=lambda: now[0]
+    )
+    try:
+        t0 = time.monotonic()
+        entry = cache.snapshot()["system_info"]
+        assert time.monotonic() - t0 < 2.0
+        assert entry.result.status == "timeout"
+        assert entry.refreshing is None
+
+        now[0] += 10.0
+        cache.snapshot()
+        assert len(calls) == 2
+    finally:
+        release.set()
+        cache.stop()
+
+
+def test_render_metrics_converts_collector_output():
+    """Collector JSON becomes labelled Prometheus gauges."""
+    cpu_memory = {
+        "cpu_count_logical": 2,
+        "cpu_samples": [
+            {
+                "interval_seconds": 1.0,
+                "cpu_percent_overall": 10.0,
+                "cpu_percent_per_cpu": [0.0, 20.0],
+            },
+            {
+                "interval_seconds": 3.0,
+                "cpu_percent_overall": 50.0,
+                "cpu_percent_per_cpu": [40.0, 60.0],
+                "pressure": {"io_some_percent": 2.5},
+            },
+        ],
+        "virtual_memory": {"percent": 75.0, "total": 8},
+    }
+    processes = {
+        "process_count": 3,
+        "top_processes_by_cpu": [
+            {"pid": 7, "name": 'say "hi"', "cpu_percent": 99.0}
+        ],
+    }
+    entries = {
+        name: CacheEntry(
+            result=CollectorResult(name, f"{name}.json", data, "", "", 0.25),
+            fetched=10.0,
+        )
+        for name, data in [
+            ("cpu_memory", cpu_memory),
+            ("processes", processes),
+        ]
+    }
+    text = render_metrics(entries, now=12.5)
+
+    assert "# TYPE brb_cpu_percent gauge" in text
+    # Weighted by interval
+    assert "brb_cpu_percent 40\n" in text
+    assert 'brb_cpu_core_percent{core="1"} 40' in text
+    assert "brb_memory_percent 75" in text
+    assert 'brb_pressure_percent{resource="io",kind="some"} 2.5' in text
+    assert 'brb_process_cpu_percent{pid="7",name="say \\"hi\\""} 99' in text
+    assert 'brb_collector_age_seconds{collector="processes"} 2.5' in text
+
+
+def test_metric_set_skips_missing_values():
+    """None and strings produce no samples."""
+    m = MetricSet()
+    m.add("a", "A", None)
+    m.add("b", "B", "n/a")
+    m.add("c", "C", True)
+
+    assert m.render() == "# HELP brb_c C\n# TYPE brb_c gauge\nbrb_c 1\n"
+
+
+def test_cache_from_config_uses_ttls_and_background_cost():
+    """Per-collector TTLs apply and sampling collectors run in background."""
+    cache = cache_from_config(
+        {
+            "exporter_profile": "quick",
+            "exporter_collectors": ["system_info", "cpu_memory"],
+            "exporter_ttl_seconds": 20.0,
+            "exporter_ttl": {"system_info": 300},
+            "cpu_sample_count": 10,
+            "cpu_sample_interval": 1.0,
+            "cpu_sample_max_seconds": 30.0,
+        }
+    )
+    cache.stop()
+
+    assert cache.ttls == {"system_info": 300.0, "cpu_memory": 20.0}
+    assert cache.background == {"cpu_memory"}
+
+
+def test_cache_from_config_rejects_unknown_collectors():
+    """Only collectors with a metric conversion can be served."""
+    with pytest.raises(ValueError):
+        cache_from_config({"exporter_collectors": ["burst"]})
+
+
+def test_server_serves_metrics_over_http():
+    """GET /metrics returns the text format; other paths are 404."""
+    cache = _cache({"system_info": _Counter()})
+    server = make_server("127.0.0.1:0", cache)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/metrics") as response:  # nosec B310
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{base}/")  # nosec B310
+    finally:
+        server.shutdown()
+        server.server_close()
+        cache.stop()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "brb_uptime_seconds 5" in body
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets only")
+def test_server_serves_metrics_on_unix_socket(tmp_path):
+    """unix:<path> listens on a Unix socket and removes it on close."""
+    path = tmp_path / "exporter.sock"
+    cache = _cache({"system_info": _Counter()})
+    server = make_server(f"unix:{path}", cache)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+            sock.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := sock.recv(4096):
+                response += chunk
+    finally:
+        server.shutdown()
+        server.server_close()
+        cache.stop()
+
+    assert response.startswith(b"HTTP/1.0 200")
+    assert b"brb_uptime_seconds 5" in response
+    assert not path.exists()
+
+
+def test_make_server_rejects_bad_address():
+    """Addresses must be host:port or unix:<path>."""
+    with pytest.raises(ValueError):
+        make_server("localhost", _cache({"system_info": _Counter()}))
@@ -0,0 +1,147 @@
+"""Tests for the fleet index."""
+
+import os
+
+import pytest
+
+from big_red_button.fleet import (
+    extract_metrics,
+    index_snapshots,
+    query_snapshots,
+)
+from big_red_button.sinks import open_sink
+
+
+def _snapshot(root, stamp, host, app, swap, cpu=20.0, storage="OK"):
+    sink = open_sink(root, f"support_snapshot_{stamp}")
+    sink.write_json(
+        "system_info.json",
+        {
+            "hostname": host,
+            "platform": "Darwin",
+            "timestamp_local": f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]}T12:00:00",
+        },
+    )
+    sink.write_json("user_context.json", {"app_name": app})
+    sink.write_json(
+        "cpu_memory.json",
+        {
+            "cpu_samples": [
+                {"cpu_percent_overall": cpu, "cpu_percent_per_cpu": [cpu, cpu]}
+            ]
+            * 4,
+            "virtual_memory": {"total": 64 * 1024**3, "percent": 60.0},
+            "swap_memory": {"percent": swap},
+        },
+    )
+    sink.write_json(
+        "network.json",
+        {"storage_host_checks": [{"host": "nexis1", "status": storage}]},
+    )
+    return sink.close()
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "snapshots"
+    _snapshot(root, "20250101_120000", "resolve-01", "DaVinci Resolve", 70.0)
+    _snapshot(root, "20250102_120000", "resolve-02", "DaVinci Resolve", 10.0)
+    _snapshot(
+        root,
+        "20250102_130000",
+        "nuke-01",
+        "Nuke",
+        55.0,
+        cpu=99.0,
+        storage="FAILED",
+    )
+    return root
+
+
+def test_index_is_incremental(root, tmp_path):
+    db = tmp_path / "fleet.sqlite"
+    stats = index_snapshots(root, db)
+    assert (stats["scanned"], stats["added"], stats["errors"]) == (3, 3, 0)
+
+    # Nothing changed: nothing is reopened
+    stats = index_snapshots(root, db)
+    assert (stats["added"], stats["updated"], stats["unchanged"]) == (0, 0, 3)
+
+    # New, changed, deleted and unreadable archives
+    _snapshot(root, "20250103_120000", "resolve-01", "DaVinci Resolve", 80.0)
+    changed = root / "support_snapshot_20250101_120000.zip"
+    os.utime(changed, (1, 1))
+    (root / "support_snapshot_20250102_120000.zip").unlink()
+    (root / "support_snapshot_20250104_120000.zip").write_bytes(b"not a zip")
+
+    stats = index_snapshots(root, db)
+    assert stats["added"] == 2
+    assert stats["updated"] == 1
+    assert stats["removed"] == 1
+    assert stats["errors"] == 1
+    # Unreadable archives are excluded from queries
+    assert len(query_snapshots(db)) == 3
+
+
+def test_index_with_worker_processes(root, tmp_path):
+    for day in range(5, 9):
+        _snapshot(root, f"202501{day:02d}_120000", "edit-01", "Avid", 1.0)
+    stats = index_snapshots(root, tmp_path / "fleet.sqlite", workers=2)
+    assert stats["added"] == 7
+    assert stats["errors"] == 0
+
+
+def test_max_volume_percent_ignores_virtual_filesystems():
+    partitions = [
+        {"fstype": "apfs", "usage": {"total": 100, "percent": 62.0}},
+        {"fstype": "squashfs", "usage": {"total": 10, "percent": 100.0}},
+        {"fstype": "tmpfs", "usage": {"total": 10, "percent": 99.0}},
+        {"fstype": "overlay", "usage": {"total": 10, "percent": 98.0}},
+    ]
+    row = extract_metrics({"disks.json": {"partitions": partitions}})
+    assert row["max_volume_percent"] == 62.0
+
+
+def test_query_filters_and_aggregates(root, tmp_path):
+    db = tmp_path / "fleet.sqlite"
+    index_snapshots(root, db)
+
+    rows = query_snapshots(db, where=["swap_percent>50"], app="resolve")
+    assert [r["host"] for r in rows] == ["resolve-01"]
+
+    rows = query_snapshots(db, host="resolve-*", columns=("host", "cpu_mean"))
+    assert {r["host"] for r in rows} == {"resolve-01", "resolve-02"}
+
+    rows = query_snapshots(db, since="2025-01-02", until="2025-01-02")
+    assert len(rows) == 2
+
+    rows = query_snapshots(db, finding="Storage host unreachable")
+    assert [r["host"] for r in rows] == ["nuke-01"]
+    assert rows[0]["critical_findings"] >= 2  # CPU saturated + storage
+
+    rows = query_snapshots(
+        db, group_by="app_name", aggregates=["count", "max:swap_percent"]
+    )
+    assert rows == [
+        {"app_name": "DaVinci Resolve", "count": 2, "max_swap_percent": 70.0},
+        {"app_name": "Nuke", "count": 1, "max_swap_percent": 55.0},
+    ]
+    rows = query_snapshots(db, group_by="day")
+    assert [r["count"] for r in rows] == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"where": ["swap_percent; DROP TABLE snapshots>1"]},
+        {"where": ["nonexistent>1"]},
+        {"group_by": "path; --"},
+        {"group_by": "host", "aggregates": ["avg:nope"]},
+        {"columns": ("host", "secret")},
+    ],
+)
+def test_query_rejects_invalid_input(root, tmp_path, kwargs):
+    db = tmp_path / "fleet.sqlite"
+    index_snapshots(root, db)
+    with pytest.raises(ValueError):
+        query_snapshots(db, **kwargs)
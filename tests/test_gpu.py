@@ -0,0 +1,203 @@
+"""Tests for the GPU collector, using a fake NVML module."""
+
+import os
+from types import SimpleNamespace
+
+from big_red_button.analyze import check_gpu
+from big_red_button.collectors import gpu
+
+GIB = 1024**3
+
+
+class FakeNvml:
+    """Minimal stand-in for py3nvml/pynvml with two devices."""
+
+    NVML_TEMPERATURE_GPU = 0
+    NVML_CLOCK_GRAPHICS = 0
+    NVML_CLOCK_SM = 1
+    NVML_CLOCK_MEM = 2
+
+    def __init__(self):
+        self.inits = 0
+        self.shutdowns = 0
+        self.reads = 0
+
+    def nvmlInit(self):
+        self.inits += 1
+
+    def nvmlShutdown(self):
+        self.shutdowns += 1
+
+    def nvmlDeviceGetCount(self):
+        return 2
+
+    def nvmlDeviceGetHandleByIndex(self, index):
+        return index
+
+    def nvmlSystemGetDriverVersion(self):
+        return b"550.54"
+
+    def nvmlDeviceGetName(self, handle):
+        return f"Fake GPU {handle}".encode()
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        self.reads += 1
+        used = (2 + self.reads) * GIB
+        return SimpleNamespace(total=24 * GIB, used=used, free=24 * GIB - used)
+
+    def nvmlDeviceGetEnforcedPowerLimit(self, handle):
+        return 300000
+
+    def nvmlDeviceGetUtilizationRates(self, handle):
+        return SimpleNamespace(gpu=50 + handle, memory=20)
+
+    def nvmlDeviceGetTemperature(self, handle, sensor):
+        return 70
+
+    def nvmlDeviceGetPowerUsage(self, handle):
+        return 123456
+
+    def nvmlDeviceGetClockInfo(self, handle, clock):
+        if handle == 1 and clock == self.NVML_CLOCK_SM:
+            raise RuntimeError("Not Supported")
+        return 1800 - 100 * clock
+
+    def nvmlDeviceGetComputeRunningProcesses(self, handle):
+        if handle:
+            return []
+        return [SimpleNamespace(pid=os.getpid(), usedGpuMemory=4 * GIB)]
+
+    def nvmlDeviceGetGraphicsRunningProcesses(self, handle):
+        if handle:
+            return []
+        return [
+            SimpleNamespace(pid=os.getpid(), usedGpuMemory=None),
+            SimpleNamespace(pid=999999, usedGpuMemory=GIB),
+        ]
+
+
+def test_collect_gpu_info_uses_one_session():
+    """All samples come from a single NVML init/shutdown."""
+    nvml = FakeNvml()
+    info = gpu.collect_gpu_info(
+        sample_count=3, sample_interval=0.01, nvml=nvml
+    )
+
+    assert info["backend"] == "nvml"
+    assert nvml.inits == 1
+    assert nvml.shutdowns == 1
+    assert len(info["samples"]) == 3
+    assert [d["name"] for d in info["devices"]] == ["Fake GPU 0", "Fake GPU 1"]
+    assert info["devices"][0]["driver_version"] == "550.54"
+    assert info["devices"][0]["power_limit_watts"] == 300.0
+
+    reading = info["samples"][0]["devices"][0]
+    assert reading["power_watts"] == 123.5
+    assert reading["clock_graphics_mhz"] == 1800
+    assert reading["clock_memory_mhz"] == 1600
+    # Unsupported readings become None instead of failing the collector
+    assert info["samples"][0]["devices"][1]["clock_sm_mhz"] is None
+
+
+def test_collect_gpu_info_summary_and_compat():
+    """Summaries track the peak; nvidia_devices holds the last reading."""
+    info = gpu.collect_gpu_info(
+        sample_count=3, sample_interval=0.01, nvml=FakeNvml()
+    )
+
+    summary = info["summary"]["0"]
+    used = [s["devices"][0]["memory_used"] for s in info["samples"]]
+    assert summary["memory_used"]["max"] == max(used)
+    assert summary["gpu_utilization"] == {"mean": 50.0, "max": 50}
+    assert summary["clock_graphics_mhz"]["min"] == 1800
+    assert "clock_sm_mhz" not in info["summary"]["1"]
+
+    last = info["nvidia_devices"][0]
+    assert last["memory_total"] == 24 * GIB
+    assert (
+        last["memory_used"] == info["samples"][-1]["devices"][0]["memory_used"]
+    )
+    assert last["gpu_utilization"] == 50
+
+
+def test_collect_gpu_info_processes():
+    """Per-process VRAM merges compute and graphics lists by pid."""
+    info = gpu.collect_gpu_info(
+        sample_count=1, sample_interval=0.01, nvml=FakeNvml()
+    )
+
+    procs = info["processes"]
+    assert [p["pid"] for p in procs] == [os.getpid(), 999999]
+    assert procs[0]["used_memory"] == 4 * GIB
+    assert procs[0]["name"]
+    assert procs[1]["name"] is None
+
+
+def test_collect_gpu_info_keeps_samples_when_backend_fails(monkeypatch):
+    """A read error ends sampling but keeps devices and earlier samples."""
+    nvml = FakeNvml()
+    backend = gpu.NvmlBackend(nvml)
+    read = backend.read
+    calls = []
+
+    def _flaky_read():
+        calls.append(1)
+        if len(calls) > 2:
+            raise RuntimeError("nvidia-smi timed out")
+        return read()
+
+    monkeypatch.setattr(backend, "read", _flaky_read)
+    monkeypatch.setattr(gpu, "open_backend", lambda nvml: (backend, []))
+    info = gpu.collect_gpu_info(sample_count=5, sample_interval=0.01)
+
+    assert len(info["devices"]) == 2
+    assert len(info["samples"]) == 2
+    assert info["summary"]["0"]["gpu_utilization"]["max"] == 50
+    assert info["processes"] == []
+    assert info["backend_errors"] == ["nvml: nvidia-smi timed out"]
+    assert len(info["nvidia_devices"]) == 2
+    assert nvml.shutdowns == 1
+
+
+def test_open_backend_records_nvml_failure(monkeypatch):
+    """A failing NVML init falls through to the next backend."""
+
+    class BrokenNvml(FakeNvml):
+        def nvmlInit(self):
+            raise RuntimeError("Driver Not Loaded")
+
+    monkeypatch.setattr(gpu.capabilities, "available", lambda name: False)
+    backend, errors = gpu.open_backend(BrokenNvml())
+
+    assert backend is None
+    assert errors == ["nvml: Driver Not Loaded"]
+
+
+def test_smi_value():
+    """nvidia-smi cells are parsed to numbers or None."""
+    assert gpu._smi_value(" 45 ") == 45
+    assert gpu._smi_value("123.45") == 123.45
+    assert gpu._smi_value("[N/A]") is None
+    assert gpu._smi_value("N/A") is None
+    assert gpu._smi_value("NVIDIA A40") == "NVIDIA A40"
+
+
+def test_check_gpu_uses_peak_vram():
+    """Analysis flags VRAM exhaustion seen during the window."""
+    data = {
+        "nvidia_devices": [
+            {
+                "index": 0,
+                "name": "Fake GPU 0",
+                "memory_total": 24 * GIB,
+                "memory_used": 4 * GIB,
+            }
+        ],
+        "summary": {
+            "0": {"memory_used": {"mean": 12 * GIB, "max": 23.5 * GIB}}
+        },
+    }
+    findings = check_gpu({"gpu_info.json": data})
+
+    assert len(findings) == 1
+    assert findings[0].severity == "critical"
@@ -0,0 +1,106 @@
+"""Tests for installed application detection and its cache."""
+
+import os
+import plistlib
+
+import pytest
+
+from big_red_button.collectors import installed_apps
+
+
+@pytest.fixture
+def install_root(tmp_path):
+    """A fake install root with two Nuke versions and a macOS bundle."""
+    root = tmp_path / "opt"
+    (root / "Nuke14.0v5").mkdir(parents=True)
+    (root / "Nuke15.1v2").mkdir()
+    contents = root / "Tool.app" / "Contents"
+    contents.mkdir(parents=True)
+    with open(contents / "Info.plist", "wb") as f:
+        plistlib.dump({"CFBundleShortVersionString": "3.4.1"}, f)
+    return root
+
+
+def _catalog(root):
+    return {
+        "Nuke": [str(root / "Nuke*")],
+        "Tool": [str(root / "Tool.app")],
+        "Missing": [str(root / "missing*")],
+    }
+
+
+def test_detect_installed_apps_catalog(install_root):
+    """Config entries are globbed and versioned in-process."""
+    apps = installed_apps.detect_installed_apps(_catalog(install_root))
+
+    assert apps["Nuke"]["version"] == "15.1v2"
+    assert [i["version"] for i in apps["Nuke"]["installs"]] == [
+        "14.0v5",
+        "15.1v2",
+    ]
+    assert apps["Tool"] == {
+        "path": str(install_root / "Tool.app"),
+        "version": "3.4.1",
+    }
+    assert "Missing" not in apps
+
+
+def test_build_catalog_overrides():
+    """Empty lists drop built-ins and strings become single patterns."""
+    catalog = installed_apps.build_catalog(
+        {"Pro Tools": [], "Blender": "/opt/blender*"}
+    )
+
+    assert "Pro Tools" not in catalog
+    assert catalog["Blender"] == ["/opt/blender*"]
+    assert "Maya" in catalog
+
+
+def test_build_catalog_selects_platform_patterns():
+    """Only the patterns for the requested platform are scanned."""
+    apps = {
+        "Blender": {
+            "Darwin": ["/Applications/Blender.app"],
+            "Linux": "/opt/b*",
+        }
+    }
+    windows = installed_apps.build_catalog(apps, system="Windows")
+    linux = installed_apps.build_catalog(apps, system="Linux")
+
+    assert "Blender" not in windows
+    assert "Pro Tools" in windows
+    assert not any(
+        p.startswith("/") for patterns in windows.values() for p in patterns
+    )
+    assert linux["Blender"] == ["/opt/b*"]
+    assert "Pro Tools" not in linux
+
+
+def test_detect_installed_apps_cache(install_root, tmp_path, monkeypatch):
+    """Unchanged install directories are served from the cache."""
+    cache = str(tmp_path / "apps.json")
+    catalog = _catalog(install_root)
+    first = installed_apps.detect_installed_apps(catalog, cache)
+
+    def fail(catalog):
+        raise AssertionError("scanned despite a valid cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(installed_apps, "_scan", fail)
+        assert installed_apps.detect_installed_apps(catalog, cache) == first
+
+    # A new install changes the parent directory's mtime
+    (install_root / "Nuke16.0v1").mkdir()
+    stat = os.stat(install_root)
+    os.utime(install_root, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    apps = installed_apps.detect_installed_apps(catalog, cache)
+
+    assert apps["Nuke"]["version"] == "16.0v1"
+
+
+def test_app_version_from_directory_name(tmp_path):
+    """Versions fall back to the install directory name."""
+    assert installed_apps.app_version(str(tmp_path / "hfs20.0.547")) == (
+        "20.0.547"
+    )
+    assert installed_apps.app_version(str(tmp_path / "resolve")) == "unknown"
@@ -0,0 +1,83 @@
+"""Tests for low-impact mode."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from big_red_button import utils
+from big_red_button.collectors.processes import _descendants
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+
+def test_apply_low_impact_reports_each_step():
+    """Priorities are lowered best effort and every step is reported."""
+    # Run in a child so the test process keeps its own priority
+    code = (
+        "import json, psutil\n"
+        "from big_red_button.priority import apply_low_impact\n"
+        "report = apply_low_impact({'low_impact_core': 0,"
+        " 'low_impact_max_subprocesses': 2})\n"
+        "print(json.dumps({'report': report,"
+        " 'nice': psutil.Process().nice()}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=SRC),
+        check=True,
+    )
+    out = json.loads(result.stdout)
+    report = out["report"]
+
+    assert set(report) == {
+        "cpu_priority",
+        "io_priority",
+        "cpu_affinity",
+        "max_subprocesses",
+    }
+    assert report["max_subprocesses"] == 2
+    if sys.platform.startswith("linux"):
+        assert out["nice"] >= 10
+        assert report["cpu_affinity"] == [0]
+
+
+def test_subprocess_limit_serializes_spawns():
+    """With a limit of one, subprocess slots are held one at a time."""
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def worker():
+        with utils.subprocess_slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    utils.set_subprocess_limit(1)
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        utils.set_subprocess_limit(None)
+
+    assert peak[0] == 1
+    assert utils.subprocess_slots() is None
+
+
+def test_descendants():
+    """The own-process tree follows parent links, ignoring cycles."""
+    ppids = {1: 0, 10: 1, 11: 10, 12: 11, 20: 1, 30: 30}
+
+    assert _descendants(10, ppids) == {10, 11, 12}
+    assert _descendants(30, ppids) == {30}
@@ -0,0 +1,185 @@
+"""Tests for the /proc sampling backend."""
+
+import os
+import sys
+
+import psutil
+import pytest
+
+from big_red_button.procfs import ProcfsReader, _ProcFile
+from big_red_button.sampler import CHANNELS, TickSampler, compute_tick
+
+linux_only = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="procfs is Linux only"
+)
+
+STAT = """\
+cpu  300 0 100 1600 0 0 0 0 0 0
+cpu0 200 0 50 750 0 0 0 0 0 0
+cpu1 100 0 50 850 0 0 0 0 0 0
+intr 5000 1 2 3
+ctxt 12345
+btime 1700000000
+procs_running 3
+procs_blocked 1
+softirq 777 1 2
+"""
+MEMINFO = """\
+MemTotal:       16000000 kB
+MemFree:         2000000 kB
+MemAvailable:    4000000 kB
+Buffers:          100000 kB
+SwapTotal:       1000000 kB
+SwapFree:         750000 kB
+"""
+VMSTAT = "nr_free_pages 500000\npswpin 10\npswpout 20\n"
+DISKSTATS = """\
+   8       0 sda 100 5 2000 40 50 6 1000 30 0 60 70 0 0 0 0
+   8       1 sda1 90 5 1800 35 45 6 900 25 0 55 60 0 0 0 0
+"""
+NET_DEV = """\
+Inter-|   Receive                            |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes
+    lo:  1000  10 0 0 0 0 0 0  1000  10 0 0 0 0 0 0
+  eth0: 50000 400 1 2 0 0 0 0 30000 300 3 4 0 0 0 0
+"""
+PRESSURE = (
+    "some avg10=0.00 avg60=0.00 avg300=0.00 total=250000\n"
+    "full avg10=0.00 avg60=0.00 avg300=0.00 total=100000\n"
+)
+
+
+@pytest.fixture
+def fake_proc(tmp_path):
+    """A minimal /proc tree and a /sys/block listing only sda."""
+    root = tmp_path / "proc"
+    (root / "net").mkdir(parents=True)
+    (root / "pressure").mkdir()
+    (root / "stat").write_text(STAT)
+    (root / "meminfo").write_text(MEMINFO)
+    (root / "vmstat").write_text(VMSTAT)
+    (root / "diskstats").write_text(DISKSTATS)
+    (root / "net" / "dev").write_text(NET_DEV)
+    (root / "pressure" / "io").write_text(PRESSURE)
+    (tmp_path / "block" / "sda").mkdir(parents=True)
+    return root
+
+
+def _reader(root, **kwargs):
+    return ProcfsReader(
+        CHANNELS,
+        root=str(root),
+        sys_block=str(root.parent / "block"),
+        **kwargs,
+    )
+
+
+@linux_only
+def test_reader_parses_needed_fields(fake_proc):
+    """Fields come out in psutil's units and field names."""
+    reader = _reader(fake_proc)
+    counters = reader.read().counters
+    reader.close()
+    ticks = os.sysconf("SC_CLK_TCK")
+
+    assert len(counters["cpu"]) == 2
+    assert counters["cpu"][1].idle == 850 / ticks
+    assert counters["ctx"].ctx_switches == 12345
+    assert counters["ctx"].interrupts == 5000
+    assert counters["ctx"].soft_interrupts == 777
+    assert counters["runqueue"] == (3, 1)
+    assert counters["memory"].available == 4000000 * 1024
+    assert counters["memory"].percent == 75.0
+    assert counters["swap"].percent == 25.0
+    assert counters["swap"].sout == 20 * 4096
+    # Partitions are left out of the disk totals
+    assert counters["disk"].read_count == 100
+    assert counters["disk"].read_bytes == 2000 * 512
+    assert counters["disk"].busy_time == 60
+    assert counters["net"].bytes_recv == 51000
+    assert counters["net"].dropout == 4
+    assert counters["pressure"] == {"io_some": 250000, "io_full": 100000}
+
+
+@linux_only
+def test_reader_per_device(fake_proc):
+    """perdisk/pernic return every device keyed by name."""
+    reader = _reader(fake_proc, perdisk=True, pernic=True)
+    counters = reader.read().counters
+    reader.close()
+
+    assert set(counters["disk"]) == {"sda", "sda1"}
+    assert counters["disk"]["sda1"].write_bytes == 900 * 512
+    assert counters["net"]["eth0"].errin == 1
+    assert counters["net"]["eth0"].bytes_sent == 30000
+
+
+@linux_only
+def test_proc_file_grows_and_rereads(fake_proc):
+    """Buffers grow to fit and later reads see the file's new contents."""
+    f = _ProcFile(str(fake_proc / "meminfo"), size=16)
+    end = f.read()
+    assert bytes(f.buf[1:end]) == MEMINFO.encode()
+
+    (fake_proc / "meminfo").write_text("MemTotal: 1 kB\n")
+    end = f.read()
+    f.close()
+
+    assert bytes(f.buf[1:end]) == b"MemTotal: 1 kB\n"
+
+
+@linux_only
+def test_reader_matches_psutil():
+    """On the real /proc the counters agree with psutil."""
+    reader = ProcfsReader(CHANNELS)
+    counters = reader.read().counters
+    reader.close()
+
+    assert len(counters["cpu"]) == len(psutil.cpu_times(percpu=True))
+    assert counters["memory"].total == psutil.virtual_memory().total
+    assert counters["swap"].total == psutil.swap_memory().total
+    assert set(counters["disk"]._fields) <= set(
+        psutil.disk_io_counters()._fields
+    )
+    assert counters["net"].bytes_recv <= psutil.net_io_counters().bytes_recv
+
+
+@linux_only
+def test_compute_tick_pressure_percent(fake_proc):
+    """Stall time deltas become a percentage of the interval."""
+    reader = _reader(fake_proc)
+    prev = reader.read()
+    (fake_proc / "pressure" / "io").write_text(
+        PRESSURE.replace("250000", "300000")
+    )
+    cur = reader.read()
+    reader.close()
+    cur.monotonic = prev.monotonic + 0.5
+
+    sample = compute_tick(prev, cur)
+
+    # 50 ms of "some" stall in a 500 ms interval
+    assert sample["pressure"] == {
+        "io_some_percent": 10.0,
+        "io_full_percent": 0.0,
+    }
+    assert sample["memory_percent"] == 75.0
+
+
+def test_tick_sampler_rejects_unknown_backend():
+    """A misspelled backend is an error."""
+    with pytest.raises(ValueError):
+        TickSampler(backend="sysfs")
+
+
+def test_tick_sampler_psutil_and_auto_backends_agree():
+    """Both backends produce the same sample keys (bar procfs extras)."""
+    psutil_sample = TickSampler(interval=0.02, backend="psutil").run(1)[0]
+    auto_sample = TickSampler(interval=0.02, backend="auto").run(1)[0]
+
+    assert set(psutil_sample) <= set(auto_sample)
+    assert set(auto_sample) - set(psutil_sample) <= {
+        "pressure",
+        "run_queue",
+        "blocked_tasks",
+    }
@@ -0,0 +1,142 @@
+"""Tests for the flight recorder ring buffer."""
+
+import time
+
+import pytest
+
+from big_red_button.collectors.flight_recorder import collect_flight_recorder
+from big_red_button.recorder import (
+    FIELDS,
+    FlightRecorder,
+    file_size,
+    read_recent,
+    run_agent,
+)
+
+
+def _record(timestamp: float, cpu: float) -> tuple:
+    return (timestamp, cpu) + (0.0,) * (len(FIELDS) - 2)
+
+
+def test_recorder_file_has_fixed_size(tmp_path):
+    """Test that the file never grows as records are appended."""
+    path = tmp_path / "rec.bin"
+    recorder = FlightRecorder(path, capacity=8, interval=1.0)
+    now = time.time()
+    for i in range(50):
+        recorder.append(_record(now + i, float(i)))
+    recorder.close()
+
+    assert path.stat().st_size == file_size(8)
+
+
+def test_read_recent_returns_newest_window(tmp_path):
+    """Test that only records inside the window are returned, in order."""
+    path = tmp_path / "rec.bin"
+    recorder = FlightRecorder(path, capacity=100, interval=1.0)
+    now = time.time()
+    for i in range(10):
+        recorder.append(_record(now - 9 + i, float(i)))
+    recorder.close()
+
+    history = read_recent(path, seconds=4.5)
+
+    cpus = [s["cpu_percent"] for s in history["samples"]]
+    assert cpus == [5.0, 6.0, 7.0, 8.0, 9.0]
+    assert history["records_written"] == 10
+
+
+def test_read_recent_after_wraparound(tmp_path):
+    """Test reading a ring that has wrapped, skipping the oldest slot."""
+    path = tmp_path / "rec.bin"
+    recorder = FlightRecorder(path, capacity=4, interval=1.0)
+    now = time.time()
+    for i in range(10):
+        recorder.append(_record(now - 9 + i, float(i)))
+    recorder.close()
+
+    history = read_recent(path, seconds=3600)
+
+    assert [s["cpu_percent"] for s in history["samples"]] == [7.0, 8.0, 9.0]
+
+
+def test_recorder_keeps_history_across_restarts(tmp_path):
+    """Test that restarting the agent keeps previously recorded samples."""
+    path = tmp_path / "rec.bin"
+    now = time.time()
+    recorder = FlightRecorder(path, capacity=10, interval=1.0)
+    recorder.append(_record(now - 1, 1.0))
+    recorder.close()
+    recorder = FlightRecorder(path, capacity=10, interval=1.0)
+    recorder.append(_record(now, 2.0))
+    recorder.close()
+
+    history = read_recent(path, seconds=60)
+
+    assert [s["cpu_percent"] for s in history["samples"]] == [1.0, 2.0]
+
+
+def test_read_recent_rejects_foreign_file(tmp_path):
+    """Test that a non-recorder file is rejected."""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"x" * 128)
+
+    with pytest.raises(ValueError):
+        read_recent(path, seconds=60)
+
+
+@pytest.mark.parametrize("damage", ["empty", "short", "truncated", "zeroed"])
+def test_read_recent_rejects_damaged_file(tmp_path, damage):
+    """Test that truncated or zeroed files raise ValueError."""
+    path = tmp_path / "rec.bin"
+    FlightRecorder(path, capacity=8, interval=1.0).close()
+    data = path.read_bytes()
+    if damage == "empty":
+        data = b""
+    elif damage == "short":
+        data = data[:10]
+    elif damage == "truncated":
+        data = data[: file_size(8) - 1]
+    else:
+        # Valid magic and layout but capacity zeroed
+        data = data[:16] + b"\0" * (len(data) - 16)
+    path.write_bytes(data)
+
+    with pytest.raises(ValueError):
+        read_recent(path, seconds=60)
+    assert collect_flight_recorder(str(path))["available"] is False
+
+
+def test_run_agent_and_collect(tmp_path):
+    """Test the agent loop end to end through the collector."""
+    path = tmp_path / "rec.bin"
+    run_agent(path, interval=0.05, capacity=16, max_samples=3)
+
+    info = collect_flight_recorder(str(path), minutes=1)
+
+    assert info["available"] is True
+    assert len(info["samples"]) == 3
+    assert set(info["samples"][0]) == set(FIELDS)
+
+
+def test_collect_flight_recorder_without_agent(tmp_path):
+    """Test the collector when no agent has run."""
+    info = collect_flight_recorder(str(tmp_path / "missing.bin"))
+
+    assert info["available"] is False
+
+
+def test_collect_flight_recorder_reports_stopped_agent(tmp_path):
+    """Test that history older than the window is reported as stale."""
+    path = tmp_path / "rec.bin"
+    recorder = FlightRecorder(path, capacity=8, interval=1.0)
+    old = time.time() - 3600
+    recorder.append(_record(old, 10.0))
+    recorder.append(_record(old + 1, 20.0))
+    recorder.close()
+
+    info = collect_flight_recorder(str(path), minutes=1)
+
+    assert info["available"] is False
+    assert info["stale"] is True
+    assert info["newest_sample_age_seconds"] >= 3598
@@ -0,0 +1,139 @@
+"""Tests for the collector registry, profiles and scheduler."""
+
+import pytest
+
+from big_red_button.collectors.registry import (
+    PROFILES,
+    REGISTRY,
+    CollectorSpec,
+    get_profile,
+    select_collectors,
+)
+from big_red_button.engine import plan_schedule
+
+CONFIG = {
+    "cpu_sample_count": 10,
+    "cpu_sample_interval": 1.0,
+    "max_processes": 30,
+    "storage_hosts": ["nexis1", "netapp1"],
+    "storage_probe_ports": [445, 2049],
+    "storage_probe_count": 3,
+    "storage_probe_deadline": 5.0,
+}
+
+
+def _spec(name: str, cost: float) -> CollectorSpec:
+    return CollectorSpec(
+        name=name,
+        filename=f"{name}.json",
+        func=dict,
+        description="",
+        cost=cost,
+    )
+
+
+def test_profiles_reference_registered_collectors():
+    """Test that every built-in profile only names known collectors."""
+    for profile in PROFILES.values():
+        assert set(profile.collectors) <= set(REGISTRY)
+
+
+def test_get_profile_applies_config_table():
+    """Test that [profiles.<name>] tables override the built-in profile."""
+    config = dict(
+        CONFIG,
+        profiles={"quick": {"target_seconds": 5, "cpu_sample_count": 6}},
+    )
+
+    profile = get_profile("quick", config)
+    run_config = profile.apply(config)
+
+    assert profile.target_seconds == 5.0
+    assert run_config["cpu_sample_count"] == 6
+    assert run_config["cpu_sample_interval"] == 0.5
+    assert run_config["profile"] == "quick"
+
+
+def test_get_profile_rejects_unknown_names():
+    """Test that unknown profiles and collectors raise ValueError."""
+    with pytest.raises(ValueError):
+        get_profile("nope", CONFIG)
+
+    config = dict(CONFIG, profiles={"custom": {"collectors": ["bogus"]}})
+    with pytest.raises(ValueError):
+        get_profile("custom", config)
+
+
+def test_select_collectors_filters_platforms():
+    """Test that platform-specific collectors are skipped elsewhere."""
+    profile = get_profile("standard", CONFIG)
+
+    selected, skipped = select_collectors(profile, "Linux")
+
+    assert "foreground_app" in skipped
+    assert "foreground_app" not in [s.name for s in selected]
+    assert "cpu_memory" in [s.name for s in selected]
+
+
+def test_plan_schedule_orders_longest_first_and_meets_target():
+    """Test that the scheduler uses the fewest workers meeting the target."""
+    specs = [
+        _spec("a", 1.0),
+        _spec("b", 4.0),
+        _spec("c", 2.0),
+        _spec("d", 1.0),
+    ]
+
+    schedule = plan_schedule(specs, CONFIG, target_seconds=4.0)
+
+    assert [t.name for t in schedule.tasks] == ["b", "c", "a", "d"]
+    assert schedule.max_workers == 2
+    assert schedule.estimated_seconds == 4.0
+
+
+def test_plan_schedule_uses_full_parallelism_when_target_unreachable():
+    """Test that an unreachable target runs everything at once."""
+    specs = [_spec("a", 10.0), _spec("b", 1.0)]
+
+    schedule = plan_schedule(specs, CONFIG, target_seconds=3.0)
+
+    assert schedule.max_workers == 2
+    assert schedule.estimated_seconds == 10.0
+
+
+def test_cpu_memory_cost_follows_sampling_config():
+    """Test that the sampling collector's cost tracks its window."""
+    spec = REGISTRY["cpu_memory"]
+
+    assert spec.blocking
+    assert spec.estimate_cost(CONFIG) == 10.0
+    assert spec.kwargs(CONFIG) == {
+        "sample_count": 10,
+        "sample_interval": 1.0,
+        "backend": "auto",
+        "max_seconds": None,
+    }
+
+
+def test_adaptive_sampling_extends_timeout_not_cost():
+    """Test that adaptive sampling plans for the normal window only."""
+    spec = REGISTRY["cpu_memory"]
+    config = {**CONFIG, "cpu_adaptive": True, "cpu_sample_max_seconds": 30.0}
+
+    assert spec.estimate_cost(config) == 10.0
+    assert spec.effective_timeout(config) == 30.0 + spec.timeout
+    assert spec.kwargs(config)["max_seconds"] == 30.0
+
+
+@pytest.mark.parametrize(
+    "available, cost", [(set(), 0.5), ({"nvidia-smi"}, 10.0)]
+)
+def test_gpu_cost_depends_on_backend(monkeypatch, available, cost):
+    """Test that hosts without a GPU backend reserve no sampling window."""
+    from big_red_button.collectors import registry
+
+    monkeypatch.setattr(
+        registry.capabilities, "available", lambda name: name in available
+    )
+
+    assert REGISTRY["gpu"].estimate_cost(CONFIG) == cost
@@ -0,0 +1,140 @@
+"""Tests for the unified tick sampler."""
+
+import time
+from collections import namedtuple
+
+from big_red_button.sampler import (
+    AdaptiveController,
+    TickSampler,
+    counter_rates,
+    cpu_percents,
+)
+
+CpuTimes = namedtuple("CpuTimes", ["user", "system", "idle"])
+DiskIO = namedtuple("DiskIO", ["read_bytes", "write_bytes"])
+
+
+def test_cpu_percents_from_time_deltas():
+    """Test per-CPU and overall utilization from cpu_times deltas."""
+    old = [CpuTimes(10, 0, 90), CpuTimes(0, 0, 100)]
+    new = [CpuTimes(15, 5, 90), CpuTimes(1, 0, 109)]
+
+    per_cpu, overall = cpu_percents(old, new)
+
+    assert per_cpu == [100.0, 10.0]
+    assert overall == 55.0
+
+
+def test_counter_rates_handles_resets():
+    """Test rates per second, treating counter resets as zero."""
+    rates = counter_rates(DiskIO(100, 500), DiskIO(300, 400), dt=2.0)
+
+    assert rates == {
+        "read_bytes_per_sec": 100.0,
+        "write_bytes_per_sec": 0.0,
+    }
+
+
+def test_tick_sampler_produces_rates_for_all_channels():
+    """Test that every channel is turned into per-interval values."""
+    samples = TickSampler(interval=0.05).run(2)
+
+    assert len(samples) == 2
+    sample = samples[-1]
+    for key in (
+        "cpu_percent_per_cpu",
+        "cpu_percent_overall",
+        "memory_percent",
+        "swap_percent",
+        "ctx_switches_per_sec",
+        "interval_seconds",
+    ):
+        assert key in sample
+    assert 0.0 <= sample["cpu_percent_overall"] <= 100.0
+
+
+def test_tick_sampler_does_not_drift():
+    """Test that ticks stay on the schedule despite per-tick work."""
+    ticks = []
+
+    def _slow(i, sample):
+        ticks.append(time.monotonic())
+        time.sleep(0.02)  # per-tick work shorter than the interval
+
+    t0 = time.monotonic()
+    TickSampler(interval=0.05, channels=("memory",)).run(10, on_tick=_slow)
+
+    # A sleep(interval) loop would take >= 10 * 0.07s
+    assert ticks[-1] - t0 < 0.6
+    assert ticks[-1] - t0 >= 0.5
+
+
+def test_tick_sampler_per_disk_rates():
+    """Test per-device rate dicts when perdisk is enabled."""
+    samples = TickSampler(interval=0.01, channels=("disk",), perdisk=True).run(
+        1
+    )
+
+    disk_io = samples[0]["disk_io"]
+    if disk_io:  # Some CI containers expose no disks
+        first = next(iter(disk_io.values()))
+        assert "read_bytes_per_sec" in first
+
+
+def _feed(controller, samples):
+    """Feed samples until the controller stops; return the intervals."""
+    intervals = []
+    for sample in samples:
+        interval = controller.next_interval(sample)
+        if interval is None:
+            break
+        intervals.append(interval)
+    return intervals
+
+
+def test_adaptive_controller_stops_early_when_idle():
+    """Test that an idle machine stops after min_samples."""
+    idle = {"interval_seconds": 1.0, "cpu_percent_overall": 2.0}
+    controller = AdaptiveController(1.0, 10, 30.0)
+
+    assert _feed(controller, [idle] * 10) == [1.0, 1.0]
+    assert controller.stop_reason == "idle"
+    assert controller.samples == 3
+
+
+def test_adaptive_controller_extends_through_a_spike():
+    """Test faster sampling during a spike past the nominal window."""
+    calm = {"interval_seconds": 1.0, "cpu_percent_overall": 40.0}
+    controller = AdaptiveController(1.0, 3, 30.0)
+    intervals = _feed(controller, [calm, calm])
+    # The spike starts on the last nominal sample
+    hot = {"interval_seconds": 1.0, "cpu_percent_per_cpu": [99.0, 5.0]}
+    intervals += _feed(controller, [hot])
+    hot["interval_seconds"] = 0.25
+    intervals += _feed(controller, [hot] * 4)
+    calm["interval_seconds"] = 0.25
+    intervals += _feed(controller, [calm] * 20)
+
+    assert intervals[:3] == [1.0, 1.0, 0.25]
+    assert controller.stop_reason == "settled"
+    assert controller.elapsed == 3.0 + 1.0 + 2.0
+    assert controller.spike_seconds == 2.0
+
+
+def test_adaptive_controller_respects_max_seconds():
+    """Test that a spike that never settles stops at max_seconds."""
+    hot = {"interval_seconds": 0.5, "cpu_percent_overall": 100.0}
+    controller = AdaptiveController(0.5, 2, 3.0)
+    _feed(controller, [hot] * 100)
+
+    assert controller.stop_reason == "max_seconds"
+    assert controller.elapsed == 3.0
+
+
+def test_run_adaptive_takes_nominal_window_when_steady():
+    """Test that a steady machine is sampled for the nominal window."""
+    controller = AdaptiveController(0.02, 3, 1.0)
+    samples = TickSampler(channels=("memory",)).run_adaptive(controller)
+
+    assert len(samples) == 3
+    assert controller.stop_reason == "count"
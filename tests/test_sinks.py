@@ -0,0 +1,57 @@
+"""Tests for snapshot sinks."""
+
+import json
+import zipfile
+
+import pytest
+
+from big_red_button.sinks import DirectorySink, ZipSink, open_sink
+
+
+def test_zip_sink_streams_members(tmp_path):
+    """ZipSink writes the same layout as zip_snapshot, without a folder."""
+    sink = open_sink(tmp_path, "support_snapshot_x")
+    sink.write_json("system_info.json", {"os": "Linux", "cores": 8})
+    sink.write_text("README.txt", "hello\n")
+    # Not visible under the final name until closed
+    assert not (tmp_path / "support_snapshot_x.zip").exists()
+
+    zip_path = sink.close()
+
+    assert zip_path == tmp_path / "support_snapshot_x.zip"
+    assert not (tmp_path / "support_snapshot_x").exists()
+    assert not (tmp_path / "support_snapshot_x.zip.partial").exists()
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.testzip() is None
+        assert sorted(zf.namelist()) == [
+            "support_snapshot_x/README.txt",
+            "support_snapshot_x/system_info.json",
+        ]
+        data = json.loads(zf.read("support_snapshot_x/system_info.json"))
+        assert data == {"cores": 8, "os": "Linux"}
+        assert zf.read("support_snapshot_x/README.txt") == b"hello\n"
+
+
+def test_zip_sink_abort_removes_partial(tmp_path):
+    """Aborted snapshots leave nothing behind."""
+    sink = ZipSink(tmp_path, "snap")
+    sink.write_json("a.json", [1, 2, 3])
+    sink.abort()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_directory_sink(tmp_path):
+    """DirectorySink keeps the plain directory layout."""
+    sink = open_sink(tmp_path, "snap", "directory")
+    assert isinstance(sink, DirectorySink)
+    sink.write_json("a.json", {"x": 1})
+    sink.write_text("README.txt", "hi")
+    snap_dir = sink.close()
+    assert snap_dir.is_dir()
+    assert json.loads((snap_dir / "a.json").read_text()) == {"x": 1}
+    assert (snap_dir / "README.txt").read_text() == "hi"
+
+
+def test_open_sink_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_sink(tmp_path, "snap", "tar")
@@ -0,0 +1,114 @@
+"""Startup regression tests: the CLI must import quickly and lazily."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from big_red_button.collectors.registry import REGISTRY
+from big_red_button.startup import format_startup, parse_importtime
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+# Cold-start budget for "import big_red_button.cli" (measured at ~45 ms;
+# the headroom absorbs slow CI machines)
+STARTUP_BUDGET_MS = 150.0
+
+# Modules the CLI must not load before a command needs them
+HEAVY_MODULES = (
+    "psutil",
+    "numpy",
+    "sqlite3",
+    "asyncio",
+    "webbrowser",
+    "zipfile",
+    "concurrent.futures",
+    "big_red_button.snapshot",
+    "big_red_button.analyze",
+    "big_red_button.fleet",
+)
+
+
+def _fresh_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=SRC),
+        check=True,
+    )
+
+
+def test_cli_import_is_lazy():
+    """Importing the CLI loads no collectors or heavy dependencies."""
+    code = (
+        "import json, sys\n"
+        "import big_red_button.cli\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    loaded = set(json.loads(_fresh_python("-c", code).stdout))
+
+    assert not loaded & set(HEAVY_MODULES)
+    assert not any(
+        name.startswith("big_red_button.collectors.")
+        and name != "big_red_button.collectors.registry"
+        for name in loaded
+    )
+
+
+def test_cli_import_time_budget():
+    """Cold-start import of the CLI stays within the budget."""
+    # Best of three runs to ride out scheduling noise
+    times = []
+    for _ in range(3):
+        result = _fresh_python(
+            "-X", "importtime", "-c", "import big_red_button.cli"
+        )
+        modules = parse_importtime(result.stderr)
+        times.append(
+            max(
+                m["cumulative_ms"]
+                for m in modules
+                if m["name"] == "big_red_button.cli"
+            )
+        )
+
+    assert min(times) < STARTUP_BUDGET_MS
+
+
+def test_registry_collectors_resolve():
+    """Every registry entry names an importable collector function."""
+    for spec in REGISTRY.values():
+        assert callable(spec.load()), spec.name
+
+
+def test_parse_importtime_and_format():
+    """importtime lines are parsed into per-module timings."""
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     _io\n"
+        "import time:      2500 |       4000 | big_red_button\n"
+    )
+    modules = parse_importtime(output)
+
+    assert modules == [
+        {"name": "_io", "self_ms": 0.12, "cumulative_ms": 0.12, "depth": 2},
+        {
+            "name": "big_red_button",
+            "self_ms": 2.5,
+            "cumulative_ms": 4.0,
+            "depth": 0,
+        },
+    ]
+    text = format_startup(
+        {
+            "first_output_ms": 40.0,
+            "ready_ms": 120.0,
+            "import_ms": 80.0,
+            "module_count": 2,
+            "slowest_modules": modules,
+        }
+    )
+    assert text.startswith("Time to first output: 40 ms")
+    assert "big_red_button" in text
@@ -0,0 +1,175 @@
+"""Tests for the concurrent storage host probes."""
+
+import asyncio
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+from big_red_button.collectors import storage_probes
+from big_red_button.collectors.storage_probes import (
+    icmp_probe,
+    latency_stats,
+    parse_ping_times,
+    probe_storage_hosts,
+)
+
+
+@pytest.fixture
+def listener():
+    """Local TCP listener that accepts and immediately closes connections."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    server.settimeout(0.1)
+    stop = threading.Event()
+
+    def _accept():
+        while not stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                continue
+            conn.close()
+
+    thread = threading.Thread(target=_accept, daemon=True)
+    thread.start()
+    yield server.getsockname()[1]
+    stop.set()
+    thread.join()
+    server.close()
+
+
+def _closed_port() -> int:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_latency_stats():
+    """Test min/avg/p95/max and loss calculation."""
+    stats = latency_stats([1.0, None, 3.0, 2.0])
+
+    assert stats["sent"] == 4
+    assert stats["received"] == 3
+    assert stats["loss_percent"] == 25.0
+    assert stats["min_ms"] == 1.0
+    assert stats["avg_ms"] == 2.0
+    assert stats["p95_ms"] == 3.0
+    assert stats["max_ms"] == 3.0
+
+
+def test_latency_stats_all_lost():
+    """Test that a fully lost probe run reports 100% loss."""
+    stats = latency_stats([None, None])
+
+    assert stats["loss_percent"] == 100.0
+    assert stats["avg_ms"] is None
+
+
+def test_parse_ping_times():
+    """Test parsing Unix and Windows ping output."""
+    unix = (
+        "64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.512 ms\n"
+        "64 bytes from 10.0.0.1: icmp_seq=2 ttl=64 time=1.25 ms\n"
+    )
+    windows = (
+        "Reply from 10.0.0.1: bytes=32 time<1ms TTL=128\n"
+        "Reply from 10.0.0.1: bytes=32 time=3ms TTL=128\n"
+    )
+
+    assert parse_ping_times(unix) == [0.512, 1.25]
+    assert parse_ping_times(windows) == [1.0, 3.0]
+
+
+def test_probe_storage_hosts_tcp_listener(listener):
+    """Test TCP probes against open and closed local ports."""
+    closed = _closed_port()
+
+    results = probe_storage_hosts(
+        ["127.0.0.1"],
+        ports=[listener, closed],
+        count=3,
+        deadline=5.0,
+        icmp=False,
+    )
+
+    (result,) = results
+    open_port = result["tcp"][str(listener)]
+    closed_port = result["tcp"][str(closed)]
+    assert open_port["received"] == 3
+    assert open_port["loss_percent"] == 0.0
+    assert open_port["min_ms"] <= open_port["p95_ms"] <= open_port["max_ms"]
+    assert closed_port["received"] == 0
+    assert closed_port["errors"] == {"refused": 3}
+    assert result["status"] == "DEGRADED"
+    assert result["reachable"] is True
+
+
+def test_probe_storage_hosts_runs_hosts_concurrently(listener):
+    """Test that many hosts finish in about the time of one."""
+    t0 = time.perf_counter()
+    results = probe_storage_hosts(
+        ["127.0.0.1"] * 6, ports=[listener], count=3, icmp=False
+    )
+
+    # Each host needs two 0.2s gaps; sequential would take >2.4s
+    assert time.perf_counter() - t0 < 1.5
+    assert all(r["status"] == "OK" for r in results)
+
+
+def test_probe_storage_hosts_unresolvable():
+    """Test that DNS failures are reported as failed hosts."""
+    results = probe_storage_hosts(
+        ["does-not-exist.invalid"], ports=[445], count=1, icmp=False
+    )
+
+    (result,) = results
+    assert result["status"] == "FAILED"
+    assert result["error"] == "DNS resolution failed"
+
+
+def test_probe_storage_hosts_honors_deadline(listener):
+    """Test that the global deadline bounds total probe time."""
+    t0 = time.perf_counter()
+    results = probe_storage_hosts(
+        ["127.0.0.1"], ports=[listener], count=50, deadline=0.5, icmp=False
+    )
+
+    assert time.perf_counter() - t0 < 1.5
+    (result,) = results
+    assert result["deadline_exceeded"] is True
+    assert result["tcp"][str(listener)]["received"] >= 1
+
+
+def test_icmp_probe_keeps_replies_when_cancelled(monkeypatch):
+    """Replies printed before the deadline survive cancellation."""
+    slow_ping = (
+        "import sys, time\n"
+        "for i in range(50):\n"
+        "    print(f'64 bytes: icmp_seq={i} time=0.{i + 1} ms', flush=True)\n"
+        "    time.sleep(0.05)\n"
+    )
+    monkeypatch.setattr(
+        storage_probes,
+        "_ping_command",
+        lambda address, count, timeout: [sys.executable, "-c", slow_ping],
+    )
+    monkeypatch.setattr(
+        storage_probes.capabilities, "available", lambda name: True
+    )
+    result = {}
+
+    async def _run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(icmp_probe("nas1", 50, 1.0, result), 0.5)
+
+    asyncio.run(_run())
+
+    assert result["error"] == "deadline exceeded"
+    assert 1 <= result["received"] < 50
+    assert result["min_ms"] == 0.1
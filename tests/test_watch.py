@@ -0,0 +1,193 @@
+"""Tests for watch mode rules, debounce and cooldown."""
+
+import pytest
+
+from big_red_button.sampler import compute_tick
+from big_red_button.snapshot import create_snapshot
+from big_red_button.watch import (
+    METRICS,
+    Rule,
+    StorageMonitor,
+    Watcher,
+    parse_rule,
+    trigger_context,
+    watcher_from_config,
+)
+
+
+def _watcher(rules, **kwargs):
+    fired = []
+    watcher = Watcher(
+        [parse_rule(r) for r in rules],
+        fired.append,
+        interval=1.0,
+        backend="psutil",
+        **kwargs,
+    )
+    return watcher, fired
+
+
+def test_parse_rule():
+    """Rules parse with and without a hold time."""
+    assert parse_rule("core_max_percent > 95 for 10s") == Rule(
+        "core_max_percent > 95 for 10s", "core_max_percent", ">", 95.0, 10.0
+    )
+    assert parse_rule("swap_percent>=40", default_seconds=5).seconds == 5
+    assert parse_rule("storage_unreachable > 0 for 60").seconds == 60
+
+
+@pytest.mark.parametrize(
+    "text", ["cpu > 90", "swap_percent = 40", "swap_percent > lots"]
+)
+def test_parse_rule_rejects_invalid(text):
+    """Unknown metrics, operators and values are errors."""
+    with pytest.raises(ValueError):
+        parse_rule(text)
+
+
+def test_rule_fires_after_holding_for_its_duration():
+    """The condition must hold on consecutive samples (debounce)."""
+    watcher, _ = _watcher(["core_max_percent > 95 for 3s"])
+
+    assert watcher.evaluate({"core_max_percent": 99}, 1.0) is None
+    assert watcher.evaluate({"core_max_percent": 99}, 2.0) is None
+    trigger = watcher.evaluate({"core_max_percent": 99}, 3.0)
+
+    assert trigger["rule"] == "core_max_percent > 95 for 3s"
+    assert trigger["value"] == 99
+    assert trigger["held_seconds"] == 3.0
+
+
+def test_dip_restarts_debounce():
+    """One sample below the threshold starts the wait again."""
+    watcher, _ = _watcher(["core_max_percent > 95 for 3s"])
+    for now, value in [(1, 99), (2, 99), (3, 50), (4, 99), (5, 99)]:
+        assert watcher.evaluate({"core_max_percent": value}, now) is None
+    assert watcher.evaluate({"core_max_percent": 99}, 6) is not None
+
+
+def test_missing_metric_never_fires():
+    """Unavailable values (None) do not satisfy a rule."""
+    watcher, _ = _watcher(["run_queue > 8"])
+    assert watcher.evaluate({"run_queue": None}, 1.0) is None
+
+
+def test_cooldown_suppresses_triggers(monkeypatch):
+    """Nothing fires until the cooldown after a trigger has passed."""
+    watcher, fired = _watcher(["swap_percent > 40"], cooldown=60.0)
+    monkeypatch.setattr("big_red_button.watch.time.monotonic", lambda: 100)
+
+    watcher._fire(watcher.evaluate({"swap_percent": 50}, 100.0))
+    assert len(fired) == 1
+    assert watcher.evaluate({"swap_percent": 50}, 130.0) is None
+    assert watcher.evaluate({"swap_percent": 50}, 160.0) is not None
+
+
+def test_sampler_cost_independent_of_rule_count():
+    """Many rules share one sampler with only the channels they need."""
+    rules = [f"core_max_percent > {t}" for t in range(100)] + [
+        "swap_percent > 40"
+    ]
+    watcher, _ = _watcher(rules)
+
+    assert watcher.sampler.channels == {"cpu", "swap"}
+    assert watcher.metrics == ["core_max_percent", "swap_percent"]
+
+
+def test_run_fires_and_restarts_sampling():
+    """An always-true rule fires on the first tick of the live loop."""
+    watcher, fired = _watcher(["memory_percent >= 0 for 0s"], cooldown=0.0)
+    watcher.interval = 0.01
+    watcher.run(max_ticks=3)
+
+    assert len(fired) == 3
+    assert set(fired[0]["metrics"]) == {"memory_percent"}
+
+
+def test_every_metric_extracts_from_a_sample():
+    """Each metric reads its value from a real sampler tick."""
+    watcher, _ = _watcher([f"{m} >= 0" for m in METRICS])
+    watcher.interval = 0.01
+    prev = watcher.sampler.read()
+    values = watcher.extract(compute_tick(prev, watcher.sampler.read()))
+    watcher.sampler.close()
+
+    assert set(values) == set(METRICS)
+    assert values["core_max_percent"] is not None
+
+
+def test_storage_metric_counts_unreachable_hosts():
+    """storage_unreachable comes from the monitor's last probe round."""
+    monitor = StorageMonitor(["nas1", "nas2"])
+    watcher, _ = _watcher(["storage_unreachable > 0"], storage=monitor)
+
+    assert watcher.extract({})["storage_unreachable"] is None
+    monitor.unreachable = ["nas2"]
+    trigger = watcher.evaluate(watcher.extract({}), 1.0)
+
+    assert trigger["unreachable_hosts"] == ["nas2"]
+
+
+def test_storage_monitor_survives_probe_errors(capsys):
+    """A failed round marks the metric unknown and probing continues."""
+    monitor = StorageMonitor(["nas1"], interval=0.01)
+    monitor.unreachable = ["nas1"]
+    rounds = []
+
+    def _probe():
+        rounds.append(1)
+        if len(rounds) == 1:
+            raise RuntimeError("event loop failed")
+        if len(rounds) == 2:
+            assert monitor.unreachable is None
+            monitor.unreachable = []
+        else:
+            monitor.stop()
+
+    monitor._probe = _probe
+    monitor.start()
+    monitor._thread.join(timeout=5)
+
+    assert len(rounds) == 3
+    assert monitor.unreachable == []
+    assert "event loop failed" in capsys.readouterr().out
+
+
+def test_watcher_from_config_requires_hosts_for_storage_rules():
+    """A storage rule with nothing to probe is a configuration error."""
+    with pytest.raises(ValueError):
+        watcher_from_config(
+            {"watch_rules": ["storage_unreachable > 0"]}, lambda t: None
+        )
+    with pytest.raises(ValueError):
+        watcher_from_config({"watch_rules": []}, lambda t: None)
+
+
+def test_auto_snapshot_does_not_prompt(tmp_path, monkeypatch):
+    """Passing a user context skips the interactive questions."""
+
+    def _no_prompt():
+        raise AssertionError("prompted")
+
+    monkeypatch.setattr(
+        "big_red_button.snapshot.prompt_user_context", _no_prompt
+    )
+    monkeypatch.setattr(
+        "big_red_button.snapshot.registry.select_collectors",
+        lambda profile, system: ([], []),
+    )
+    trigger = {
+        "rule": "swap_percent > 40",
+        "metric": "swap_percent",
+        "value": 55.0,
+        "held_seconds": 10.0,
+    }
+    config = {
+        "snapshot_root": str(tmp_path),
+        "snapshot_format": "directory",
+        "capability_cache": str(tmp_path / "caps.json"),
+        "studio_name": "Test",
+    }
+    path = create_snapshot(config, trigger_context(trigger))
+
+    assert "swap_percent > 40" in (path / "user_context.json").read_text()